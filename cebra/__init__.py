@@ -56,6 +56,7 @@ except ImportError as e:
     pass
 
 from cebra.data.load import load as load_data
+from cebra.data.load import load_files
 
 is_load_deeplabcut_available = False
 try:
@@ -24,19 +24,95 @@
 import abc
 import collections
 import types
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 import literate_dataclasses as dataclasses
 import numpy as np
 import numpy.typing as npt
+import scipy.sparse
 import torch
 from numpy.typing import NDArray
 
 import cebra.data as cebra_data
 import cebra.distributions
+import cebra.io
 from cebra.data.datatypes import Batch
 from cebra.data.datatypes import BatchIndex
 
+_STORAGE_DTYPES = {
+    "int8": torch.int8,
+    "int16": torch.int16,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+}
+
+
+def _compress_neural(
+    neural: torch.Tensor, storage_dtype: Optional[str]
+) -> Tuple[torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]:
+    """Convert neural data into a compact storage dtype.
+
+    Integer storage dtypes are used without loss if the data only contains
+    integer values within the range of the dtype (e.g., spike counts or raw
+    fluorescence values). Otherwise, each channel is linearly quantized using a
+    per-channel ``scale`` and ``shift``, which can be inverted with
+    :py:func:`_decompress_neural`.
+
+    Args:
+        neural: The neural data of shape ``(N, D)``.
+        storage_dtype: One of ``int8``, ``int16``, ``float16`` or ``bfloat16``.
+            If ``None``, the data is stored as ``float32``.
+
+    Returns:
+        The converted data, and the per-channel scale and shift of shape ``(D,)``.
+        Both scale and shift are ``None`` if the data is stored without
+        quantization.
+    """
+    if storage_dtype is None:
+        return neural.float(), None, None
+    if storage_dtype not in _STORAGE_DTYPES:
+        raise ValueError(
+            f"Invalid storage dtype '{storage_dtype}', choose one of "
+            f"{list(_STORAGE_DTYPES.keys())}.")
+    dtype = _STORAGE_DTYPES[storage_dtype]
+    if dtype.is_floating_point:
+        return neural.to(dtype), None, None
+
+    info = torch.iinfo(dtype)
+    if len(neural) == 0:
+        return neural.to(dtype), None, None
+    is_integral = (not neural.is_floating_point()) or torch.equal(
+        neural, neural.round())
+    if is_integral and neural.min() >= info.min and neural.max() <= info.max:
+        return neural.to(dtype), None, None
+
+    neural = neural.float()
+    low = neural.min(dim=0).values
+    high = neural.max(dim=0).values
+    scale = (high - low) / (info.max - info.min)
+    scale = torch.where(scale > 0, scale, torch.ones_like(scale))
+    shift = low - info.min * scale
+    quantized = torch.round((neural - shift) / scale).clamp_(info.min, info.max)
+    return quantized.to(dtype), scale, shift
+
+
+def _decompress_neural(neural: torch.Tensor, scale: Optional[torch.Tensor],
+                       shift: Optional[torch.Tensor]) -> torch.Tensor:
+    """Convert neural data stored by :py:func:`_compress_neural` to ``float32``.
+
+    Args:
+        neural: The stored data, with the channel dimension as the last axis.
+        scale: The per-channel scale, or ``None``.
+        shift: The per-channel shift, or ``None``.
+
+    Returns:
+        The ``float32`` data of the same shape as ``neural``.
+    """
+    neural = neural.float()
+    if scale is not None:
+        neural = neural * scale + shift
+    return neural
+
 
 class TensorDataset(cebra_data.SingleSessionDataset):
     """Discrete and/or continuously indexed dataset based on torch/numpy arrays.
@@ -55,6 +131,12 @@ class TensorDataset(cebra_data.SingleSessionDataset):
         discrete:
             Array of dtype ```int64`` or integer Tensor of shape ``(N, d)``, containing the discrete behavior
             variables over the same time dimension.
+        storage_dtype:
+            If specified, the neural data is kept in memory using a compact dtype (``int8``, ``int16``,
+            ``float16`` or ``bfloat16``) and only converted to ``float32`` when samples are gathered.
+            Integer data (e.g. spike counts) is stored without loss if it fits into the selected dtype,
+            otherwise each channel is quantized with a per-channel scale and shift. In this case, integer
+            arrays are also accepted for ``neural``.
 
     Example:
 
@@ -64,6 +146,8 @@ class TensorDataset(cebra_data.SingleSessionDataset):
         >>> index1 = torch.randn((100, 2))
         >>> index2 = torch.randint(0,5,(100, ))
         >>> dataset = cebra.data.datasets.TensorDataset(data, continuous=index1, discrete=index2)
+        >>> counts = torch.randint(0, 10, (100, 30), dtype=torch.int16)
+        >>> dataset = cebra.data.datasets.TensorDataset(counts, continuous=index1, storage_dtype="int8")
 
     """
 
@@ -73,9 +157,10 @@ class TensorDataset(cebra_data.SingleSessionDataset):
         continuous: Union[torch.Tensor, npt.NDArray] = None,
         discrete: Union[torch.Tensor, npt.NDArray] = None,
         offset: int = 1,
+        storage_dtype: Optional[str] = None,
     ):
         super().__init__()
-        self.neural = self._to_tensor(neural, torch.FloatTensor).float()
+        self._set_neural(neural, storage_dtype)
         self.continuous = self._to_tensor(continuous, torch.FloatTensor)
         self.discrete = self._to_tensor(discrete, torch.LongTensor)
         if self.continuous is None and self.discrete is None:
@@ -84,6 +169,14 @@ class TensorDataset(cebra_data.SingleSessionDataset):
             )
         self.offset = offset
 
+    def _set_neural(self, neural, storage_dtype):
+        if storage_dtype is None:
+            neural = self._to_tensor(neural, torch.FloatTensor)
+        else:
+            neural = self._to_tensor(neural)
+        (self.neural, self.neural_scale,
+         self.neural_shift) = _compress_neural(neural, storage_dtype)
+
     def _to_tensor(self, array, check_dtype=None):
         if array is None:
             return None
@@ -113,6 +206,236 @@ class TensorDataset(cebra_data.SingleSessionDataset):
     def __len__(self):
         return len(self.neural)
 
+    def upcast(self, neural: torch.Tensor) -> torch.Tensor:
+        return _decompress_neural(neural, self.neural_scale, self.neural_shift)
+
+    def __getitem__(self, index):
+        index = self.expand_index(index)
+        return self.upcast(self.neural[index]).transpose(2, 1)
+
+
+class SparseTensorDataset(TensorDataset):
+    """Discrete and/or continuously indexed dataset based on sparse neural data.
+
+    Spike counts binned at a high sampling rate are mostly zeros. This dataset keeps
+    the neural data as a time-major :py:attr:`torch.sparse_csr` tensor, so that
+    memory scales with the number of spikes rather than with the number of time
+    steps times the number of neurons. Only the windows sampled for a batch are
+    converted to dense ``float32`` tensors.
+
+    Args:
+        neural:
+            Sparse or dense array of shape ``(N, D)``, containing neural activity over time. Can be
+            a :py:mod:`scipy.sparse` matrix, a sparse or dense :py:class:`torch.Tensor` or a
+            :py:func:`numpy.array`. The values keep their dtype, e.g. ``int16`` spike counts.
+        continuous:
+            Array of dtype ```float`` or float Tensor of shape ``(N, d)``, containing the continuous behavior
+            variables over the same time dimension.
+        discrete:
+            Array of dtype ```int64`` or integer Tensor of shape ``(N, d)``, containing the discrete behavior
+            variables over the same time dimension.
+
+    Example:
+
+        >>> import cebra.data
+        >>> import scipy.sparse
+        >>> import torch
+        >>> counts = scipy.sparse.random(1000, 30, density=0.05, format="csr")
+        >>> index = torch.randn((1000, 2))
+        >>> dataset = cebra.data.datasets.SparseTensorDataset(counts, continuous=index)
+
+    """
+
+    def __init__(
+        self,
+        neural,
+        continuous: Union[torch.Tensor, npt.NDArray] = None,
+        discrete: Union[torch.Tensor, npt.NDArray] = None,
+        offset: int = 1,
+    ):
+        super().__init__(neural,
+                         continuous=continuous,
+                         discrete=discrete,
+                         offset=offset)
+
+    def _set_neural(self, neural, storage_dtype):
+        if scipy.sparse.issparse(neural):
+            neural = neural.tocsr()
+            neural.sum_duplicates()
+            neural = torch.sparse_csr_tensor(
+                torch.from_numpy(neural.indptr),
+                torch.from_numpy(neural.indices),
+                torch.from_numpy(neural.data),
+                size=neural.shape,
+                check_invariants=False,
+            )
+        else:
+            neural = self._to_tensor(neural)
+            if neural.layout != torch.sparse_csr:
+                neural = neural.to_sparse_csr()
+        if neural.dim() != 2:
+            raise ValueError(
+                f"Expected neural data of shape (N, D), got {tuple(neural.shape)}."
+            )
+        self.neural = neural
+        self.neural_scale = None
+        self.neural_shift = None
+
+    def __len__(self):
+        return self.neural.shape[0]
+
+    def upcast(self, neural: torch.Tensor) -> torch.Tensor:
+        if neural.layout == torch.sparse_csr:
+            neural = neural.to_dense()
+        return neural.float()
+
+    def _densify_rows(self, rows: torch.Tensor) -> torch.Tensor:
+        """Gather the given time steps as a dense tensor.
+
+        Args:
+            rows: A one-dimensional tensor of type long with time indices.
+
+        Returns:
+            A ``float32`` tensor of shape ``(len(rows), self.input_dimension)``.
+        """
+        crow_indices = self.neural.crow_indices()
+        col_indices = self.neural.col_indices()
+        values = self.neural.values()
+
+        rows = rows.to(crow_indices.device)
+        start = crow_indices[rows].long()
+        count = crow_indices[rows + 1].long() - start
+        row_of_value = torch.repeat_interleave(
+            torch.arange(len(rows), device=rows.device), count)
+        first_value = torch.cumsum(count, dim=0) - count
+        position = (torch.arange(len(row_of_value), device=rows.device) -
+                    first_value[row_of_value] + start[row_of_value])
+
+        dense = torch.zeros((len(rows), self.input_dimension),
+                            dtype=torch.float32,
+                            device=values.device)
+        dense.index_put_((row_of_value, col_indices[position].long()),
+                         values[position].float(),
+                         accumulate=True)
+        return dense
+
+    def __getitem__(self, index):
+        index = self.expand_index(index)
+        dense = self._densify_rows(index.flatten())
+        return dense.view(*index.shape, -1).transpose(2, 1)
+
+
+class StreamingDataset(cebra_data.SingleSessionDataset):
+    """Continuously indexed dataset which can be extended during training.
+
+    In closed-loop experiments, data of a live recording arrives in chunks. This
+    dataset stores the neural data and continuous index in
+    :py:class:`cebra.io.TensorBuffer` instances, so that new chunks can be added
+    with :py:meth:`append` in amortized constant time per sample, without copying
+    the data recorded so far. Optionally, only the most recent ``max_length``
+    samples are kept.
+
+    Use the dataset with :py:class:`cebra.data.single_session.StreamingDataLoader`,
+    which keeps the sampling distribution in sync with the dataset when appending
+    new samples.
+
+    Args:
+        neural:
+            Array of dtype ``float`` or float Tensor of shape ``(N, D)``, containing neural activity over time.
+        continuous:
+            Array of dtype ```float`` or float Tensor of shape ``(N, d)``, containing the continuous behavior
+            variables over the same time dimension. Can be ``None`` for time contrastive learning.
+        max_length:
+            If specified, only the most recent ``max_length`` samples are kept in the dataset.
+        device:
+            The device the data is stored on.
+
+    Example:
+
+        >>> import cebra.data
+        >>> import torch
+        >>> dataset = cebra.data.datasets.StreamingDataset(torch.randn((100, 30)),
+        ...                                                continuous=torch.randn((100, 2)))
+        >>> dataset.append(torch.randn((10, 30)), torch.randn((10, 2)))
+        >>> len(dataset)
+        110
+
+    """
+
+    def __init__(
+        self,
+        neural: Union[torch.Tensor, npt.NDArray],
+        continuous: Union[torch.Tensor, npt.NDArray] = None,
+        max_length: Optional[int] = None,
+        device: str = "cpu",
+    ):
+        super().__init__(device=device)
+        self.max_length = max_length
+        neural = self._to_tensor(neural)
+        self._neural = cebra.io.TensorBuffer(neural, max_length=max_length)
+        if continuous is not None:
+            continuous = self._to_tensor(continuous)
+            self._check_length(neural, continuous)
+            self._continuous = cebra.io.TensorBuffer(continuous,
+                                                     max_length=max_length)
+        else:
+            self._continuous = None
+
+    def _to_tensor(self, array):
+        return torch.as_tensor(array, dtype=torch.float32, device=self.device)
+
+    def _check_length(self, neural, continuous):
+        if len(neural) != len(continuous):
+            raise ValueError(
+                f"Neural data ({len(neural)} samples) and continuous index "
+                f"({len(continuous)} samples) need to match in their number "
+                "of samples.")
+
+    @property
+    def neural(self) -> torch.Tensor:
+        return self._neural.data
+
+    @property
+    def input_dimension(self) -> int:
+        return self.neural.shape[1]
+
+    @property
+    def continuous_index(self) -> Optional[torch.Tensor]:
+        if self._continuous is None:
+            return None
+        return self._continuous.data
+
+    def __len__(self):
+        return len(self._neural)
+
+    def append(self,
+               neural: Union[torch.Tensor, npt.NDArray],
+               continuous: Union[torch.Tensor, npt.NDArray] = None):
+        """Add new samples to the end of the dataset.
+
+        Args:
+            neural: The new neural data of shape ``(n, D)``.
+            continuous: The continuous index of shape ``(n, d)`` for the new samples.
+                Required if the dataset was created with a continuous index.
+        """
+        neural = self._to_tensor(neural)
+        if neural.shape[1:] != self.neural.shape[1:]:
+            raise ValueError(
+                f"Neural data needs to have {self.input_dimension} features, "
+                f"but got shape {tuple(neural.shape)}.")
+        if self._continuous is not None:
+            if continuous is None:
+                raise ValueError(
+                    "The dataset has a continuous index, pass the continuous "
+                    "index of the new samples.")
+            continuous = self._to_tensor(continuous)
+            self._check_length(neural, continuous)
+            self._continuous.append(continuous)
+        elif continuous is not None:
+            raise ValueError(
+                "The dataset was created without a continuous index.")
+        self._neural.append(neural)
+
     def __getitem__(self, index):
         index = self.expand_index(index)
         return self.neural[index].transpose(2, 1)
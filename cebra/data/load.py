@@ -32,12 +32,18 @@ Currently available formats:
 - Pickle files via ``pickle``
 - Joblib files via ``joblib``
 - Various dataframe formats via ``pandas``.
+- Parquet and Arrow/Feather files via ``pyarrow``
 - Matlab files via ``scipy.io.loadmat``
 - DeepLabCut (single animal) files via ``deeplabcut``
 """
 
 import abc
+import glob
+import hashlib
+import operator
+import os
 import pathlib
+import re
 import warnings
 from typing import IO, List, Optional, Union
 
@@ -45,6 +51,8 @@ import numpy as np
 import numpy.typing as npt
 import torch
 
+import cebra.io
+
 _IS_H5PY_AVAILABLE = True
 try:
     import h5py
@@ -84,6 +92,19 @@ except ModuleNotFoundError:
         ImportWarning,
     )
 
+_IS_PYARROW_AVAILABLE = True
+try:
+    import pyarrow
+    import pyarrow.feather
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ModuleNotFoundError:
+    _IS_PYARROW_AVAILABLE = False
+    warnings.warn(
+        "pyarrow module was not found, be sure it is installed in your env.",
+        ImportWarning,
+    )
+
 _IS_SCIPY_AVAILABLE = True
 try:
     import scipy.io
@@ -114,7 +135,17 @@ def _module_not_found_error(module_name):
 
 
 class _BaseLoader(abc.ABC):
-    """Base loader."""
+    """Base loader.
+
+    Loaders setting ``supports_lazy`` accept an additional ``lazy`` argument in
+    :py:meth:`load`, and then return an array-like object reading the data from
+    disk only when it is indexed.
+    """
+
+    supports_lazy = False
+    #: Whether loaded arrays can be stored in the :py:class:`_LoadCache`, which is
+    #: worth it for formats that are slow to parse.
+    supports_cache = False
 
     @abc.abstractmethod
     def load(
@@ -139,17 +170,22 @@ class _BaseLoader(abc.ABC):
 class _NumpyLoader(_BaseLoader):
     """Loader for numpy files.
 
-    Supports ``.npy``.
+    Supports ``.npy``. Lazy loading returns a read-only memory-mapped array.
     """
 
+    supports_lazy = True
+
     def load(
         file: Union[str, pathlib.Path],
         key: Optional[Union[str, int]] = None,
         columns: Optional[list] = None,
+        lazy: bool = False,
     ) -> npt.NDArray:
         try:
-            loaded_array = np.load(file)
+            loaded_array = np.load(file, mmap_mode="r" if lazy else None)
         except ValueError:
+            # NOTE: Arrays of objects cannot be memory-mapped and are always
+            # loaded into memory.
             loaded_array = np.load(file, allow_pickle=True)
         return loaded_array
 
@@ -195,13 +231,18 @@ class _H5pyLoader(_BaseLoader):
     """Loader for HDF5 files.
 
     Supports ``.h5``, ``.h``, ``.hdf``, ``.hdf5`` as well as the .h5 output files from DLC.
+    Lazy loading returns a :py:class:`LazyH5Array` for arrays stored in the file, while
+    :py:class:`pandas.DataFrame` are always loaded into memory.
     """
 
+    supports_lazy = True
+
     def load(
         filename: Union[str, pathlib.Path],
-        key: Optional[Union[str, int]],
-        columns: Optional[list],
-    ) -> npt.NDArray:
+        key: Optional[Union[str, int]] = None,
+        columns: Optional[list] = None,
+        lazy: bool = False,
+    ) -> Union[npt.NDArray, "LazyH5Array"]:
         if _IS_H5PY_AVAILABLE:
             with h5py.File(filename, "r") as loaded_h5_file:
                 # get keys in the file
@@ -240,8 +281,13 @@ class _H5pyLoader(_BaseLoader):
                 # if there is no pd.DataFrame or the key corresponds to a numpy.array
                 # it will either take the data structure associated with ``key`` or take
                 # the first numpy.array found in the data structure
+                elif array_keys and lazy:
+                    loaded_array = LazyH5Array(filename, array_keys[0], columns)
                 elif array_keys:
-                    loaded_array = loaded_h5_file.get(array_keys[0])[:]
+                    loaded_array = _read_h5_dataset(
+                        loaded_h5_file.get(array_keys[0]), slice(None),
+                        _check_h5_columns(loaded_h5_file.get(array_keys[0]),
+                                          columns))
                 else:
                     raise AttributeError(
                         "No valid data structure was found in your file.")
@@ -328,6 +374,171 @@ class _H5pyLoader(_BaseLoader):
         return df_keys, array_keys
 
 
+def _check_h5_columns(dataset,
+                      columns: Optional[list]) -> Optional[npt.NDArray]:
+    """Convert the selected ``columns`` of a 2D HDF5 dataset to non-negative indices."""
+    if columns is None:
+        return None
+    if len(dataset.shape) != 2:
+        raise AttributeError(
+            f"Selecting columns requires a 2D array, but the array stored in "
+            f"your file has shape {dataset.shape}.")
+    try:
+        return np.arange(dataset.shape[1])[np.asarray(columns, dtype=int)]
+    except (ValueError, IndexError):
+        raise AttributeError(
+            f"For arrays stored in an HDF5 file, columns need to be valid column "
+            f"indices in [0, {dataset.shape[1]}), got {columns}.")
+
+
+def _read_h5_dataset(dataset, rows, columns: Optional[npt.NDArray]):
+    """Read the given rows and columns of a HDF5 dataset.
+
+    ``h5py`` only supports a single list of increasing indices per selection. Selected
+    rows and columns are hence read in sorted order and re-arranged in memory.
+    """
+    if isinstance(rows, slice):
+        if columns is None:
+            return dataset[rows]
+        unique_columns, inverse_columns = np.unique(columns,
+                                                    return_inverse=True)
+        return dataset[rows, unique_columns][:, inverse_columns]
+    unique_rows, inverse_rows = np.unique(rows, return_inverse=True)
+    data = dataset[unique_rows][inverse_rows]
+    if columns is not None:
+        data = data[:, columns]
+    return data
+
+
+class LazyH5Array:
+    """Read-only array stored in a HDF5 file, read from disk on indexing.
+
+    Only the rows selected by indexing the array are read from the file, which
+    allows to work with datasets larger than the available memory. The array can
+    be converted into a :py:func:`numpy.array` with :py:func:`numpy.asarray`.
+
+    The file is opened when the array is first indexed, and stays open until
+    :py:meth:`close` is called, the array is used as a context manager or
+    garbage collected. It is reopened on the next access.
+
+    Args:
+        filename: The path to the HDF5 file.
+        key: The key of the array in the file.
+        columns: The indices of the columns to keep in the array. This requires
+            the array to be two-dimensional. By default, all columns are kept.
+
+    Example:
+
+        >>> import cebra
+        >>> import h5py
+        >>> import numpy as np
+        >>> with h5py.File("lazy_data.h5", "w") as file:
+        ...     _ = file.create_dataset("neural", data=np.random.normal(0, 1, (1000, 30)))
+        >>> neural = cebra.load_data("lazy_data.h5", key="neural", columns=[0, 5], lazy=True)
+        >>> neural.shape
+        (1000, 2)
+        >>> neural[:10].shape
+        (10, 2)
+        >>> with neural:
+        ...     neural[:10].shape
+        (10, 2)
+
+    """
+
+    def __init__(self,
+                 filename: Union[str, pathlib.Path],
+                 key: str,
+                 columns: Optional[list] = None):
+        if not _IS_H5PY_AVAILABLE:
+            raise _module_not_found_error("h5py")
+        self.filename = filename
+        self.key = key
+        self._file = None
+        dataset = self._dataset
+        self.columns = _check_h5_columns(dataset, columns)
+        self.dtype = dataset.dtype
+        if self.columns is None:
+            self.shape = dataset.shape
+        else:
+            self.shape = (dataset.shape[0], len(self.columns))
+        self.close()
+
+    @property
+    def _dataset(self):
+        if self._file is None:
+            self._file = h5py.File(self.filename, "r")
+        return self._file[self.key]
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(filename={self.filename}, key={self.key}, "
+            f"shape={self.shape}, dtype={self.dtype})")
+
+    def __getitem__(self, index):
+        if not isinstance(index, tuple):
+            index = (index,)
+        rows, index = index[0], index[1:]
+        if isinstance(rows, (int, np.integer)):
+            row = operator.index(rows)
+            if row < 0:
+                row += len(self)
+            if not 0 <= row < len(self):
+                raise IndexError(
+                    f"Index {rows} out of bounds for array with {len(self)} rows."
+                )
+            data = _read_h5_dataset(self._dataset, slice(row, row + 1),
+                                    self.columns)[0]
+        elif isinstance(rows, slice) and (rows.step is None or rows.step > 0):
+            data = _read_h5_dataset(self._dataset, rows, self.columns)
+            index = (slice(None),) + index
+        else:
+            if isinstance(rows, slice):
+                rows = np.array(range(*rows.indices(len(self))), dtype=np.int64)
+            rows = np.asarray(rows)
+            if rows.dtype == bool:
+                rows = rows.nonzero()[0]
+            rows = np.where(rows < 0, rows + len(self), rows)
+            if rows.size > 0 and (rows.min() < 0 or rows.max() >= len(self)):
+                raise IndexError(
+                    f"Index out of bounds for array with {len(self)} rows.")
+            data = _read_h5_dataset(self._dataset, rows.reshape(-1),
+                                    self.columns)
+            data = data.reshape(rows.shape + data.shape[1:])
+            index = (slice(None),) * rows.ndim + index
+        return data[index] if len(index) > 0 else data
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[:], dtype=dtype)
+
+    def __getstate__(self):
+        self.close()
+        return self.__dict__.copy()
+
+    def close(self):
+        """Close the underlying HDF5 file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "LazyH5Array":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        # NOTE: The file is not set if __init__ failed.
+        if getattr(self, "_file", None) is not None:
+            self.close()
+
+
 class _PandasLoader(_BaseLoader):
     """Loader for files containing :py:class:`pandas.DataFrame`."""
 
@@ -412,6 +623,8 @@ class _CsvLoader(_BaseLoader):
     Supports ``.csv``.
     """
 
+    supports_cache = True
+
     def load(
         file: Union[str, pathlib.Path],
         key: Optional[Union[str, int]] = None,
@@ -433,6 +646,8 @@ class _ExcelLoader(_BaseLoader):
     Supports ``.xls``, ``.xlsx``, ``.xlsm``.
     """
 
+    supports_cache = True
+
     def load(
         file: Union[str, pathlib.Path],
         key: Optional[Union[str, int]] = None,
@@ -475,6 +690,73 @@ class _ExcelLoader(_BaseLoader):
     #     return engine
 
 
+class _ArrowLoader(_BaseLoader):
+    """Loader for columnar Parquet and Arrow files.
+
+    Supports ``.parquet``, ``.feather`` and ``.arrow`` (Arrow IPC file format).
+    Only the selected ``columns`` are read from the file, and files are memory-mapped.
+    Numeric columns without missing values are converted to numpy without copies,
+    such that loading a single column of an uncompressed Arrow file does not read
+    the data into memory.
+    """
+
+    def load(
+        file: Union[str, pathlib.Path],
+        key: Optional[Union[str, int]] = None,
+        columns: Optional[list] = None,
+    ) -> npt.NDArray:
+        if not _IS_PYARROW_AVAILABLE:
+            raise _module_not_found_error("pyarrow")
+        is_parquet = pathlib.Path(file).suffix == ".parquet"
+        if key is not None:
+            raise AttributeError(
+                f"key={key} is not supported, Parquet and Arrow files contain a "
+                f"single table. Use columns to select the data of interest.")
+
+        if is_parquet:
+            schema = pyarrow.parquet.read_schema(file, memory_map=True)
+        else:
+            with pyarrow.memory_map(str(file)) as source:
+                schema = pyarrow.ipc.open_file(source).schema
+        if len(schema.names) == 0:
+            raise AttributeError(f"{pathlib.Path(file).suffix} file is empty.")
+        if columns is not None:
+            for c in columns:
+                if c not in schema.names:
+                    raise AttributeError(
+                        f"{c} is not a valid column of the table contained in your file, expected values from {schema.names}."
+                    )
+
+        if is_parquet:
+            table = pyarrow.parquet.read_table(file,
+                                               columns=columns,
+                                               memory_map=True)
+        else:
+            table = pyarrow.feather.read_table(file,
+                                               columns=columns,
+                                               memory_map=True)
+        return _ArrowLoader._to_numpy(table)
+
+    @staticmethod
+    def _to_numpy(table: "pyarrow.Table") -> npt.NDArray:
+        """Convert a :py:class:`pyarrow.Table` into a 2D :py:func:`numpy.array`.
+
+        Columns are converted individually, without copies when possible. A single
+        column is returned as a read-only view on the Arrow buffer, several columns
+        are copied once into the output array.
+        """
+        arrays = []
+        for column in table.columns:
+            if column.num_chunks == 1:
+                # NOTE: Zero-copy for numeric columns without missing values.
+                arrays.append(column.chunk(0).to_numpy(zero_copy_only=False))
+            else:
+                arrays.append(column.to_numpy())
+        if len(arrays) == 1:
+            return arrays[0][:, None]
+        return np.stack(arrays, axis=1)
+
+
 class _JoblibLoader(_BaseLoader):
     """Loader for JobLib files.
 
@@ -579,6 +861,8 @@ class _MatfileLoader(_BaseLoader):
     Supports ``.mat``. Newer and older versions.
     """
 
+    supports_cache = True
+
     def load(
         file: Union[str, pathlib.Path],
         key: Optional[Union[str, int]] = None,
@@ -628,6 +912,9 @@ __loaders = {
     ".xls": _ExcelLoader,
     ".xlsx": _ExcelLoader,
     ".xlsm": _ExcelLoader,
+    ".parquet": _ArrowLoader,
+    ".feather": _ArrowLoader,
+    ".arrow": _ArrowLoader,
     # ".xlsb": _ExcelLoader,
     # ".odf": _ExcelLoader,
     # ".ods": _ExcelLoader,
@@ -638,11 +925,99 @@ __loaders = {
     ".mat": _MatfileLoader,
 }
 
+_CACHE_DIR = os.environ.get(
+    "CEBRA_CACHEDIR", os.path.join(os.path.expanduser("~"), ".cache", "cebra"))
+_CACHE_MAX_SIZE = int(os.environ.get("CEBRA_CACHE_MAX_SIZE", 2**33))
+#: The names of cache entries, see :py:meth:`_LoadCache._path`.
+_CACHE_ENTRY_PATTERN = re.compile(r".*-[0-9a-f]{64}\.npy")
+
+
+class _LoadCache:
+    """Cache of arrays loaded from slow file formats, stored as ``.npy`` files.
+
+    Cache entries are keyed by the absolute path, size and modification time of the
+    source file, as well as the ``key`` and ``columns`` passed to the loader, so
+    that modified files are parsed again. Entries are written atomically with
+    :py:func:`cebra.io.save_npy`, which makes concurrent writers safe. When the total
+    size of the cache entries exceeds ``max_size``, the least recently used entries are
+    removed. Other files in the cache directory are never removed.
+
+    Args:
+        directory: The cache directory.
+        max_size: The maximum size of the cache, in bytes.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], max_size: int):
+        self.directory = pathlib.Path(directory)
+        self.max_size = max_size
+
+    def _path(self, file: Union[str, pathlib.Path], key,
+              columns) -> pathlib.Path:
+        file = pathlib.Path(file).resolve()
+        stat = file.stat()
+        entry = repr(
+            (str(file), stat.st_size, stat.st_mtime_ns, key, columns)).encode()
+        return self.directory / f"{file.stem}-{hashlib.sha256(entry).hexdigest()}.npy"
+
+    def get(self, file: Union[str, pathlib.Path], key,
+            columns) -> Optional[npt.NDArray]:
+        """Return the cached array, or ``None`` if not cached.
+
+        The returned array is a read-only :py:class:`numpy.ndarray` backed by a memory map of
+        the cache file, such that the data is only read from disk when accessed.
+        """
+        path = self._path(file, key, columns)
+        try:
+            array = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # NOTE: Entries of read-only caches are still used, but the time of their
+            # last use is not updated.
+            pass
+        return np.asarray(array)
+
+    def put(self, file: Union[str, pathlib.Path], key, columns,
+            array: npt.NDArray):
+        """Add an array to the cache and evict the least recently used entries."""
+        if not isinstance(array, np.ndarray) or array.dtype.hasobject:
+            return
+        # NOTE: The array is not cached if the cache directory is not writable.
+        if cebra.io.save_npy(self._path(file, key, columns), array):
+            self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits ``max_size``."""
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            if _CACHE_ENTRY_PATTERN.fullmatch(path.name) is None:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                # NOTE: The entry was removed by another process, or is still
+                # memory-mapped on systems which do not allow removing open files.
+                continue
+            total_size -= size
+
 
 def load(
     file: Union[str, pathlib.Path],
     key: Optional[Union[str, int]] = None,
     columns: Optional[list] = None,
+    lazy: bool = False,
+    cache: Union[bool, str, pathlib.Path] = False,
 ) -> npt.NDArray:
     """Load a dataset from the given file.
 
@@ -652,6 +1027,7 @@ def load(
         - PyTorch files: pt, p;
         - csv files;
         - Excel files: xls, xlsx, xlsm;
+        - Parquet and Arrow files: parquet, feather, arrow;
         - Joblib files: jl;
         - Pickle files: p, pkl;
         - MAT-files: mat.
@@ -669,8 +1045,19 @@ def load(
         file: The path to the given file to load, in a supported format.
         key: The key referencing the data of interest in the file, if the file has a dictionary-like structure.
         columns: The part of the data to keep in the output 2D-array. For now, it corresponds to the columns of
-            a DataFrame to keep if the data selected is a DataFrame.
-
+            a DataFrame to keep if the data selected is a DataFrame, or to the column indices to keep if the
+            data selected is a 2D array stored in a HDF5 file.
+        lazy: If ``True``, the data is not read into memory. Instead, ``.npy`` files are returned as read-only
+            memory-mapped arrays, and arrays in HDF5 files as :py:class:`LazyH5Array`, which only read the
+            rows selected by indexing from disk. Other formats are loaded into memory as usual.
+        cache: If ``True`` or a path to a directory, arrays loaded from CSV, Excel and MAT-files are
+            stored as ``.npy`` files in the cache directory, and later loads of the same, unchanged file
+            return an array backed by a memory map of the cache file instead of parsing the file again.
+            With caching, a read-only :py:class:`numpy.ndarray` is returned both when the file is parsed
+            and when it is read from the cache. If ``True``, the
+            cache directory is given by the environment variable ``CEBRA_CACHEDIR`` (default:
+            ``~/.cache/cebra``). The cache size is limited to ``CEBRA_CACHE_MAX_SIZE`` bytes (default:
+            8GB), and the least recently used entries are removed first.
 
     Returns:
         The loaded data.
@@ -696,10 +1083,101 @@ def load(
     """
     file_ending = pathlib.Path(file).suffix
     loader = _get_loader(file_ending)
-    data = loader.load(file, key=key, columns=columns)
+    if cache and loader.supports_cache:
+        load_cache = _LoadCache(_CACHE_DIR if cache is True else cache,
+                                max_size=_CACHE_MAX_SIZE)
+        data = load_cache.get(file, key, columns)
+        if data is None:
+            data = loader.load(file, key=key, columns=columns)
+            load_cache.put(file, key, columns, data)
+            if isinstance(data, np.ndarray):
+                # NOTE: Consistent with cache hits, which are backed by read-only memory maps.
+                data.flags.writeable = False
+    elif lazy and loader.supports_lazy:
+        data = loader.load(file, key=key, columns=columns, lazy=True)
+    else:
+        data = loader.load(file, key=key, columns=columns)
     return data
 
 
+def load_files(
+    files: Union[str, List[Union[str, pathlib.Path]]],
+    key: Optional[Union[str, int, list]] = None,
+    columns: Optional[list] = None,
+    n_jobs: int = -1,
+    **kwargs,
+) -> List[npt.NDArray]:
+    """Load datasets from several files concurrently.
+
+    Files in formats that are slow to parse (CSV, Excel and MAT-files) are loaded in
+    separate processes, all other files are loaded in a thread pool. The loaded arrays
+    are returned in the order of the input files, and can be directly passed to
+    :py:meth:`cebra.CEBRA.fit` for multi-session training.
+
+    Args:
+        files: A list of paths to the files to load, or a glob pattern matching the
+            files. Files matching a pattern are loaded in sorted order.
+        key: The key referencing the data of interest in each file, see :py:func:`load`.
+            If a list is passed, it should contain a key for each file.
+        columns: The columns to keep for each file, see :py:func:`load`. If a list of lists
+            is passed, it should contain the columns for each file.
+        n_jobs: The maximum number of files loaded concurrently. If ``-1``, all CPUs are used.
+        kwargs: Additional arguments passed to :py:func:`load` for each file.
+
+    Returns:
+        The list of loaded arrays.
+
+    Example:
+
+        >>> import cebra
+        >>> import numpy as np
+        >>> for session in range(3):
+        ...     np.savez(f"session_{session}", neural=np.random.normal(0, 1, (100, 3)))
+        >>> X = cebra.load_files("session_*.npz", key="neural", n_jobs=2)
+        >>> len(X)
+        3
+
+    """
+    if not _IS_JOBLIB_AVAILABLE:
+        raise _module_not_found_error("joblib")
+    if isinstance(files, (str, pathlib.Path)):
+        if glob.has_magic(str(files)):
+            pattern, files = files, sorted(glob.glob(str(files)))
+            if len(files) == 0:
+                raise FileNotFoundError(f"No file matches {pattern}.")
+        else:
+            files = [files]
+
+    keys = key if isinstance(key, (list, tuple)) else [key] * len(files)
+    if columns is not None and len(columns) > 0 and all(
+            c is None or isinstance(c, (list, tuple)) for c in columns):
+        columns_list = list(columns)
+    else:
+        columns_list = [columns] * len(files)
+    if len(keys) != len(files) or len(columns_list) != len(files):
+        raise ValueError(
+            f"Provide a key and columns for each of the {len(files)} files, "
+            f"or a single value for all files, got {len(keys)} keys and "
+            f"{len(columns_list)} columns.")
+
+    is_slow = [
+        _get_loader(pathlib.Path(file).suffix).supports_cache for file in files
+    ]
+    loaded = [None] * len(files)
+    for backend, slow in (("loky", True), ("threading", False)):
+        indices = [i for i in range(len(files)) if is_slow[i] == slow]
+        if len(indices) == 0:
+            continue
+        jobs = (jl.delayed(load)(files[i],
+                                 key=keys[i],
+                                 columns=columns_list[i],
+                                 **kwargs) for i in indices)
+        arrays = jl.Parallel(n_jobs=n_jobs, backend=backend)(jobs)
+        for i, array in zip(indices, arrays):
+            loaded[i] = array
+    return loaded
+
+
 def _get_loader(file_ending: str) -> _BaseLoader:
     """Get corresponding class based on handled file ending.
 
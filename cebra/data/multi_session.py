@@ -40,6 +40,7 @@ __all__ = [
     "ContinuousMultiSessionDataLoader",
     "DiscreteMultiSessionDataLoader",
     "MixedMultiSessionDataLoader",
+    "FullMultiSessionDataLoader",
 ]
 
 
@@ -158,6 +159,68 @@ class ContinuousMultiSessionDataLoader(MultiSessionLoader):
         return self.dataset.continuous_index
 
 
+@dataclasses.dataclass
+class FullMultiSessionDataLoader(ContinuousMultiSessionDataLoader):
+    """Data loader for multi-session batch gradient descent, returning all samples at once.
+
+    All sessions contribute the same number of reference samples, which is the number of
+    valid samples (according to the model's offset) of the shortest session. If all
+    sessions have the same length, all valid samples of each session are used as
+    reference samples in each step. For longer sessions, a random subset of the valid
+    samples is selected in each step.
+
+    Instead of batches of input samples, the loader returns the indices of the samples,
+    which are used by :py:class:`cebra.solver.multi_session.BatchMultiSessionSolver` to
+    select the samples from the embedding of the full sessions.
+    """
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.batch_size = None
+
+    def get_indices(self, num_samples=None) -> BatchIndex:
+        """Samples indices for reference, positive and negative examples.
+
+        The negative indices of each session are a permutation of its reference indices,
+        and the positive indices are sampled as before from the conditional distribution
+        given the reference samples.
+
+        Returns:
+            Indices for reference, positive and negatives samples, each of shape
+            ``(session, batch)``, with the batch size equal to the number of valid
+            samples of the shortest session.
+        """
+        assert num_samples is None
+
+        sessions = list(self.dataset.iter_sessions())
+        num_valid = [
+            len(session) - len(session.offset) + 1 for session in sessions
+        ]
+        num_samples = min(num_valid)
+        ref_idx = np.stack([
+            np.sort(np.random.permutation(num_session)[:num_samples]) +
+            session.offset.left
+            for session, num_session in zip(sessions, num_valid)
+        ])
+        neg_idx = np.stack([
+            session_idx[np.random.permutation(num_samples)]
+            for session_idx in ref_idx
+        ])
+        pos_idx, idx, idx_rev = self.sampler.sample_conditional(ref_idx)
+
+        return BatchIndex(
+            reference=torch.from_numpy(ref_idx),
+            positive=torch.from_numpy(pos_idx),
+            negative=torch.from_numpy(neg_idx),
+            index=idx,
+            index_reversed=idx_rev,
+        )
+
+    def __iter__(self):
+        for _ in range(len(self)):
+            yield self.get_indices(num_samples=self.batch_size)
+
+
 @dataclasses.dataclass
 class DiscreteMultiSessionDataLoader(MultiSessionLoader):
     pass
@@ -43,6 +43,7 @@ __all__ = [
     "SingleSessionDataset",
     "DiscreteDataLoader",
     "ContinuousDataLoader",
+    "StreamingDataLoader",
     "MixedDataLoader",
     "HybridDataLoader",
     "FullDataLoader",
@@ -64,6 +65,22 @@ class SingleSessionDataset(cebra_data.Dataset):
     def __len__(self):
         raise NotImplementedError
 
+    def upcast(self, neural: torch.Tensor) -> torch.Tensor:
+        """Convert neural data in the storage format of this dataset to ``float32``.
+
+        Datasets which keep their data in a compact dtype (see e.g.
+        :py:class:`cebra.data.datasets.TensorDataset`) override this method.
+        By default, the data is returned unchanged.
+
+        Args:
+            neural: Data with the neuron dimension as the last axis, e.g. obtained
+                by indexing the ``neural`` attribute of the dataset.
+
+        Returns:
+            The data as a ``float32`` tensor of the same shape.
+        """
+        return neural
+
     def load_batch(self, index: BatchIndex) -> Batch:
         """Return the data at the specified index location."""
         return Batch(
@@ -258,6 +275,58 @@ class ContinuousDataLoader(cebra_data.Loader):
                           negative=negative_idx)
 
 
+@dataclasses.dataclass
+class StreamingDataLoader(ContinuousDataLoader):
+    """Contrastive learning on a dataset which is extended during training.
+
+    Requires a :py:class:`cebra.data.datasets.StreamingDataset`. New samples should
+    be added through :py:meth:`append`, which extends the dataset and updates the
+    sampling distribution incrementally instead of re-initializing it. The loader
+    can therefore be re-used for training on a live recording.
+
+    Only the ``time`` and ``time_delta`` conditionals are supported; for the latter,
+    sampling is implemented in
+    :py:class:`cebra.distributions.continuous.StreamingTimedeltaDistribution`.
+
+    Args:
+        See dataclass fields.
+    """
+
+    def _init_distribution(self):
+        if self.conditional == "time":
+            super()._init_distribution()
+        elif self.conditional == "time_delta":
+            if self.dataset.continuous_index is None:
+                raise ValueError(
+                    f"Dataset {self.dataset} does not provide a continuous index."
+                )
+            self.distribution = cebra.distributions.StreamingTimedeltaDistribution(
+                self.dataset.continuous_index,
+                self.time_offset,
+                max_length=self.dataset.max_length,
+                device=self.device)
+        else:
+            raise ValueError(
+                f"Conditional {self.conditional} is not supported for streaming "
+                "datasets, use 'time' or 'time_delta'.")
+
+    def append(self, neural: torch.Tensor, continuous: torch.Tensor = None):
+        """Add new samples to the dataset and the sampling distribution.
+
+        Args:
+            neural: The new neural data of shape ``(n, D)``.
+            continuous: The continuous index of shape ``(n, d)`` for the new samples,
+                if the dataset has a continuous index.
+        """
+        if continuous is not None:
+            continuous = torch.as_tensor(continuous, dtype=torch.float32)
+        self.dataset.append(neural, continuous)
+        if self.conditional == "time":
+            self.distribution.num_samples = len(self.dataset)
+        else:
+            self.distribution.append(continuous)
+
+
 @dataclasses.dataclass
 class MixedDataLoader(cebra_data.Loader):
     """Mixed discrete-continuous data loader.
@@ -36,8 +36,6 @@ import pathlib
 import h5py
 import joblib
 import numpy as np
-import pandas as pd
-import scipy.io
 import torch
 from numpy.random import Generator
 from numpy.random import PCG64
@@ -48,6 +46,7 @@ from cebra.datasets import get_datapath
 from cebra.datasets import parametrize
 from cebra.datasets import register
 from cebra.datasets.allen import NUM_NEURONS
+from cebra.datasets.allen import pseudo_mouse
 from cebra.datasets.allen import SEEDS
 
 _DEFAULT_DATADIR = get_datapath()
@@ -128,71 +127,7 @@ class AllenCaMovieDataset(cebra.data.SingleSessionDataset):
         """
 
         self.area = area
-        path = pathlib.Path(
-            _DEFAULT_DATADIR
-        ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / str(area)
-        list_mice = path.glob("*.mat")
-        exp_containers = [int(file.stem) for file in list_mice]
-
-        ## Load summary file
-        summary = pd.read_csv(
-            pathlib.Path(_DEFAULT_DATADIR) / "allen" / "data_summary.csv")
-        ## Filter excitatory neurons in V1
-        area_filtered = summary[(summary["exp"].isin(exp_containers)) &
-                                (summary["target"] == area) &
-                                ~(summary["cre_line"].str.contains("SSt")) &
-                                ~(summary["cre_line"].str.contains("Pvalb")) &
-                                ~(summary["cre_line"].str.contains("Vip"))]
-
-        def _convert_to_nums(string):
-            return list(
-                map(
-                    int,
-                    string.replace("\n", "").replace("[",
-                                                     "").replace("]",
-                                                                 "").split(),
-                ))
-
-        ## Pseudo V1
-        pseudo_mouse = []
-        for exp_container in set(area_filtered["exp"]):
-            neurons = summary[summary["exp"] == exp_container]["neurons"]
-            sessions = summary[summary["exp"] == exp_container]["session_type"]
-            seq_sessions = np.array(list(sessions)).argsort()
-            common_neurons = set.intersection(
-                set(_convert_to_nums(neurons.iloc[0])),
-                set(_convert_to_nums(neurons.iloc[1])),
-                set(_convert_to_nums(neurons.iloc[2])),
-            )
-            indices1 = [
-                _convert_to_nums(neurons.iloc[0]).index(x)
-                for x in common_neurons
-            ]
-            indices2 = [
-                _convert_to_nums(neurons.iloc[1]).index(x)
-                for x in common_neurons
-            ]
-            indices3 = [
-                _convert_to_nums(neurons.iloc[2]).index(x)
-                for x in common_neurons
-            ]
-            indices1.sort()
-            indices2.sort()
-            indices3.sort()
-            indices = [indices1, indices2, indices3]
-            matfile = pathlib.Path(
-                _DEFAULT_DATADIR
-            ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / str(
-                area) / f"{exp_container}.mat"
-            traces = scipy.io.loadmat(matfile)
-            for n, i in enumerate(seq_sessions):
-                session = traces["filtered_traces_days_events"][n, 0][
-                    indices[i], :]
-                pseudo_mouse.append(session)
-
-        pseudo_mouse = np.concatenate(pseudo_mouse)
-
-        return pseudo_mouse
+        return pseudo_mouse.load_pseudo_mouse(area)
 
     def __len__(self):
         return self.neural.size(0)
@@ -37,8 +37,6 @@ import pathlib
 import h5py
 import joblib
 import numpy as np
-import pandas as pd
-import scipy.io
 import torch
 from numpy.random import Generator
 from numpy.random import PCG64
@@ -49,6 +47,7 @@ from cebra.datasets import get_datapath
 from cebra.datasets import parametrize
 from cebra.datasets import register
 from cebra.datasets.allen import NUM_NEURONS
+from cebra.datasets.allen import pseudo_mouse
 from cebra.datasets.allen import SEEDS
 from cebra.datasets.allen import SEEDS_DISJOINT
 
@@ -184,75 +183,7 @@ class AllenCaMoviesDataset(cebra.data.SingleSessionDataset):
 
         """
 
-        path = pathlib.Path(
-            _DEFAULT_DATADIR
-        ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / str(area)
-        list_mice = path.glob("*.mat")
-        exp_containers = [int(file.stem) for file in list_mice]
-        ## Load summary file
-        summary = pd.read_csv(
-            pathlib.Path(_DEFAULT_DATADIR) / "allen" / "data_summary.csv")
-        ## Filter excitatory neurons in V1
-        area_filtered = summary[(summary["exp"].isin(exp_containers)) &
-                                (summary["target"] == area) &
-                                ~(summary["cre_line"].str.contains("SSt")) &
-                                ~(summary["cre_line"].str.contains("Pvalb")) &
-                                ~(summary["cre_line"].str.contains("Vip"))]
-
-        def _convert_to_nums(string):
-            return list(
-                map(
-                    int,
-                    string.replace("\n", "").replace("[",
-                                                     "").replace("]",
-                                                                 "").split(),
-                ))
-
-        ## Pseudo V1
-        pseudo_mouse = []
-        for exp_container in set(area_filtered["exp"]):
-            neurons = summary[summary["exp"] == exp_container]["neurons"]
-            sessions = summary[summary["exp"] == exp_container]["session_type"]
-            seq_sessions = np.array(list(sessions)).argsort()
-            common_neurons = set.intersection(
-                set(_convert_to_nums(neurons.iloc[0])),
-                set(_convert_to_nums(neurons.iloc[1])),
-                set(_convert_to_nums(neurons.iloc[2])),
-            )
-            indices1 = [
-                _convert_to_nums(neurons.iloc[0]).index(x)
-                for x in common_neurons
-            ]
-            indices2 = [
-                _convert_to_nums(neurons.iloc[1]).index(x)
-                for x in common_neurons
-            ]
-            indices3 = [
-                _convert_to_nums(neurons.iloc[2]).index(x)
-                for x in common_neurons
-            ]
-            indices1.sort()
-            indices2.sort()
-            indices3.sort()
-            indices = [indices1, indices2, indices3]
-            matfile = pathlib.Path(
-                _DEFAULT_DATADIR
-            ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / str(
-                area) / f"{exp_container}.mat"
-            traces = scipy.io.loadmat(matfile)
-            for n, i in enumerate(seq_sessions):
-                session = traces["filtered_traces_days_events"][n, 0][
-                    indices[i], :]
-                pseudo_mouse.append(session)
-
-        pseudo_mouse = np.concatenate(pseudo_mouse)
-
-        return pseudo_mouse
-
-        pseudo_mouse = np.vstack(
-            [get_neural_data(num_movie, mice) for mice in list_mice])
-
-        return pseudo_mouse
+        return pseudo_mouse.load_pseudo_mouse(area)
 
     def __len__(self):
         return self.neural.size(0)
@@ -338,33 +269,4 @@ class AllenCaMoviesDisjointDataset(AllenCaMoviesDataset,
             area: The visual cortical area to sample the neurons. Possible options: VISp, VISpm, VISam, VISal, VISl, VISrl.
 
         """
-        path = pathlib.Path(
-            _DEFAULT_DATADIR
-        ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / str(area)
-        list_mice = path.glob("*")
-
-        def _get_neural_data(num_movie, mat_file):
-            mat = scipy.io.loadmat(mat_file)
-            if num_movie == "one":
-                mat_index = None
-                mat_key = "united_traces_days_events"
-            elif num_movie == "two":
-                mat_index = (2, 1)
-                mat_key = "filtered_traces_days_events"
-            elif num_movie == "three":
-                mat_index = (0, 1)
-                mat_key = "filtered_traces_days_events"
-            else:
-                raise ValueError("num_movie should be one, two or three")
-
-            if mat_index is not None:
-                events = mat[mat_key][mat_index[0], mat_index[1]]
-            else:
-                events = mat[mat_key][:, :, 0]  ## Take one session only
-
-            return events
-
-        pseudo_mouse = np.vstack(
-            [_get_neural_data(num_movie, mice) for mice in list_mice])
-
-        return pseudo_mouse
+        return pseudo_mouse.load_session_a_pseudo_mouse(area, num_movie)
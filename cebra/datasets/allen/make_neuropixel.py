@@ -93,17 +93,12 @@ def _spikes_by_units(spike_times: npt.NDArray[np.float64],
 
     """
 
-    units = []
-    for n, t in enumerate(spike_time_index):
-        if n == 0:
-            unit = spike_times[:t]
-        elif n != len(spike_time_index) - 1:
-            unit = spike_times[spike_time_index[n - 1]:t]
-        else:
-            unit = spike_times[t:]
-        units.append(unit)
-
-    return units
+    units = np.split(spike_times, spike_time_index)
+    if len(spike_time_index) <= 1:
+        return units[:len(spike_time_index)]
+    # NOTE: The last unit is assigned the spikes after the last index, matching the
+    # originally published preprocessing.
+    return units[:-2] + units[-1:]
 
 
 def _get_area(
@@ -122,8 +117,15 @@ def _get_area(
     """
 
     units = np.empty(len(peak_channel_id), dtype="object")
-    for n, i in enumerate(electrode_id):
-        units[peak_channel_id == i] = area[n]
+    if len(electrode_id) == 0:
+        return units
+    # For duplicated electrode ids, the area of the last electrode is used.
+    order = np.argsort(electrode_id, kind="stable")
+    sorted_ids = electrode_id[order]
+    position = np.searchsorted(sorted_ids, peak_channel_id, side="right") - 1
+    position = np.clip(position, 0, None)
+    found = sorted_ids[position] == peak_channel_id
+    units[found] = area[order[position[found]]]
 
     return units
 
@@ -156,18 +158,71 @@ def _spike_counts(bin_edges: npt.NDArray[np.float64], units: list):
 
     """
 
-    spike_matrix = np.zeros((len(bin_edges) - 1, len(units)))
-    for i, unit_spikes in enumerate(units):
-        hist, bin_edges_hist = np.histogram(unit_spikes, bin_edges)
-        spike_matrix[:, i] = hist
+    num_bins = len(bin_edges) - 1
+    if len(units) == 0:
+        return np.zeros((num_bins, 0), dtype=np.int64)
+    spikes = np.concatenate(units)
+    unit_index = np.repeat(np.arange(len(units)), [len(u) for u in units])
+
+    # Same binning as np.histogram: bins are half-open, except for the last one.
+    bins = np.searchsorted(bin_edges, spikes, side="right") - 1
+    bins[spikes == bin_edges[-1]] = num_bins - 1
+    valid = (bins >= 0) & (bins < num_bins)
+
+    spike_matrix = np.bincount(bins[valid] * len(units) + unit_index[valid],
+                               minlength=num_bins * len(units))
+    return spike_matrix.reshape(num_bins, len(units))
 
-    return spike_matrix
+
+def _read_session(file, cortex: str, sampling_rate: float):
+    """Compute the spike counts of the units in ``cortex`` for a single session file.
+
+    Returns:
+        The session identifier, the spike count matrix and the movie frame of each
+        bin, or ``None`` if the file does not contain a brain observatory session.
+    """
+    with h5py.File(file, "r") as d:
+        print("read one session and filter for area and quality")
+        if "brain" not in d["general/stimulus"][...].item():
+            return None
+        area_list = d["general/extracellular_ephys/electrodes/location"][...]
+        start_time = d["intervals/natural_movie_one_presentations/start_time"][
+            ...]
+        end_time = d["intervals/natural_movie_one_presentations/stop_time"][...]
+        session_no = d["identifier"][...].item()
+        spike_time_index = d["units/spike_times_index"][...]
+        spike_times = d["units/spike_times"][...]
+        ids = d["units/id"][...]
+        amplitude_cutoff = d["units/amplitude_cutoff"][...]
+        presence_ratio = d["units/presence_ratio"][...]
+        isi_violations = d["units/isi_violations"][...]
+        quality = d["units/quality"][...]
+
+        peak_channel_id = d["units/peak_channel_id"][...]
+        electrode_id = d["general/extracellular_ephys/electrodes/id"][...]
+
+    unit_spikes = _spikes_by_units(spike_times, spike_time_index)
+    filtered_quality = _filter_units(ids, isi_violations, amplitude_cutoff,
+                                     presence_ratio, quality)
+    unit_areas = _get_area(area_list, peak_channel_id, electrode_id)
+
+    filtered_unit = [
+        _get_movie1(start_time[0], end_time[8999], unit)
+        for area, is_good, unit in zip(unit_areas, filtered_quality,
+                                       unit_spikes)
+        if area == cortex and is_good
+    ]
+    bin_edges = np.arange(start_time[0], end_time[8999], 1 / sampling_rate)
+    movie_frame = np.digitize(bin_edges, start_time[:9000], right=False) - 1
+    spike_matrix = _spike_counts(bin_edges, filtered_unit)
+    return session_no, spike_matrix, movie_frame % 900
 
 
 def read_neuropixel(
     path: str = pathlib.Path("/shared/neuropixel/"),
     cortex: str = "VISp",
     sampling_rate: float = 120.0,
+    n_jobs: int = 1,
 ):
     """Load 120Hz Neuropixels data recorded in the specified cortex during the movie1 stimulus.
 
@@ -177,66 +232,21 @@ def read_neuropixel(
         path: The wildcard file path where the neuropixels .nwb files are located.
         cortex: The cortex where the neurons were recorded. Choose from VISp, VISal, VISrl, VISl, VISpm, VISam.
         sampling_rate: The sampling rate for spike counts to process the raw data.
+        n_jobs: The number of session files processed in parallel, see :py:class:`joblib.Parallel`.
 
     """
 
-    files = path.glob("*/*.nwb")
+    files = pathlib.Path(path).glob("*/*.nwb")
     sessions = {}
-    len_recording = []
     session_frames = []
-    for f in files:
-        with h5py.File(f, "r") as d:
-            print("read one session and filter for area and quality")
-            if "brain" in d["general/stimulus"][...].item():
-                area_list = d[
-                    "general/extracellular_ephys/electrodes/location"][...]
-                start_time = d[
-                    "intervals/natural_movie_one_presentations/start_time"][...]
-                end_time = d[
-                    "intervals/natural_movie_one_presentations/stop_time"][...]
-                timeseries = d[
-                    "intervals/natural_movie_one_presentations/timeseries"][...]
-                timeseries_index = d[
-                    "intervals/natural_movie_one_presentations/timeseries_index"][
-                        ...]
-                session_no = d["identifier"][...].item()
-                spike_time_index = d["units/spike_times_index"][...]
-                spike_times = d["units/spike_times"][...]
-                ids = d["units/id"][...]
-                amplitude_cutoff = d["units/amplitude_cutoff"][...]
-                presence_ratio = d["units/presence_ratio"][...]
-                isi_violations = d["units/isi_violations"][...]
-                quality = d["units/quality"][...]
-
-                peak_channel_id = d["units/peak_channel_id"][...]
-                electrode_id = d["general/extracellular_ephys/electrodes/id"][
-                    ...]
-                unit_spikes = _spikes_by_units(spike_times, spike_time_index)
-                filtered_quality = _filter_units(ids, isi_violations,
-                                                 amplitude_cutoff,
-                                                 presence_ratio, quality)
-                unit_areas = _get_area(area_list, peak_channel_id, electrode_id)
-                units_in_movie1 = []
-
-                for unit in unit_spikes:
-                    spikes_in_movie1 = _get_movie1(start_time[0],
-                                                   end_time[8999], unit)
-                    units_in_movie1.append(spikes_in_movie1)
-
-                filtered_unit = []
-
-                for area, quality, unit in zip(unit_areas, filtered_quality,
-                                               units_in_movie1):
-                    if area == cortex and quality:
-                        filtered_unit.append(unit)
-                bin_edges = np.arange(start_time[0], end_time[8999],
-                                      1 / sampling_rate)
-                movie_frame = np.digitize(
-                    bin_edges, start_time[:9000], right=False) - 1
-                spike_matrix = _spike_counts(bin_edges, filtered_unit)
-                len_recording.append(spike_matrix.shape[0])
-                sessions[session_no] = spike_matrix
-                session_frames.append(movie_frame % 900)
+    results = jl.Parallel(n_jobs=n_jobs)(
+        jl.delayed(_read_session)(f, cortex, sampling_rate) for f in files)
+    for result in results:
+        if result is None:
+            continue
+        session_no, spike_matrix, movie_frame = result
+        sessions[session_no] = spike_matrix
+        session_frames.append(movie_frame)
     print("Build pseudomouse")
     for session_key in sessions.keys():
         sessions[session_key] = sessions[session_key][:sampling_rate * 10 * 30]
@@ -255,11 +265,13 @@ if __name__ == "__main__":
                         type=str)
     parser.add_argument("--sampling-rate", default=120, type=float)
     parser.add_argument("--cortex", default="VISp", type=str)
+    parser.add_argument("--n-jobs", default=1, type=int)
     args = parser.parse_args()
     sessions_dic, session_frames = read_neuropixel(
         path=args.data_path,
         cortex=args.cortex,
-        sampling_rate=args.sampling_rate)
+        sampling_rate=args.sampling_rate,
+        n_jobs=args.n_jobs)
     pseudo_mice = np.concatenate([v for v in sessions_dic.values()], axis=1)
     pseudo_mice_frames = session_frames[0]
 
@@ -0,0 +1,229 @@
+#
+# CEBRA: Consistent EmBeddings of high-dimensional Recordings using Auxiliary variables
+# © Mackenzie W. Mathis & Steffen Schneider (v0.4.0+)
+# Source code:
+# https://github.com/AdaptiveMotorControlLab/CEBRA
+#
+# Please see LICENSE.md for the full license document:
+# https://github.com/AdaptiveMotorControlLab/CEBRA/blob/main/LICENSE.md
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Construct the Allen pseudomouse calcium datasets from the preprocessed recordings.
+
+The neurons of multiple experiment containers are stacked into a single
+pseudomouse. The containers are loaded in parallel and the assembled arrays are
+cached on disk, keyed by the area, the selected traces and the modification
+times of the source files, so that instantiating datasets with different seeds
+or numbers of neurons does not parse the source files again.
+
+References:
+    *Deitch, Daniel, Alon Rubin, and Yaniv Ziv. "Representational drift in the mouse visual cortex." Current biology 31.19 (2021): 4327-4339.
+    *https://github.com/zivlab/visual_drift
+
+"""
+
+import functools
+import hashlib
+import pathlib
+from typing import Callable, List
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.io
+
+import cebra.io
+from cebra.datasets import get_datapath
+
+_DEFAULT_DATADIR = get_datapath()
+
+
+def _calcium_path(datadir, area: str) -> pathlib.Path:
+    return pathlib.Path(
+        datadir
+    ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / str(area)
+
+
+def _cache_key(*args, files: List[pathlib.Path]) -> str:
+    """Hash the given arguments along with the names and modification times of ``files``."""
+    key = hashlib.sha256(repr(args).encode())
+    for file in sorted(files):
+        key.update(f"{file.name}:{file.stat().st_mtime_ns}".encode())
+    return key.hexdigest()
+
+
+def _load_cached(datadir, name: str, key: str,
+                 compute: Callable[[], np.ndarray]) -> np.ndarray:
+    """Load an array from the cache directory, or compute and cache it.
+
+    The cache file is written atomically with :py:func:`cebra.io.save_npy`, such that
+    concurrent or interrupted runs never leave a partially written cache file. If the
+    cache directory is not writable, the array is computed without caching.
+    """
+    cache_file = pathlib.Path(datadir) / "allen" / "cache" / f"{name}-{key}.npy"
+    if cache_file.exists():
+        return np.load(cache_file)
+    data = compute()
+    cebra.io.save_npy(cache_file, data)
+    return data
+
+
+def _convert_to_nums(string: str) -> np.ndarray:
+    """Parse the neuron ids stored as a string in the data summary."""
+    return np.array(string.replace("\n", "").replace("[",
+                                                     "").replace("]",
+                                                                 "").split(),
+                    dtype=np.int64)
+
+
+def _common_neuron_indices(neurons: List[str]) -> List[np.ndarray]:
+    """Return the sorted indices of the neurons recorded in all sessions.
+
+    Args:
+        neurons: The neuron ids of each session, as stored in the data summary.
+
+    Returns:
+        For each session, the indices of the neurons recorded in all sessions.
+        If a neuron id occurs multiple times, its first occurrence is used.
+    """
+    neuron_ids = [_convert_to_nums(session) for session in neurons]
+    common_neurons = functools.reduce(np.intersect1d, neuron_ids)
+    return [
+        np.sort(np.intersect1d(ids, common_neurons, return_indices=True)[1])
+        for ids in neuron_ids
+    ]
+
+
+def _load_container(matfile: pathlib.Path, neurons: List[str],
+                    session_types: List[str]) -> np.ndarray:
+    """Load the traces of the neurons recorded in all sessions of an experiment container."""
+    indices = _common_neuron_indices(neurons)
+    seq_sessions = np.array(session_types).argsort()
+    traces = scipy.io.loadmat(matfile)
+    return np.concatenate([
+        traces["filtered_traces_days_events"][n, 0][indices[i], :]
+        for n, i in enumerate(seq_sessions)
+    ])
+
+
+def load_pseudo_mouse(area: str,
+                      datadir=_DEFAULT_DATADIR,
+                      n_jobs: int = -1,
+                      cache: bool = True) -> np.ndarray:
+    """Construct the pseudomouse with neurons recorded in all of the sessions A, B, C.
+
+    Stack the excitatory neurons from the multiple mice of the specified visual
+    cortical area. The neurons which were recorded in all of the sessions A, B, C
+    are included.
+
+    Args:
+        area: The visual cortical area to sample the neurons. Possible options: VISp, VISpm, VISam, VISal, VISl, VISrl.
+        datadir: The root data directory.
+        n_jobs: The number of processes used for loading the experiment containers,
+            see :py:class:`joblib.Parallel`.
+        cache: If ``True``, load the pseudomouse from the cache if available and
+            cache newly constructed pseudomice.
+
+    Returns:
+        The pseudomouse traces, an array of shape ``(neurons, time)``.
+    """
+    path = _calcium_path(datadir, area)
+    summary_file = pathlib.Path(datadir) / "allen" / "data_summary.csv"
+    matfiles = list(path.glob("*.mat"))
+
+    def _compute():
+        exp_containers = [int(file.stem) for file in matfiles]
+        summary = pd.read_csv(summary_file)
+        ## Filter excitatory neurons
+        area_filtered = summary[(summary["exp"].isin(exp_containers)) &
+                                (summary["target"] == area) &
+                                ~(summary["cre_line"].str.contains("SSt")) &
+                                ~(summary["cre_line"].str.contains("Pvalb")) &
+                                ~(summary["cre_line"].str.contains("Vip"))]
+
+        containers = []
+        for exp_container in set(area_filtered["exp"]):
+            container = summary[summary["exp"] == exp_container]
+            containers.append(
+                (path / f"{exp_container}.mat", list(container["neurons"]),
+                 list(container["session_type"])))
+        pseudo_mouse = joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(_load_container)(*container)
+            for container in containers)
+        return np.concatenate(pseudo_mouse)
+
+    if not cache:
+        return _compute()
+    key = _cache_key(area,
+                     "filtered_traces_days_events",
+                     files=matfiles + [summary_file])
+    return _load_cached(datadir, "pseudo-mouse", key, _compute)
+
+
+def _load_session_a(num_movie: str, mat_file: pathlib.Path) -> np.ndarray:
+    """Load the traces of an experiment container during the selected movie."""
+    mat = scipy.io.loadmat(mat_file)
+    if num_movie == "one":
+        mat_index = None
+        mat_key = "united_traces_days_events"
+    elif num_movie == "two":
+        mat_index = (2, 1)
+        mat_key = "filtered_traces_days_events"
+    elif num_movie == "three":
+        mat_index = (0, 1)
+        mat_key = "filtered_traces_days_events"
+    else:
+        raise ValueError("num_movie should be one, two or three")
+
+    if mat_index is not None:
+        events = mat[mat_key][mat_index[0], mat_index[1]]
+    else:
+        events = mat[mat_key][:, :, 0]  ## Take one session only
+
+    return events
+
+
+def load_session_a_pseudo_mouse(area: str,
+                                num_movie: str,
+                                datadir=_DEFAULT_DATADIR,
+                                n_jobs: int = -1,
+                                cache: bool = True) -> np.ndarray:
+    """Construct the pseudomouse with the neurons recorded in session A.
+
+    Args:
+        area: The visual cortical area to sample the neurons. Possible options: VISp, VISpm, VISam, VISal, VISl, VISrl.
+        num_movie: The movie to load the traces for. Possible options: one, two, three.
+        datadir: The root data directory.
+        n_jobs: The number of processes used for loading the experiment containers,
+            see :py:class:`joblib.Parallel`.
+        cache: If ``True``, load the pseudomouse from the cache if available and
+            cache newly constructed pseudomice.
+
+    Returns:
+        The pseudomouse traces, an array of shape ``(neurons, time)``.
+    """
+    if num_movie not in ("one", "two", "three"):
+        raise ValueError("num_movie should be one, two or three")
+    matfiles = list(_calcium_path(datadir, area).glob("*"))
+
+    def _compute():
+        return np.vstack(
+            joblib.Parallel(n_jobs=n_jobs)(
+                joblib.delayed(_load_session_a)(num_movie, mat_file)
+                for mat_file in matfiles))
+
+    if not cache:
+        return _compute()
+    key = _cache_key(area, num_movie, files=matfiles)
+    return _load_cached(datadir, "pseudo-mouse-session-a", key, _compute)
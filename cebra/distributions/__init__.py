@@ -52,11 +52,14 @@ __all__ = [
     "Offset",
     "DistanceMatrix",
     "OffsetDistanceMatrix",
+    "StreamingDistanceMatrix",
+    "StreamingContinuousIndex",
     "ConditionalIndex",
     "MultiSessionIndex",
     "Prior",
     "TimeContrastive",
     "TimedeltaDistribution",
+    "StreamingTimedeltaDistribution",
     "MultiSessionTimeDelta",
     "Discrete",
     "DiscreteUniform",
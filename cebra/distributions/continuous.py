@@ -29,6 +29,7 @@ import torch
 import cebra.data
 import cebra.distributions
 import cebra.distributions.base as abc_
+import cebra.io
 from cebra.data.datatypes import Offset
 
 
@@ -252,6 +253,81 @@ class TimedeltaDistribution(abc_.JointDistribution, abc_.HasGenerator):
         return self.index.search(query)
 
 
+class StreamingTimedeltaDistribution(TimedeltaDistribution):
+    """Time delta distribution for a continuous index which grows over time.
+
+    Behaves like :py:class:`TimedeltaDistribution`, but samples can be added to the
+    index with :py:meth:`append`, e.g. while data of a live recording is arriving.
+    The index, the ``time_difference`` table and the squared norms used by the
+    nearest neighbor search are stored in :py:class:`cebra.io.TensorBuffer`
+    instances, so that appending new samples only processes these samples.
+
+    Args:
+        continuous: The initial multidimensional, continuous index
+        time_delta: The time delay between samples that should form a positive
+            pair.
+        max_length: If specified, only the most recent ``max_length`` samples
+            are kept in the index.
+        device: Device (cpu or gpu)
+        seed: The seed for sampling from the prior and conditional distribution
+    """
+
+    def __init__(self,
+                 continuous: torch.Tensor,
+                 time_delta: int = 1,
+                 max_length: Optional[int] = None,
+                 device: Literal["cpu", "cuda"] = "cpu",
+                 seed: Optional[int] = None):
+        abc_.HasGenerator.__init__(self, device=device, seed=seed)
+        self.time_delta = time_delta
+        continuous = continuous.to(self.device)
+        self._data = cebra.io.TensorBuffer(continuous[:0],
+                                           max_length=max_length)
+        self._time_difference = cebra.io.TensorBuffer(continuous[:0],
+                                                      max_length=max_length)
+        self.index = cebra.distributions.StreamingContinuousIndex(
+            continuous[:0], max_length=max_length)
+        self.append(continuous)
+
+    @property
+    def data(self) -> torch.Tensor:
+        """The continuous index."""
+        return self._data.data
+
+    @property
+    def time_difference(self) -> torch.Tensor:
+        """The differences between samples ``time_delta`` steps apart."""
+        return self._time_difference.data
+
+    def append(self, continuous: torch.Tensor):
+        """Add samples to the end of the continuous index.
+
+        Only the time differences and index entries of the new samples are
+        computed; the differences for the first ``time_delta`` samples of the
+        recording are set to zero, as in :py:class:`TimedeltaDistribution`.
+
+        Args:
+            continuous: The new samples of the continuous index.
+        """
+        continuous = continuous.to(self.device)
+        history = self.data[max(len(self.data) - self.time_delta, 0):]
+        samples = torch.cat([history, continuous])
+        time_difference = torch.zeros_like(continuous)
+        start = max(self.time_delta - len(history), 0)
+        if start < len(continuous):
+            time_difference[start:] = (
+                samples[len(history) + start:] -
+                samples[len(history) + start -
+                        self.time_delta:-self.time_delta])
+        self._data.append(continuous)
+        self._time_difference.append(time_difference)
+        self.index.append(continuous)
+
+    def sample_prior(self, num_samples: int) -> torch.Tensor:
+        """Return indices uniformly sampled across the current index."""
+        return self.randint(len(self.data), (num_samples,))
+
+
 class DeltaNormalDistribution(abc_.JointDistribution, abc_.HasGenerator):
     """Define a conditional distribution based on behavioral changes over time.
 
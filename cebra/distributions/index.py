@@ -129,6 +129,48 @@ class OffsetDistanceMatrix(DistanceMatrix):
         self.offset.mask_array(self.xTx, self.inf)
 
 
+class StreamingDistanceMatrix(DistanceMatrix):
+    """Compute shortest distances to dataset samples arriving over time.
+
+    In contrast to the standard :py:class:`DistanceMatrix`, the index can be
+    extended with :py:meth:`append`. Both the index and the squared norms of
+    its samples are kept in :py:class:`cebra.io.TensorBuffer` instances, so
+    appending only processes the new samples.
+
+    Args:
+        samples: The initial continuous values that will be used to index
+            the dataset and specify the conditional distribution.
+        max_length: If specified, only the most recent ``max_length`` samples
+            are kept in the index.
+    """
+
+    def __init__(self, samples: torch.Tensor, max_length: int = None):
+        _check_is_float_tensor(self, samples)
+        self._index = cebra.io.TensorBuffer(samples[:0], max_length=max_length)
+        self._xTx = cebra.io.TensorBuffer(samples[:0, :1],
+                                          max_length=max_length)
+        self.append(samples)
+
+    @property
+    def index(self) -> torch.Tensor:
+        return self._index.data
+
+    @property
+    def xTx(self) -> torch.Tensor:
+        return self._xTx.data
+
+    def append(self, samples: torch.Tensor):
+        """Add new samples to the end of the index.
+
+        Args:
+            samples: (n, d)
+                The new continuous values.
+        """
+        _check_is_float_tensor(self, samples)
+        self._index.append(samples)
+        self._xTx.append(samples.square().sum(1, keepdim=True))
+
+
 class ContinuousIndex(cebra_distributions.Index, cebra.io.HasDevice):
     """Naive nearest neighbor search implementation.
 
@@ -151,6 +193,25 @@ class ContinuousIndex(cebra_distributions.Index, cebra.io.HasDevice):
         # + self.dist_matrix.offset.left
 
 
+class StreamingContinuousIndex(ContinuousIndex):
+    """Naive nearest neighbor search on an index which grows over time.
+
+    index: tensor(N, d)
+        the initial values used for kNN search
+    max_length: int
+        if specified, only the most recent ``max_length`` values are searched
+    """
+
+    def __init__(self, index, max_length=None):
+        cebra.io.HasDevice.__init__(self)
+        _check_is_float_tensor(self, index)
+        self.dist_matrix = StreamingDistanceMatrix(index, max_length=max_length)
+
+    def append(self, index):
+        """Add new values to the end of the index."""
+        self.dist_matrix.append(index)
+
+
 class ConditionalIndex(cebra_distributions.Index):
     """Index a dataset based on both continuous and discrete information.
 
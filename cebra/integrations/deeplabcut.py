@@ -166,44 +166,31 @@ class _DLCLoader:
         dlc_df_coords = (
             self.dlc_df.columns.get_level_values("coords").unique().to_list())
 
-        pred_xy = []
-        for i, _ in enumerate(self.dlc_df.index):
-            data = (self.dlc_df.iloc[i].loc[self.scorer].loc[
-                self.keypoints_list].to_numpy().reshape(-1, len(dlc_df_coords)))
-
-            # Handles nan values with interpolation
-            if i > 0 and i < len(self.dlc_df) - 1:
-                if len(dlc_df_coords) == 2:
-                    pre_ = (self.dlc_df.iloc[i - 1].loc[self.scorer].loc[
-                        self.keypoints_list].to_numpy().reshape(
-                            -1, len(dlc_df_coords)))
-                    next_ = (self.dlc_df.iloc[i + 1].loc[self.scorer].loc[
-                        self.keypoints_list].to_numpy().reshape(
-                            -1, len(dlc_df_coords)))
-                else:
-                    pre_ = (self.dlc_df.iloc[i - 1].loc[self.scorer].loc[
-                        self.keypoints_list].to_numpy().reshape(
-                            -1, len(dlc_df_coords))[:, :2])
-                    next_ = (self.dlc_df.iloc[i + 1].loc[self.scorer].loc[
-                        self.keypoints_list].to_numpy().reshape(
-                            -1, len(dlc_df_coords))[:, :2])
-
-                concat_ = np.concatenate(
-                    [pre_.reshape(1, -1, 2),
-                     next_.reshape(1, -1, 2)], axis=0)
-                median = np.median(concat_, axis=0)
-
-                if "likelihood" in dlc_df_coords and len(dlc_df_coords) > 2:
-                    data[data[:, 2] < pcutoff] = np.nan
-                    data = data[:, :2]
-                nan_indices = np.argwhere(np.isnan(data))
-                data[nan_indices] = median[nan_indices]
-
-            if len(dlc_df_coords) > 2:
-                data = data[:, :2]
-            pred_xy.append(data.reshape(1, -1, 2))
-
-        array = np.concatenate(pred_xy, axis=0).reshape((len(self.dlc_df), -1))
+        num_frames = len(self.dlc_df)
+        keypoints = self.dlc_df.loc[:, self.scorer].loc[:, self.keypoints_list]
+        keypoints = keypoints.to_numpy().reshape(num_frames, -1,
+                                                 len(dlc_df_coords))
+        pred_xy = keypoints[:, :, :2].copy()
+
+        # Handles nan values with interpolation: missing and low-likelihood samples of all
+        # frames except the first and last one are replaced by the median of the previous
+        # and next frame.
+        if num_frames > 2:
+            median = np.median(np.stack([pred_xy[:-2], pred_xy[2:]]), axis=0)
+            data = pred_xy[1:-1]
+            if "likelihood" in dlc_df_coords and len(dlc_df_coords) > 2:
+                data[keypoints[1:-1, :, 2] < pcutoff] = np.nan
+
+            is_nan = np.isnan(data)
+            replace = is_nan.any(axis=2)
+            # NOTE: Keypoints are also replaced at the positions given by the
+            # coordinate axis of the nan values, which matches the output of
+            # previous versions of this function.
+            num_axes = min(replace.shape[1], 2)
+            replace[:, :num_axes] |= is_nan.any(axis=1)[:, :num_axes]
+            data[replace] = median[replace]
+
+        array = pred_xy.reshape((num_frames, -1))
         return array[~np.isnan(array).any(
             axis=1)]  # remove rows with remaining NaNs
 
@@ -46,6 +46,11 @@ class SklearnDataset(cebra.data.SingleSessionDataset):
         y: A list of multiple array-like of shape ``(N, k[i])`` for continual
             inputs, including up to one discrete array-like of shape ``(N,)``.
         device: Compute device, can be ``cpu`` or ``cuda``.
+        storage_dtype: If specified, ``X`` is kept in memory with a compact dtype
+            (``int8``, ``int16``, ``float16`` or ``bfloat16``) and only converted
+            to ``float32`` when samples are gathered. See
+            :py:class:`cebra.data.datasets.TensorDataset` for details.
+        min_samples: The minimum number of samples in ``X``.
 
     Example:
 
@@ -58,9 +63,15 @@ class SklearnDataset(cebra.data.SingleSessionDataset):
 
     """
 
-    def __init__(self, X: npt.NDArray, y: tuple, device="cpu"):
+    def __init__(self,
+                 X: npt.NDArray,
+                 y: tuple,
+                 device="cpu",
+                 storage_dtype: Optional[str] = None,
+                 min_samples: int = 2):
         super().__init__(device=device)
-        self._parse_data(X)
+        self.storage_dtype = storage_dtype
+        self._parse_data(X, min_samples=min_samples)
         self._parse_labels(y)
 
     @property
@@ -100,17 +111,24 @@ class SklearnDataset(cebra.data.SingleSessionDataset):
     def _check_dimensions(self):
         pass
 
-    def _parse_data(self, X: npt.NDArray):
+    def _parse_data(self, X: npt.NDArray, min_samples: int = 2):
         """Check input data validity and convert to torch.Tensor
 
         Args:
             X: The 2D input data array.
+            min_samples: The minimum number of samples in ``X``.
         """
         # NOTE(stes) in practice this value should be much higher, but more than
         # one sample is a conservative default here to ensure that sklearn tests
         # passes with the correct error messages.
-        X = cebra_sklearn_utils.check_input_array(X, min_samples=2)
-        self.neural = torch.from_numpy(X).float().to(self.device)
+        X = cebra_sklearn_utils.check_input_array(X, min_samples=min_samples)
+        neural, neural_scale, neural_shift = cebra.data.datasets._compress_neural(
+            torch.from_numpy(X), self.storage_dtype)
+        self.neural = neural.to(self.device)
+        self.neural_scale = (None if neural_scale is None else neural_scale.to(
+            self.device))
+        self.neural_shift = (None if neural_shift is None else neural_shift.to(
+            self.device))
 
     def _parse_labels(self, labels: Optional[tuple]):
         """Check labels validity and convert to torch.Tensor
@@ -181,7 +199,11 @@ class SklearnDataset(cebra.data.SingleSessionDataset):
             [ No.Samples x Neurons x 10 ]
         """
         index = self.expand_index(index).to(self.device)
-        return self.neural[index].transpose(2, 1)
+        return self.upcast(self.neural[index]).transpose(2, 1)
+
+    def upcast(self, neural: torch.Tensor) -> torch.Tensor:
+        return cebra.data.datasets._decompress_neural(neural, self.neural_scale,
+                                                      self.neural_shift)
 
     def __len__(self) -> int:
         """Number of samples in the neural data."""
@@ -19,7 +19,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from typing import Iterable, List, Literal, Optional, Tuple, Union
+import time
+from typing import Dict, Iterable, List, Literal, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
@@ -370,3 +371,72 @@ def consistency_score(
             f"Invalid comparison, got between={between}, expects either datasets or runs."
         )
     return scores.squeeze(), pairs.squeeze(), ids
+
+
+def _transform_latency(cebra_model: cebra_sklearn_cebra.CEBRA,
+                       X: Union[npt.NDArray, torch.Tensor],
+                       num_repeats: int) -> Tuple[npt.NDArray, float]:
+    """Return the embedding and the fastest of ``num_repeats`` transform runs in seconds."""
+    latency = float("inf")
+    for _ in range(num_repeats):
+        start = time.perf_counter()
+        embedding = cebra_model.transform(X)
+        latency = min(latency, time.perf_counter() - start)
+    return embedding, latency
+
+
+def distillation_report(
+    teacher: cebra_sklearn_cebra.CEBRA,
+    student: cebra_sklearn_cebra.CEBRA,
+    X: Union[npt.NDArray, torch.Tensor],
+    num_repeats: int = 3,
+) -> Dict[str, float]:
+    """Compare a distilled model to its teacher model on a *single session* dataset.
+
+    Args:
+        teacher: The teacher model.
+        student: The model distilled from the ``teacher``, e.g. with :py:meth:`cebra.CEBRA.distill`.
+        X: A 2D data matrix, corresponding to a *single session* recording.
+        num_repeats: The number of times the data is transformed by each model to measure
+            the latency. The fastest run is reported.
+
+    Returns:
+        A dictionary containing the between-runs :py:func:`consistency_score` of the teacher and
+        student embeddings of ``X`` (``consistency``), averaged over both directions of the linear
+        fit, the latency of :py:meth:`cebra.CEBRA.transform` of both models in seconds
+        (``teacher_latency``, ``student_latency``) and the ratio of the latencies (``speedup``).
+
+    Example:
+
+        >>> import cebra
+        >>> import numpy as np
+        >>> neural_data = np.random.uniform(0, 1, (1000, 20))
+        >>> teacher = cebra.CEBRA(model_architecture="offset36-model", max_iterations=10)
+        >>> teacher.fit(neural_data)
+        CEBRA(max_iterations=10, model_architecture='offset36-model')
+        >>> student = cebra.CEBRA(model_architecture="offset10-model", batch_size=128,
+        ...                       max_iterations=10)
+        >>> student.distill(teacher, neural_data)
+        CEBRA(batch_size=128, max_iterations=10, model_architecture='offset10-model')
+        >>> report = cebra.sklearn.metrics.distillation_report(teacher, student, neural_data)
+
+    """
+    sklearn_utils_validation.check_is_fitted(teacher, "n_features_")
+    sklearn_utils_validation.check_is_fitted(student, "n_features_")
+    if num_repeats < 1:
+        raise ValueError(
+            f"num_repeats needs to be a positive integer, got {num_repeats}.")
+
+    teacher_embedding, teacher_latency = _transform_latency(
+        teacher, X, num_repeats)
+    student_embedding, student_latency = _transform_latency(
+        student, X, num_repeats)
+    scores, _, _ = consistency_score(
+        embeddings=[teacher_embedding, student_embedding], between="runs")
+
+    return {
+        "consistency": float(np.mean(scores)),
+        "teacher_latency": teacher_latency,
+        "student_latency": student_latency,
+        "speedup": teacher_latency / student_latency,
+    }
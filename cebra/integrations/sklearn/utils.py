@@ -151,6 +151,7 @@ def check_device(device: str) -> str:
         pass
     else:
         raise ValueError(f"Device needs to be cuda, cpu, xla, or mps, but got {device}.")
+    return device
 
 
 def check_fitted(model: "cebra.models.Model") -> bool:
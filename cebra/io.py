@@ -21,6 +21,11 @@
 #
 """Helper classes and functions for I/O functionality."""
 
+import os
+import pathlib
+import tempfile
+from typing import Optional, Union
+
 import joblib
 import numpy as np
 import sklearn.decomposition
@@ -183,6 +188,99 @@ class HasDevice:
         super().__setattr__(property, value)
 
 
+class TensorBuffer(HasDevice):
+    """A tensor which can be extended along its first dimension.
+
+    Samples are appended in amortized constant time: the underlying storage
+    doubles its capacity whenever it runs full, instead of re-allocating the
+    whole tensor on every append. If a ``max_length`` is given, only the most
+    recent samples are kept and the buffer acts as a sliding window (ring buffer)
+    over the appended data.
+
+    Args:
+        data: The initial content of the buffer. The feature shape, dtype and
+            device of this tensor are used for all samples appended later on.
+        max_length: The maximum number of samples kept in the buffer. If ``None``,
+            the buffer grows without bounds.
+
+    Example:
+
+        >>> import cebra.io
+        >>> import torch
+        >>> buffer = cebra.io.TensorBuffer(torch.zeros(3, 2), max_length=4)
+        >>> buffer.append(torch.ones(2, 2))
+        1
+        >>> buffer.data.shape
+        torch.Size([4, 2])
+
+    """
+
+    def __init__(self, data: torch.Tensor, max_length: Optional[int] = None):
+        super().__init__(device=data.device.type)
+        if max_length is not None and max_length <= 0:
+            raise ValueError(
+                f"max_length needs to be a positive integer, but got {max_length}."
+            )
+        self.max_length = max_length
+        self._storage = data.new_empty((max(len(data), 1),) + data.shape[1:])
+        self._start = 0
+        self._end = 0
+        self.append(data)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def data(self) -> torch.Tensor:
+        """A view on the samples currently stored in the buffer.
+
+        The view is invalidated by the next call to :py:meth:`append`.
+        """
+        return self._storage[self._start:self._end]
+
+    def _reserve(self, num_samples: int):
+        """Make room for ``num_samples`` samples at the end of the storage."""
+        if self._end + num_samples <= len(self._storage):
+            return
+        length = len(self)
+        capacity = max(len(self._storage), 2 * (length + num_samples))
+        if capacity > len(self._storage):
+            storage = self._storage.new_empty((capacity,) +
+                                              self._storage.shape[1:])
+            storage[:length] = self.data
+            self._storage = storage
+        else:
+            self._storage[:length] = self.data.clone()
+        self._start, self._end = 0, length
+
+    def append(self, values: torch.Tensor) -> int:
+        """Add samples to the end of the buffer.
+
+        Args:
+            values: The samples to add, with the same feature shape as the
+                samples already in the buffer.
+
+        Returns:
+            The number of samples dropped from the start of the buffer to
+            respect the ``max_length``.
+        """
+        values = values.to(device=self._storage.device,
+                           dtype=self._storage.dtype)
+        if values.shape[1:] != self._storage.shape[1:]:
+            raise ValueError(
+                f"Shape of the appended samples does not match the buffer: "
+                f"expected {tuple(self._storage.shape[1:])}, "
+                f"got {tuple(values.shape[1:])}.")
+        self._reserve(len(values))
+        self._storage[self._end:self._end + len(values)] = values
+        self._end += len(values)
+        num_dropped = 0
+        if self.max_length is not None:
+            num_dropped = max(len(self) - self.max_length, 0)
+            self._start += num_dropped
+        return num_dropped
+
+
 def reduce(data, *, ratio=None, num_components=None):
     """Map the specified data to its principal components
 
@@ -218,10 +316,42 @@ def reduce(data, *, ratio=None, num_components=None):
     return pca.transform(data)[:, :i]
 
 
+def save_npy(file: Union[str, pathlib.Path], array: np.ndarray) -> bool:
+    """Atomically save an array to a ``.npy`` file.
+
+    The array is written to a temporary file in the directory of ``file`` first, which is
+    then moved to ``file``. Concurrent or interrupted writers hence never leave a partially
+    written file, e.g. in a cache directory shared by multiple processes.
+
+    Args:
+        file: The path of the ``.npy`` file. Missing parent directories are created.
+        array: The array to save.
+
+    Returns:
+        ``True`` if the array was saved, ``False`` if the directory is not writable.
+    """
+    file = pathlib.Path(file)
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            np.save(tmp_file, array)
+        os.replace(tmp_path, file)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return True
+
+
 class FileKeyValueDataset:
     """Load datasets from HDF, torch, numpy or joblib files.
 
     The data is directly accessible through attributes of instances of this class.
+    Only the keys are read when opening the file, and the data of each key is loaded
+    on first access to the corresponding attribute.
 
     Args:
         path: The filepath for loading the data from. Should point to a file
@@ -229,6 +359,10 @@ class FileKeyValueDataset:
             are ``jl``, ``joblib``, ``h5``, ``hdf``, ``hdf5``, ``pth``, ``pt`` and
             ``npz``.
 
+    Note:
+        Joblib and torch files do not support partial reads and are loaded at once
+        when opening the file.
+
     Example:
 
         >>> import cebra.io
@@ -244,12 +378,17 @@ class FileKeyValueDataset:
     """
 
     def __init__(self, path: str):
-        self.path = path
-        keys = []
-        for key, value in self._iterate_items():
-            setattr(self, key, value)
-            keys.append(key)
-        self.keys = tuple(keys)
+        self.path = pathlib.Path(path)
+        self._dataset = self._open()
+        self.keys = tuple(self._dataset.keys())
+
+    def __getattr__(self, key):
+        if key.startswith("_") or key not in self.__dict__.get("keys", ()):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{key}'")
+        value = self._load_item(key)
+        setattr(self, key, value)
+        return value
 
     def __repr__(self):
         sizes = []
@@ -262,17 +401,29 @@ class FileKeyValueDataset:
         sizes = ",\n  ".join(sizes)
         return f"{type(self).__name__}(keys=(\n  {sizes}\n))"
 
-    def _iterate_items(self):
+    def _open(self):
         extension = self.path.suffix
         if extension in [".jl", ".joblib"]:
-            dataset = joblib.load(self.path)
+            return joblib.load(self.path)
         elif extension in [".h5", ".hdf", ".hdf5"]:
-            raise NotImplementedError()
+            import h5py
+
+            with h5py.File(self.path, "r") as h5_file:
+                return {key: None for key in h5_file.keys()}
         elif extension in [".pth", ".pt"]:
-            dataset = torch.load(self.path)
+            return torch.load(self.path)
         elif extension in [".npz"]:
-            dataset = np.load(self.path, allow_pickle=True)
+            return np.load(self.path, allow_pickle=True)
         else:
             raise ValueError(f"Invalid file format: {extension} in {self.path}")
-        for key in dataset.keys():
-            yield key, dataset[key]
+
+    def _load_item(self, key):
+        if self.path.suffix in [".h5", ".hdf", ".hdf5"]:
+            import cebra.data.load
+
+            return cebra.data.load.load(self.path, key=key)
+        return self._dataset[key]
+
+    def _iterate_items(self):
+        for key in self.keys:
+            yield key, getattr(self, key)
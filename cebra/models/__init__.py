@@ -35,6 +35,8 @@ cebra.registry.add_helper_functions(__name__)
 from cebra.models.model import *
 from cebra.models.multiobjective import *
 from cebra.models.layers import *
+from cebra.models.streaming import *
+from cebra.models.multisession import *
 from cebra.models.criterions import *
 
 cebra.registry.add_docstring(__name__)
@@ -32,10 +32,12 @@ Note that criterions can have trainable parameters, which are automatically hand
 by the training loops implemented in :py:class:`cebra.solver.base.Solver` classes.
 """
 
+import contextlib
 import math
 from typing import Optional, Tuple, Union
 
 import torch
+import torch.utils.checkpoint
 from torch import nn
 
 
@@ -84,6 +86,14 @@ def euclidean_similarity(
     return pos_dist, neg_dist
 
 
+@torch.jit.script
+def _upcast(x: torch.Tensor) -> torch.Tensor:
+    """Cast tensors in reduced precision to ``float32``, and keep all other dtypes."""
+    if x.dtype == torch.float16 or x.dtype == torch.bfloat16:
+        return x.float()
+    return x
+
+
 @torch.jit.script
 def infonce(
         pos_dist: torch.Tensor, neg_dist: torch.Tensor
@@ -95,7 +105,11 @@ def infonce(
     Note:
         - The behavior of this function changed beginning in CEBRA 0.3.0.
         The InfoNCE implementation is numerically stabilized.
+        - Similarities in reduced precision, e.g. ``bfloat16``, are cast to ``float32``
+        before computing the ``logsumexp``.
     """
+    pos_dist = _upcast(pos_dist)
+    neg_dist = _upcast(neg_dist)
     with torch.no_grad():
         c, _ = neg_dist.max(dim=1, keepdim=True)
     c = c.detach()
@@ -112,6 +126,13 @@ def infonce(
     return align + uniform, align_corrected, uniform_corrected
 
 
+def _float32_context(device: torch.device):
+    """Return a context in which :py:func:`torch.autocast` is disabled on ``device``."""
+    if device.type not in ("cpu", "cuda"):
+        return contextlib.nullcontext()
+    return torch.autocast(device_type=device.type, enabled=False)
+
+
 class ContrastiveLoss(nn.Module):
     """Base class for contrastive losses.
 
@@ -173,11 +194,68 @@ class BaseInfoNCE(ContrastiveLoss):
             pos: The positive samples of shape `(n, d)`.
             neg: The negative samples of shape `(n, d)`.
 
+        Note:
+            The similarities and the loss are computed in ``float32``, also for inputs
+            in reduced precision or within :py:func:`torch.autocast`. Inputs in ``float64``
+            are not downcast.
+
         See Also:
             :py:class:`BaseInfoNCE`.
         """
-        pos_dist, neg_dist = self._distance(ref, pos, neg)
-        return infonce(pos_dist, neg_dist)
+        with _float32_context(ref.device):
+            pos_dist, neg_dist = self._distance(_upcast(ref), _upcast(pos),
+                                                _upcast(neg))
+            return infonce(pos_dist, neg_dist)
+
+    def tiled_forward(
+            self, ref: torch.Tensor, pos: torch.Tensor, neg: torch.Tensor,
+            tile_size: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Compute the InfoNCE loss in tiles of reference samples.
+
+        The loss and its terms are averages over the reference samples, which are
+        contrasted against all negative samples. The loss is hence computed for tiles of
+        ``tile_size`` reference samples, and the results of the tiles are combined. The
+        returned values are the same as for :py:meth:`forward`, up to numerical precision.
+
+        The similarities of each tile are recomputed in the backward pass (see
+        :py:func:`torch.utils.checkpoint.checkpoint`), such that the memory for the
+        similarities scales with ``tile_size`` times the number of negative samples,
+        instead of quadratically with the number of samples.
+
+        Args:
+            ref: The reference samples of shape `(n, d)`.
+            pos: The positive samples of shape `(n, d)`.
+            neg: The negative samples of shape `(m, d)`.
+            tile_size: The number of reference samples per tile.
+
+        See Also:
+            :py:meth:`forward`.
+        """
+        if tile_size < 1:
+            raise ValueError(
+                f"Tile size needs to be at least 1, but got {tile_size}.")
+        num_samples = len(ref)
+        if num_samples <= tile_size:
+            return self(ref, pos, neg)
+
+        def _tile_forward(ref, pos, neg):
+            loss, align, uniform = self(ref, pos, neg)
+            return torch.stack([loss, align, uniform])
+
+        total = 0
+        # NOTE: Stopping the recomputation early raises an exception within the
+        # TorchScript functions of the criterion, which is not propagated correctly.
+        with torch.utils.checkpoint.set_checkpoint_early_stop(False):
+            for start in range(0, num_samples, tile_size):
+                end = min(start + tile_size, num_samples)
+                tile = torch.utils.checkpoint.checkpoint(_tile_forward,
+                                                         ref[start:end],
+                                                         pos[start:end],
+                                                         neg,
+                                                         use_reentrant=False)
+                total = total + tile * ((end - start) / num_samples)
+        loss, align, uniform = total.unbind()
+        return loss, align, uniform
 
 
 class FixedInfoNCE(BaseInfoNCE):
@@ -346,3 +424,34 @@ class NCE(ContrastiveLoss):
         uniform = self._reduce(F.logsigmoid(-neg_dist), dim=1)
 
         return align + self.negative_weight * uniform, align, uniform
+
+
+class EmbeddingMSE(ContrastiveLoss):
+    """Mean squared error between reference and positive samples.
+
+    Regresses the reference samples onto the positive samples, e.g. to train a model
+    to reproduce the embedding of another model, see
+    :py:class:`cebra.solver.single_session.SingleSessionDistillationSolver`. The negative
+    samples are not used.
+
+    Attributes:
+        temperature (float): Not used, fixed to 1. Only defined for logging the same
+            metrics as for the other criterions.
+    """
+
+    temperature = 1.0
+
+    def forward(self, ref, pos, neg):
+        """Compute the mean squared error.
+
+        Args:
+            ref: The reference samples of shape `(n, d)`.
+            pos: The positive samples of shape `(n, d)`.
+            neg: The negative samples of shape `(n, d)`, not used.
+
+        Returns:
+            The mean squared error as total loss and alignment term, and zero as
+            uniformity term.
+        """
+        align = (_upcast(ref) - _upcast(pos)).square().sum(dim=1).mean()
+        return align, align, torch.zeros_like(align)
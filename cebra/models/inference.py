@@ -0,0 +1,255 @@
+#
+# CEBRA: Consistent EmBeddings of high-dimensional Recordings using Auxiliary variables
+# © Mackenzie W. Mathis & Steffen Schneider (v0.4.0+)
+# Source code:
+# https://github.com/AdaptiveMotorControlLab/CEBRA
+#
+# Please see LICENSE.md for the full license document:
+# https://github.com/AdaptiveMotorControlLab/CEBRA/blob/main/LICENSE.md
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Export of trained models for inference.
+
+Trained models contain modules which are only needed during training, e.g. dropout layers, and are
+run as regular PyTorch modules in full precision. For deployment, :py:func:`export` converts a
+model into a frozen TorchScript module which can be saved with :py:func:`torch.jit.save` and loaded
+with :py:func:`torch.jit.load` without CEBRA installed. Optionally, the weights and activations are
+quantized to int8 to speed up inference on CPU. The deviation of the exported embedding from the
+original model can be checked with :py:func:`embedding_drift`.
+
+Example:
+
+    >>> import torch
+    >>> import cebra.models
+    >>> import cebra.models.inference
+    >>> model = cebra.models.init("offset10-model", num_neurons=20, num_units=32, num_output=8)
+    >>> data = torch.randn(1, 20, 100)
+    >>> exported = cebra.models.inference.export(model, quantization="static", calibration_data=data)
+    >>> exported(data).shape
+    torch.Size([1, 8, 91])
+"""
+
+import copy
+from typing import Dict, Literal, Optional
+
+import torch
+from torch import nn
+from torch.ao.quantization import quantize_fx
+
+import cebra.data.datatypes
+import cebra.models.layers as cebra_layers
+import cebra.models.model as cebra_models
+import cebra.models.multisession as cebra_multisession
+
+__all__ = ["strip_training_layers", "quantize", "export", "embedding_drift"]
+
+
+def _fuse_normalization(module: nn.Sequential):
+    """Fold batch normalization layers into the preceding convolution or linear layer."""
+    for i in range(len(module) - 1):
+        layer, norm = module[i], module[i + 1]
+        if not isinstance(norm, nn.BatchNorm1d):
+            continue
+        if isinstance(layer, nn.Conv1d):
+            module[i] = nn.utils.fusion.fuse_conv_bn_eval(layer, norm)
+        elif isinstance(layer, nn.Linear):
+            module[i] = nn.utils.fusion.fuse_linear_bn_eval(layer, norm)
+        else:
+            continue
+        module[i + 1] = nn.Identity()
+
+
+def _strip(module: nn.Module):
+    for name, child in module.named_children():
+        if isinstance(child, nn.modules.dropout._DropoutNd):
+            setattr(module, name, nn.Identity())
+        else:
+            _strip(child)
+    if isinstance(module, nn.Sequential):
+        _fuse_normalization(module)
+
+
+def strip_training_layers(model: cebra_models.Model) -> cebra_models.Model:
+    """Remove modules from the model which are only needed for training.
+
+    Dropout layers are replaced by identities, and batch normalization layers directly following
+    a :py:class:`torch.nn.Conv1d` or :py:class:`torch.nn.Linear` layer are folded into the weights
+    of that layer.
+
+    The model of a single session of a :py:class:`cebra.models.multisession.MultisessionModel`
+    is converted into a standalone model with
+    :py:meth:`cebra.models.multisession._SessionModel.to_standalone` first.
+
+    Args:
+        model: The trained model.
+
+    Returns:
+        A copy of the model in evaluation mode on the CPU. The input model is not modified.
+    """
+    if isinstance(model, cebra_multisession._SessionModel):
+        model = model.to_standalone()
+    model = copy.deepcopy(model).cpu().eval()
+    _strip(model)
+    return model
+
+
+def quantize(
+    model: cebra_models.Model,
+    mode: Literal["dynamic", "static"],
+    calibration_data: Optional[torch.Tensor] = None,
+) -> nn.Module:
+    """Quantize the weights and activations of the model to int8.
+
+    Args:
+        model: The model to quantize, typically the output of :py:func:`strip_training_layers`.
+        mode: With ``"dynamic"`` quantization, the weights of :py:class:`torch.nn.Linear` layers
+            are quantized ahead of time and activations are quantized on the fly. PyTorch does
+            not support dynamic quantization of convolutions, i.e., the convolutional layers stay
+            in full precision. With ``"static"`` quantization, both :py:class:`torch.nn.Conv1d`
+            and :py:class:`torch.nn.Linear` layers are quantized, using the ``calibration_data``
+            to determine the range of the activations.
+        calibration_data: Representative input of the model, required for ``"static"``
+            quantization.
+
+    Returns:
+        The quantized model for inference on the CPU. The input model is not modified.
+    """
+    model = copy.deepcopy(model).cpu().eval()
+    if mode == "dynamic":
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear},
+                                                      dtype=torch.qint8)
+    if mode != "static":
+        raise ValueError(
+            f"Invalid quantization mode: expected 'dynamic' or 'static', got {mode}."
+        )
+    if calibration_data is None:
+        raise ValueError("Static quantization requires calibration_data.")
+    calibration_data = calibration_data.float().cpu()
+    qconfig_mapping = torch.ao.quantization.get_default_qconfig_mapping(
+        torch.backends.quantized.engine)
+    # NOTE: The branch on the input dimension in Squeeze cannot be traced symbolically,
+    # and the interpolation in _MeanAndConv is not implemented for quantized tensors.
+    # Both are kept in full precision.
+    prepare_config = quantize_fx.PrepareCustomConfig(
+    ).set_non_traceable_module_classes(
+        [cebra_layers.Squeeze, cebra_layers._MeanAndConv])
+    prepared = quantize_fx.prepare_fx(model,
+                                      qconfig_mapping,
+                                      example_inputs=(calibration_data,),
+                                      prepare_custom_config=prepare_config)
+    with torch.no_grad():
+        prepared(calibration_data)
+    return quantize_fx.convert_fx(prepared)
+
+
+class _InferenceModel(nn.Module):
+    """Store the model dimensions as buffers, which are kept in the TorchScript module."""
+
+    def __init__(self, model: nn.Module, offset: cebra.data.datatypes.Offset,
+                 num_input: int, num_output: int):
+        super().__init__()
+        self.model = model
+        self.register_buffer("offset", torch.tensor([offset.left,
+                                                     offset.right]))
+        self.register_buffer("num_input", torch.tensor(num_input))
+        self.register_buffer("num_output", torch.tensor(num_output))
+
+    def forward(self, inp: torch.Tensor) -> torch.Tensor:
+        return self.model(inp)
+
+
+def export(
+    model: cebra_models.Model,
+    quantization: Optional[Literal["dynamic", "static"]] = None,
+    calibration_data: Optional[torch.Tensor] = None,
+) -> torch.jit.ScriptModule:
+    """Convert a trained model into a frozen TorchScript module for inference.
+
+    The training layers are removed with :py:func:`strip_training_layers`, the model is optionally
+    quantized with :py:func:`quantize`, and the result is traced and frozen with
+    :py:func:`torch.jit.freeze`.
+
+    The exported module has the same ``forward`` signature as the model, and the model dimensions
+    are kept in the buffers ``offset`` (the ``left`` and ``right`` offsets of the receptive field),
+    ``num_input`` and ``num_output``. It can be saved with :py:func:`torch.jit.save` and loaded
+    with :py:func:`torch.jit.load`.
+
+    Args:
+        model: The trained model, or the model of a single session of a
+            :py:class:`cebra.models.multisession.MultisessionModel`.
+        quantization: If specified, the quantization ``mode`` passed to :py:func:`quantize`.
+        calibration_data: Representative input of the model, required for ``"static"``
+            quantization.
+
+    Returns:
+        The exported model on the CPU.
+    """
+    if isinstance(model, cebra_multisession._SessionModel):
+        trunk = model.model.trunk
+    else:
+        trunk = model
+    if not isinstance(trunk, cebra_models._OffsetModel):
+        raise TypeError(
+            f"Export is only supported for offset models, got {type(trunk).__name__}."
+        )
+    offset = model.get_offset()
+    stripped = strip_training_layers(model)
+    if quantization is not None:
+        stripped = quantize(stripped, quantization, calibration_data)
+    exported = _InferenceModel(stripped, offset, model.num_input,
+                               model.num_output).eval()
+
+    if isinstance(trunk, (cebra_models.ConvolutionalModelMixin,
+                          cebra_models.ResampleModelMixin)):
+        example_input = torch.randn(2, model.num_input, len(offset))
+    else:
+        example_input = torch.randn(2, model.num_input)
+    with torch.no_grad():
+        traced = torch.jit.trace(exported, example_input)
+    return torch.jit.freeze(
+        traced, preserved_attrs=["offset", "num_input", "num_output"])
+
+
+def _flatten_embedding(embedding: torch.Tensor) -> torch.Tensor:
+    """Reshape a ``(batch, features, time)`` output to ``(batch * time, features)``."""
+    if embedding.dim() == 3:
+        embedding = embedding.transpose(1, 2).reshape(-1, embedding.size(1))
+    return embedding
+
+
+def embedding_drift(reference: nn.Module, exported: nn.Module,
+                    inputs: torch.Tensor) -> Dict[str, float]:
+    """Compare the embedding of an exported model to the original model.
+
+    Args:
+        reference: The original model.
+        exported: The exported model, e.g. returned by :py:func:`export`.
+        inputs: The input of both models.
+
+    Returns:
+        A dictionary containing the mean and minimum cosine similarity between the embeddings of
+        each sample (``cosine_mean``, ``cosine_min``) and the maximum absolute difference between
+        the embeddings (``max_abs_error``).
+    """
+    reference = copy.deepcopy(reference).cpu().eval()
+    inputs = inputs.float().cpu()
+    with torch.no_grad():
+        expected = _flatten_embedding(reference(inputs))
+        actual = _flatten_embedding(exported(inputs))
+    cosine = nn.functional.cosine_similarity(actual, expected, dim=1)
+    return {
+        "cosine_mean": cosine.mean().item(),
+        "cosine_min": cosine.min().item(),
+        "max_abs_error": (actual - expected).abs().max().item(),
+    }
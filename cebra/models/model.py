@@ -25,12 +25,14 @@ import abc
 import literate_dataclasses as dataclasses
 import torch
 import torch.nn.functional as F
+import torch.utils.checkpoint
 import tqdm
 from torch import nn
 
 import cebra.data
 import cebra.data.datatypes
 import cebra.models.layers as cebra_layers
+from cebra.models import parametrize
 from cebra.models import register
 
 
@@ -208,7 +210,26 @@ class ClassifierModel(Model, HasFeatureEncoder):
         return features, prediction
 
 
+def _forward_layers(layers, inp):
+    for layer in layers:
+        inp = layer(inp)
+    return inp
+
+
 class _OffsetModel(Model, HasFeatureEncoder):
+    """Base class for models defined by a sequence of layers.
+
+    Attributes:
+        gradient_checkpointing: If ``True``, the activations within the skip connection
+            blocks (:py:class:`cebra.models.layers._Skip`) are not kept for the backward
+            pass during training, and are recomputed instead, see
+            :py:meth:`set_gradient_checkpointing`.
+        checkpoint_segment_size: The maximum number of consecutive skip connection blocks
+            which are recomputed together.
+    """
+
+    gradient_checkpointing: bool = False
+    checkpoint_segment_size: int = 1
 
     def __init__(self,
                  *layers,
@@ -237,8 +258,90 @@ class _OffsetModel(Model, HasFeatureEncoder):
         Based on the parameters used for initializing, the output embedding
         is normalized to the hypersphere (`normalize = True`).
         """
+        if (self.gradient_checkpointing and self.training and
+                torch.is_grad_enabled()):
+            return self._checkpointed_forward(inp)
         return self.net(inp)
 
+    def set_gradient_checkpointing(self,
+                                   enabled: bool = True,
+                                   segment_size: int = 1):
+        """Trade compute for memory by checkpointing the skip connection blocks.
+
+        With gradient checkpointing, consecutive skip connection blocks of the model
+        are grouped into segments of at most ``segment_size`` blocks. During training,
+        only the inputs of each segment are kept for the backward pass, and the
+        activations within the segment are recomputed with :py:func:`torch.utils.checkpoint.checkpoint`.
+        Larger segments keep fewer inputs, but recompute more activations at once. This
+        reduces the memory used for training deep models like :py:class:`Offset36`, at the
+        cost of an additional forward pass of the blocks. The outputs and gradients are the
+        same as without checkpointing. Use :py:func:`activation_memory` to measure the
+        memory saved.
+
+        Args:
+            enabled: Enable or disable gradient checkpointing.
+            segment_size: The maximum number of blocks in each checkpointed segment.
+        """
+        if segment_size < 1:
+            raise ValueError(
+                f"Segment size needs to be at least 1, but got {segment_size}.")
+        self.gradient_checkpointing = enabled
+        self.checkpoint_segment_size = segment_size
+
+    def _checkpointed_forward(self, inp):
+        segment = []
+        for layer in self.net:
+            if isinstance(layer, cebra_layers._Skip):
+                segment.append(layer)
+                if len(segment) < self.checkpoint_segment_size:
+                    continue
+            if len(segment) > 0:
+                inp = torch.utils.checkpoint.checkpoint(_forward_layers,
+                                                        segment,
+                                                        inp,
+                                                        use_reentrant=False)
+                segment = []
+            if not isinstance(layer, cebra_layers._Skip):
+                inp = layer(inp)
+        if len(segment) > 0:
+            inp = torch.utils.checkpoint.checkpoint(_forward_layers,
+                                                    segment,
+                                                    inp,
+                                                    use_reentrant=False)
+        return inp
+
+
+def activation_memory(model: nn.Module, *inputs: torch.Tensor) -> int:
+    """Measure the memory of the activations kept for the backward pass of a model.
+
+    The tensors saved for the backward pass are recorded during a forward pass of the
+    model on the inputs, e.g. to compare the memory used for training with and without
+    gradient checkpointing (see :py:meth:`_OffsetModel.set_gradient_checkpointing`).
+    Parameters and inputs of the model are not counted.
+
+    Args:
+        model: The model, which is run in its current mode (training or evaluation).
+        inputs: The inputs passed to the model.
+
+    Returns:
+        The number of bytes of the saved activations.
+    """
+    excluded = {
+        tensor.untyped_storage().data_ptr()
+        for tensor in [*model.parameters(), *model.buffers(), *inputs]
+    }
+    saved = {}
+
+    def _pack(tensor):
+        storage = tensor.untyped_storage()
+        if storage.data_ptr() not in excluded:
+            saved[storage.data_ptr()] = storage.nbytes()
+        return tensor
+
+    with torch.autograd.graph.saved_tensors_hooks(_pack, lambda tensor: tensor):
+        model(*inputs)
+    return sum(saved.values())
+
 
 class ParameterCountMixin:
     """Add a parameter counter to a torch.nn.Module."""
@@ -782,3 +885,66 @@ class Offset36Dropoutv2(_OffsetModel, ConvolutionalModelMixin):
     def get_offset(self) -> cebra.data.datatypes.Offset:
         """See `:py:meth:Model.get_offset`"""
         return cebra.data.Offset(18, 18)
+
+
+class _LowRankInputMixin:
+    """Factorize the first convolution of a model into a low-rank projection.
+
+    The first layer ``nn.Conv1d(num_neurons, num_units, kernel_size)`` is replaced by a
+    pointwise projection ``nn.Conv1d(num_neurons, rank, 1)`` of the input, followed by the
+    temporal convolution ``nn.Conv1d(rank, num_units, kernel_size)``. This reduces the
+    parameters and the compute of the input layer from ``num_neurons * num_units * kernel_size``
+    to roughly ``num_neurons * rank``, which dominates the model for inputs with thousands of
+    dimensions, e.g. Neuropixels recordings.
+    """
+
+    def _factorize_input_layer(self, rank: int):
+        if rank < 1:
+            raise ValueError(f"Rank needs to be at least 1, but got {rank}.")
+        dense = self.net[0]
+        # NOTE: The projection keeps its bias, such that the first two parameters of the
+        # state dict belong to the input-specific layer, e.g. for CEBRA.fit(..., adapt=True).
+        self.net = nn.Sequential(
+            nn.Conv1d(dense.in_channels, rank, 1),
+            nn.Conv1d(rank, dense.out_channels, dense.kernel_size),
+            *self.net[1:],
+        )
+        self.rank = rank
+
+
+@parametrize("offset10-model-lowrank{rank}", rank=(8, 16, 32, 64))
+class Offset10LowRankModel(Offset10Model, _LowRankInputMixin):
+    """CEBRA model with a 10 sample receptive field and a low-rank input layer.
+
+    This is a variant of :py:class:`Offset10Model` for inputs with many dimensions. The first
+    convolution is factorized into a pointwise projection of the input to ``rank``
+    dimensions, followed by the temporal convolution.
+    """
+
+    def __init__(self,
+                 num_neurons,
+                 num_units,
+                 num_output,
+                 rank,
+                 normalize=True):
+        super().__init__(num_neurons, num_units, num_output, normalize)
+        self._factorize_input_layer(rank)
+
+
+@parametrize("offset36-model-lowrank{rank}", rank=(8, 16, 32, 64))
+class Offset36LowRankModel(Offset36, _LowRankInputMixin):
+    """CEBRA model with a 36 sample receptive field and a low-rank input layer.
+
+    This is a variant of :py:class:`Offset36` for inputs with many dimensions. The first
+    convolution is factorized into a pointwise projection of the input to ``rank``
+    dimensions, followed by the temporal convolution.
+    """
+
+    def __init__(self,
+                 num_neurons,
+                 num_units,
+                 num_output,
+                 rank,
+                 normalize=True):
+        super().__init__(num_neurons, num_units, num_output, normalize)
+        self._factorize_input_layer(rank)
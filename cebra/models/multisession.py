@@ -0,0 +1,265 @@
+#
+# CEBRA: Consistent EmBeddings of high-dimensional Recordings using Auxiliary variables
+# © Mackenzie W. Mathis & Steffen Schneider (v0.4.0+)
+# Source code:
+# https://github.com/AdaptiveMotorControlLab/CEBRA
+#
+# Please see LICENSE.md for the full license document:
+# https://github.com/AdaptiveMotorControlLab/CEBRA/blob/main/LICENSE.md
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Multi-session models with a shared trunk.
+
+In multi-session training, each session typically has its own encoder, which is
+required as the number of input dimensions (e.g. recorded neurons) differs between
+sessions. The :py:class:`MultisessionModel` instead only uses a separate linear input
+layer for each session, followed by a model shared by all sessions. During training, the
+input layers of all sessions are computed as a single batched operation
+(:py:class:`SessionInputLayer`), and the shared model is evaluated once on the batches of
+all sessions, which reduces the number of parameters and the compute per step compared to
+separate models for many sessions.
+"""
+
+import copy
+from typing import Iterator, List
+
+import torch
+import torch.nn.functional as F
+from torch import nn
+
+import cebra.data.datatypes
+import cebra.models
+import cebra.models.model as cebra_models
+
+
+class SessionInputLayer(nn.Module):
+    """Linear input layers of multiple sessions, computed as a single operation.
+
+    The weights of all sessions are stored in a single tensor, which is zero-padded to the
+    largest number of inputs. In :py:meth:`forward`, the inputs of all sessions are padded
+    accordingly, and all sessions are projected with a single batched matrix multiplication.
+    The layer is applied pointwise, i.e. independently for each time step of convolutional
+    inputs.
+
+    Args:
+        num_inputs: The number of input dimensions of each session.
+        num_outputs: The number of output dimensions, shared by all sessions.
+    """
+
+    def __init__(self, num_inputs: List[int], num_outputs: int):
+        super().__init__()
+        self.num_inputs = list(num_inputs)
+        self.num_outputs = num_outputs
+        num_sessions = len(self.num_inputs)
+        max_inputs = max(self.num_inputs)
+        self.weight = nn.Parameter(
+            torch.empty(num_sessions, max_inputs, num_outputs))
+        self.bias = nn.Parameter(torch.empty(num_sessions, num_outputs))
+        mask = torch.zeros(num_sessions, max_inputs, 1)
+        for session_id, num_inputs_ in enumerate(self.num_inputs):
+            mask[session_id, :num_inputs_] = 1
+        self.register_buffer("mask", mask)
+        self.reset_parameters()
+
+    def reset_parameters(self):
+        """Initialize the weights of each session like a :py:class:`torch.nn.Linear` layer."""
+        with torch.no_grad():
+            for session_id, num_inputs in enumerate(self.num_inputs):
+                bound = num_inputs**-0.5
+                self.weight[session_id].uniform_(-bound, bound)
+                self.bias[session_id].uniform_(-bound, bound)
+            self.weight.mul_(self.mask)
+
+    def forward(self, inputs: List[torch.Tensor]) -> torch.Tensor:
+        """Project the inputs of all sessions.
+
+        Args:
+            inputs: The inputs of each session, of shape ``(batch, num_inputs, *)``, with
+                the same batch size and trailing dimensions for all sessions.
+
+        Returns:
+            The projected inputs of shape ``(num_sessions, batch, num_outputs, *)``.
+        """
+        if len(inputs) != len(self.num_inputs):
+            raise ValueError(
+                f"Expected inputs for {len(self.num_inputs)} sessions, got {len(inputs)}."
+            )
+        max_inputs = self.weight.shape[1]
+        inputs = torch.stack([
+            F.pad(inp,
+                  [0, 0] * (inp.dim() - 2) + [0, max_inputs - inp.shape[1]])
+            for inp in inputs
+        ])
+        output = torch.einsum("gnc...,gch->gnh...", inputs,
+                              self.weight * self.mask)
+        return output + self.bias.view(len(self.num_inputs), 1, -1, *[1] *
+                                       (inputs.dim() - 3))
+
+    def session_forward(self, inputs: torch.Tensor,
+                        session_id: int) -> torch.Tensor:
+        """Project the inputs of a single session.
+
+        Args:
+            inputs: The inputs of shape ``(batch, num_inputs, *)``.
+            session_id: The session of the inputs.
+
+        Returns:
+            The projected inputs of shape ``(batch, num_outputs, *)``.
+        """
+        weight = self.weight[session_id, :self.num_inputs[session_id]]
+        output = torch.einsum("nc...,ch->nh...", inputs, weight)
+        return output + self.bias[session_id].view(-1, *[1] *
+                                                   (inputs.dim() - 2))
+
+
+class _SessionModel(cebra_models.Model):
+    """The model of a single session of a :py:class:`MultisessionModel`."""
+
+    def __init__(self, model: "MultisessionModel", session_id: int):
+        super().__init__(num_input=model.input_layer.num_inputs[session_id],
+                         num_output=model.num_output)
+        self.model = model
+        self.session_id = session_id
+
+    def forward(self, inputs: torch.Tensor) -> torch.Tensor:
+        return self.model.trunk(
+            self.model.input_layer.session_forward(inputs, self.session_id))
+
+    def get_offset(self) -> cebra.data.datatypes.Offset:
+        return self.model.get_offset()
+
+    def to_standalone(self) -> nn.Sequential:
+        """Copy the input layer of the session and the trunk into a standalone model.
+
+        The input layer of the session is converted into a pointwise :py:class:`torch.nn.Conv1d`
+        layer for convolutional models, or a :py:class:`torch.nn.Linear` layer otherwise.
+
+        Returns:
+            A copy of the session model, which does not share parameters with the
+            :py:class:`MultisessionModel`.
+        """
+        input_layer = self.model.input_layer
+        weight = input_layer.weight[self.session_id, :self.num_input].T
+        if isinstance(self, cebra_models.ConvolutionalModelMixin):
+            projection = nn.Conv1d(self.num_input,
+                                   input_layer.num_outputs,
+                                   kernel_size=1)
+            weight = weight.unsqueeze(-1)
+        else:
+            projection = nn.Linear(self.num_input, input_layer.num_outputs)
+        projection = projection.to(weight.device)
+        with torch.no_grad():
+            projection.weight.copy_(weight)
+            projection.bias.copy_(input_layer.bias[self.session_id])
+        return nn.Sequential(projection, copy.deepcopy(self.model.trunk))
+
+
+class _ConvolutionalSessionModel(_SessionModel,
+                                 cebra_models.ConvolutionalModelMixin):
+    pass
+
+
+class MultisessionModel(nn.Module):
+    """Multi-session model with a linear input layer per session and a shared trunk.
+
+    The model can be used like a :py:class:`torch.nn.ModuleList` of separate models for
+    each session: Indexing the model returns the model of a single session, which shares
+    its parameters with all other sessions except for the input layer. When called with
+    the batches of all sessions, the input layers are computed with a single
+    :py:class:`SessionInputLayer`, and the trunk is evaluated once on all batches.
+    The :py:class:`cebra.solver.multi_session.MultiSessionSolver` uses this to embed the
+    samples of all sessions at once.
+
+    Args:
+        num_neurons: The number of input dimensions of each session.
+        trunk: The model shared by all sessions. Its input dimension is the output
+            dimension of the input layers.
+
+    Example:
+
+        >>> import cebra.models
+        >>> model = cebra.models.MultisessionModel.init("offset10-model",
+        ...                                             num_neurons=[20, 30],
+        ...                                             num_units=32,
+        ...                                             num_output=8)
+        >>> len(model), model[1].num_input
+        (2, 30)
+
+    """
+
+    def __init__(self, num_neurons: List[int], trunk: cebra_models.Model):
+        super().__init__()
+        self.input_layer = SessionInputLayer(num_neurons, trunk.num_input)
+        self.trunk = trunk
+
+    @classmethod
+    def init(cls, name: str, *, num_neurons: List[int], num_units: int,
+             num_output: int, **kwargs) -> "MultisessionModel":
+        """Create a multi-session model with a trunk from the registered models.
+
+        Args:
+            name: The name of the trunk architecture, see :py:func:`cebra.models.get_options`.
+            num_neurons: The number of input dimensions of each session.
+            num_units: The number of hidden units, which is also the output dimension of
+                the input layers.
+            num_output: The output dimension of the model.
+            kwargs: Further arguments passed to :py:func:`cebra.models.init`.
+
+        Returns:
+            The multi-session model.
+        """
+        trunk = cebra.models.init(name,
+                                  num_neurons=num_units,
+                                  num_units=num_units,
+                                  num_output=num_output,
+                                  **kwargs)
+        return cls(num_neurons, trunk)
+
+    @property
+    def num_output(self) -> int:
+        """The output dimension of the model."""
+        return self.trunk.num_output
+
+    def get_offset(self) -> cebra.data.datatypes.Offset:
+        """The offset of the trunk, see :py:meth:`cebra.models.Model.get_offset`."""
+        return self.trunk.get_offset()
+
+    def __len__(self) -> int:
+        return len(self.input_layer.num_inputs)
+
+    def __getitem__(self, session_id: int) -> cebra_models.Model:
+        if not -len(self) <= session_id < len(self):
+            raise IndexError(
+                f"Invalid session_id {session_id} for {len(self)} sessions.")
+        session_id = session_id % len(self)
+        if isinstance(self.trunk, cebra_models.ConvolutionalModelMixin):
+            return _ConvolutionalSessionModel(self, session_id)
+        return _SessionModel(self, session_id)
+
+    def __iter__(self) -> Iterator[cebra_models.Model]:
+        return (self[session_id] for session_id in range(len(self)))
+
+    def forward(self, inputs: List[torch.Tensor]) -> torch.Tensor:
+        """Embed the inputs of all sessions.
+
+        Args:
+            inputs: The inputs of each session, with the same batch size and number of
+                time steps for all sessions.
+
+        Returns:
+            The embeddings of shape ``(num_sessions, batch, num_output)``.
+        """
+        hidden = self.input_layer(inputs)
+        output = self.trunk(hidden.flatten(0, 1))
+        return output.view(*hidden.shape[:2], *output.shape[1:])
@@ -0,0 +1,277 @@
+#
+# CEBRA: Consistent EmBeddings of high-dimensional Recordings using Auxiliary variables
+# © Mackenzie W. Mathis & Steffen Schneider (v0.4.0+)
+# Source code:
+# https://github.com/AdaptiveMotorControlLab/CEBRA
+#
+# Please see LICENSE.md for the full license document:
+# https://github.com/AdaptiveMotorControlLab/CEBRA/blob/main/LICENSE.md
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Streaming inference for convolutional models.
+
+The :py:class:`StreamingEncoder` embeds samples of a time series one at a time,
+e.g. for closed-loop experiments. Instead of re-running the model on a window of
+the size of its receptive field for every new sample, the inputs of each layer
+are kept in ring buffers, and each new sample only requires computing a single
+output column of every layer.
+"""
+
+from typing import Optional, Union
+
+import numpy.typing as npt
+import torch
+from torch import nn
+
+import cebra.models.layers as cebra_layers
+import cebra.models.model as cebra_models
+
+_ELEMENTWISE_LAYERS = (nn.GELU, nn.ReLU, nn.LeakyReLU, nn.ELU, nn.Sigmoid,
+                       nn.Tanh)
+# NOTE: Dropout is inactive during inference.
+_IGNORED_LAYERS = (nn.Flatten, nn.Identity, nn.modules.dropout._DropoutNd,
+                   cebra_layers.Squeeze)
+
+
+class _StreamingLayer:
+    """Process a single time step of a layer.
+
+    ``step`` receives the newest input column of the layer and returns the
+    newest output column, or ``None`` while the receptive field of the layer is
+    not filled yet. The returned tensor can be re-used by the layer in the next
+    step.
+    """
+
+    def step(self, inp: torch.Tensor) -> Optional[torch.Tensor]:
+        raise NotImplementedError()
+
+    def reset(self):
+        pass
+
+
+class _StreamingLinear(_StreamingLayer):
+    """Convolution or linear layer, applied to the last ``kernel_size`` inputs.
+
+    The inputs are stored twice in a buffer of size ``2 * kernel_size``, such
+    that the last ``kernel_size`` inputs are always a contiguous slice of the
+    buffer and the output is a single matrix-vector product.
+    """
+
+    def __init__(self, layer: Union[nn.Conv1d, nn.Linear]):
+        if isinstance(layer, nn.Conv1d):
+            if (layer.stride != (1,) or layer.dilation != (1,) or
+                    layer.padding != (0,) or layer.groups != 1):
+                raise ValueError(
+                    f"Streaming is only supported for convolutions with stride 1, "
+                    f"dilation 1, no padding and no groups, got {layer}.")
+            num_output, num_input, self.kernel_size = layer.weight.shape
+            # (C_out, C_in, k) -> (C_out, k * C_in), time-major
+            weight = layer.weight.permute(0, 2, 1).reshape(num_output, -1)
+        else:
+            num_output, num_input = layer.weight.shape
+            self.kernel_size = 1
+            weight = layer.weight
+        self.weight = weight.detach().clone()
+        if layer.bias is None:
+            self.bias = torch.zeros_like(self.weight[:, 0])
+        else:
+            self.bias = layer.bias.detach().clone()
+        self.buffer = self.weight.new_zeros((2 * self.kernel_size, num_input))
+        # Views on the two copies of each input, and on each window of inputs.
+        self.slots = [
+            self.buffer[i::self.kernel_size] for i in range(self.kernel_size)
+        ]
+        self.windows = [
+            self.buffer[i + 1:i + 1 + self.kernel_size].reshape(-1)
+            for i in range(self.kernel_size)
+        ]
+        self.output = self.weight.new_empty((num_output,))
+        self.reset()
+
+    def reset(self):
+        self.position = 0
+        self.num_steps = 0
+
+    def step(self, inp):
+        if self.kernel_size == 1:
+            return torch.addmv(self.bias, self.weight, inp, out=self.output)
+        self.slots[self.position].copy_(inp)
+        window = self.windows[self.position]
+        self.position = (self.position + 1) % self.kernel_size
+        self.num_steps += 1
+        if self.num_steps < self.kernel_size:
+            return None
+        return torch.addmv(self.bias, self.weight, window, out=self.output)
+
+
+class _StreamingElementwise(_StreamingLayer):
+    """Layer applied to each time step independently."""
+
+    def __init__(self, layer: nn.Module):
+        # NOTE: Calling forward directly skips the overhead of module hooks.
+        self.forward = layer.forward
+
+    def step(self, inp):
+        return self.forward(inp)
+
+
+class _StreamingNorm(_StreamingLayer):
+    """Normalization of each time step, see :py:class:`.layers._Norm`."""
+
+    def step(self, inp):
+        return inp / inp.norm()
+
+
+class _StreamingSkip(_StreamingLayer):
+    """Skip connection around a streamed block of layers, see :py:class:`.layers._Skip`.
+
+    The input added to the output of the block is delayed by the number of time
+    steps cropped at the end of the shortcut.
+    """
+
+    def __init__(self, layer: cebra_layers._Skip):
+        self.module = _StreamingSequential(layer.module)
+        self.delay = 0 if layer.crop.stop is None else -layer.crop.stop
+        self.inputs = None
+        self.reset()
+
+    def reset(self):
+        self.module.reset()
+        self.position = 0
+
+    def step(self, inp):
+        if self.inputs is None:
+            self.inputs = inp.new_empty((self.delay + 1, len(inp)))
+        self.inputs[self.position].copy_(inp)
+        self.position = (self.position + 1) % (self.delay + 1)
+        output = self.module.step(inp)
+        if output is None:
+            return None
+        # NOTE: After the increment, position points to the input received
+        # delay steps before the current one.
+        return output.add_(self.inputs[self.position])
+
+
+class _StreamingSequential(_StreamingLayer):
+    """Sequence of streamed layers."""
+
+    def __init__(self, layers: nn.Sequential):
+        self.layers = []
+        for layer in layers:
+            if isinstance(layer, (nn.Conv1d, nn.Linear)):
+                self.layers.append(_StreamingLinear(layer))
+            elif isinstance(layer, cebra_layers._Skip):
+                self.layers.append(_StreamingSkip(layer))
+            elif isinstance(layer, nn.Sequential):
+                self.layers.append(_StreamingSequential(layer))
+            elif isinstance(layer, cebra_layers._Norm):
+                self.layers.append(_StreamingNorm())
+            elif isinstance(layer, _ELEMENTWISE_LAYERS):
+                self.layers.append(_StreamingElementwise(layer))
+            elif not isinstance(layer, _IGNORED_LAYERS):
+                raise ValueError(
+                    f"Layer {type(layer).__name__} does not support streaming.")
+
+    def reset(self):
+        for layer in self.layers:
+            layer.reset()
+
+    def step(self, inp):
+        for layer in self.layers:
+            inp = layer.step(inp)
+            if inp is None:
+                return None
+        return inp
+
+
+class StreamingEncoder:
+    """Embed a time series sample by sample with a trained model.
+
+    For each new sample, the encoder returns the embedding of the window formed by
+    the last ``len(model.get_offset())`` samples. This is the same embedding as
+    computed by the model on this window, but the activations of previous samples
+    are re-used from per-layer ring buffers, so each new sample only requires
+    computing a single output column of each layer.
+
+    The embedding returned after passing the sample at time ``t`` corresponds to the
+    embedding of time ``t - offset.right + 1`` computed on the whole time series, i.e.,
+    the latency of the encoder is given by the right offset of the model.
+
+    Args:
+        model: The trained model. Models built from :py:class:`torch.nn.Conv1d` layers
+            with stride 1, :py:class:`torch.nn.Linear` layers, elementwise activation
+            functions and :py:class:`.layers._Skip` connections, such as the
+            ``offset*-model`` architectures, are supported.
+
+    Note:
+        The model weights are copied when the encoder is initialized. If the model
+        is trained further, a new encoder needs to be created.
+
+    Example:
+
+        >>> import cebra.models
+        >>> import torch
+        >>> model = cebra.models.init("offset10-model", num_neurons=20, num_units=32, num_output=3)
+        >>> encoder = cebra.models.StreamingEncoder(model)
+        >>> for sample in torch.randn(100, 20):
+        ...     embedding = encoder.step(sample)
+        >>> embedding.shape
+        torch.Size([3])
+
+    """
+
+    def __init__(self, model: cebra_models.Model):
+        if not isinstance(model, cebra_models._OffsetModel):
+            raise TypeError(
+                f"Streaming is only supported for offset models, got {type(model).__name__}."
+            )
+        if isinstance(model, cebra_models.ResampleModelMixin):
+            raise ValueError(
+                f"Streaming is not supported for resampling models, got {type(model).__name__}."
+            )
+        self.num_input = model.num_input
+        self.num_output = model.num_output
+        self.offset = model.get_offset()
+        self.device = next(model.parameters()).device
+        with torch.no_grad():
+            self._net = _StreamingSequential(model.net)
+
+    def reset(self):
+        """Clear the samples passed to the encoder, e.g. to start a new recording."""
+        self._net.reset()
+
+    @torch.inference_mode()
+    def step(
+            self, sample: Union[npt.NDArray,
+                                torch.Tensor]) -> Optional[torch.Tensor]:
+        """Add a new sample and return the embedding of the latest window.
+
+        Args:
+            sample: The new sample, of shape ``(num_input,)``.
+
+        Returns:
+            The embedding of shape ``(num_output,)``, or ``None`` if less samples than the
+            receptive field of the model have been passed to the encoder.
+        """
+        sample = torch.as_tensor(sample,
+                                 dtype=torch.float32,
+                                 device=self.device)
+        if sample.shape != (self.num_input,):
+            raise ValueError(
+                f"Invalid sample shape: expected ({self.num_input},), got {tuple(sample.shape)}."
+            )
+        output = self._net.step(sample)
+        if output is None:
+            return None
+        return output.clone()
@@ -32,7 +32,7 @@ implement larger changes to the training loop.
 
 import abc
 import os
-from typing import Callable, Dict, List, Literal, Optional, Union
+from typing import Callable, Dict, List, Literal, Optional, Tuple, Union
 
 import literate_dataclasses as dataclasses
 import torch
@@ -42,6 +42,11 @@ import cebra
 import cebra.data
 import cebra.io
 import cebra.models
+import cebra.solver.distributed as cebra_distributed
+from cebra.solver.util import autocast
+from cebra.solver.util import compile_module
+from cebra.solver.util import CompiledFunction
+from cebra.solver.util import GradientCache
 from cebra.solver.util import Meter
 from cebra.solver.util import ProgressBar
 
@@ -64,6 +69,29 @@ class Solver(abc.ABC, cebra.io.HasDevice):
             as the logs for positive (``pos``) and negative (``neg``) pairs. For the standard
             criterions in CEBRA, also contains the value of the ``temperature``.
         tqdm_on: Use ``tqdm`` for showing a progress bar during training.
+        compile: If ``True``, the forward passes of the model and criterion are compiled with
+            :py:func:`torch.compile`, see :py:func:`cebra.solver.util.compile_module`. With
+            ``"step"``, the forward pass of the model and criterion in each training step is
+            additionally compiled into a single graph, see :py:meth:`_compute_loss`. Changing
+            input shapes, e.g. of the last batch in :py:meth:`cebra.CEBRA.transform`, trigger
+            a recompilation with dynamic shapes once. If compilation is not supported, or the
+            compiler fails during training or inference, the solver falls back to eager mode.
+        compile_kwargs: Keyword arguments passed to :py:func:`torch.compile`, e.g. ``backend``
+            or ``mode``.
+        precision: The precision of the forward passes of the model, either ``"fp32"`` or
+            ``"bf16"``. With ``"bf16"``, the model is run within :py:func:`torch.autocast`,
+            while the similarities and the loss of the criterion, the parameters and the
+            optimizer state are kept in ``float32``, see :py:func:`cebra.solver.util.autocast`.
+        micro_batch_size: If specified, the model embeds each batch in micro-batches of this
+            size in :py:meth:`step`, with gradient caching. The gradients are the same as for
+            the full batch, while the memory for the graph of the model is bounded by the
+            micro-batch size, see :py:class:`cebra.solver.util.GradientCache`.
+        distributed: If ``True``, the model is trained data-parallel in all processes of the
+            initialized :py:mod:`torch.distributed` process group. Each process samples its own
+            batch, the criterion is computed on the embeddings of all processes, and the
+            gradients of the model are summed across processes, see
+            :py:mod:`cebra.solver.distributed`. Only the process with rank 0 writes
+            checkpoints, calls the ``save_hook`` and shows the progress bar in :py:meth:`fit`.
     """
 
     model: torch.nn.Module
@@ -78,10 +106,37 @@ class Solver(abc.ABC, cebra.io.HasDevice):
         "temperature": []
     }))
     tqdm_on: bool = True
+    compile: Union[bool, Literal["step"]] = False
+    compile_kwargs: Dict = dataclasses.field(default_factory=dict)
+    precision: Literal["fp32", "bf16"] = "fp32"
+    micro_batch_size: Optional[int] = None
+    distributed: bool = False
 
     def __post_init__(self):
         cebra.io.HasDevice.__init__(self)
         self.best_loss = float("inf")
+        # NOTE: Raises an error for invalid values of precision.
+        autocast(self.device, self.precision)
+        if self.micro_batch_size is not None and self.micro_batch_size < 1:
+            raise ValueError(
+                f"micro_batch_size needs to be a positive integer, got {self.micro_batch_size}."
+            )
+        if self.compile:
+            self._compile()
+
+    def _compile(self):
+        if self.compile not in (True, "step"):
+            raise ValueError(
+                f"Invalid value for compile: expected a bool or 'step', got {self.compile}."
+            )
+        if not compile_module(self.model, **self.compile_kwargs):
+            return
+        compile_module(self.criterion, **self.compile_kwargs)
+        if self.compile == "step":
+            self._compute_loss = CompiledFunction(
+                self._compute_loss,
+                modules=[self.model, self.criterion],
+                **self.compile_kwargs)
 
     def state_dict(self) -> dict:
         """Return a dictionary fully describing the current solver state.
@@ -152,12 +207,35 @@ class Solver(abc.ABC, cebra.io.HasDevice):
         for parameter in self.criterion.parameters():
             yield parameter
 
+    @property
+    def _is_main_process(self) -> bool:
+        return not self.distributed or cebra_distributed.is_main_process()
+
     def _get_loader(self, loader):
         return ProgressBar(
             loader,
-            "tqdm" if self.tqdm_on else "off",
+            "tqdm" if self.tqdm_on and self._is_main_process else "off",
         )
 
+    def _init_distributed(self):
+        """Synchronize the model and criterion, and sample different batches on each rank."""
+        if not self.distributed:
+            return
+        if not cebra_distributed.is_initialized():
+            raise RuntimeError(
+                "Distributed training requires an initialized torch.distributed process "
+                "group, see cebra.solver.distributed.")
+        cebra_distributed.broadcast_parameters(self.model)
+        cebra_distributed.broadcast_parameters(self.criterion)
+        cebra_distributed.seed_ranks()
+
+    def _synchronize(self):
+        """Synchronize the state of the solver across ranks before it is saved.
+
+        This is a no-op for solvers where the model is the same on all ranks after
+        each step.
+        """
+
     def fit(
         self,
         loader: cebra.data.Loader,
@@ -187,6 +265,7 @@ class Solver(abc.ABC, cebra.io.HasDevice):
         """
 
         self.to(loader.device)
+        self._init_distributed()
 
         iterator = self._get_loader(loader)
         self.model.train()
@@ -200,6 +279,10 @@ class Solver(abc.ABC, cebra.io.HasDevice):
             run_validation = (valid_loader
                               is not None) and (num_steps % valid_frequency
                                                 == 0)
+            if save_model or run_validation:
+                self._synchronize()
+            if not self._is_main_process:
+                continue
             if run_validation:
                 validation_loss = self.validation(valid_loader)
                 if self.best_loss is None or validation_loss < self.best_loss:
@@ -212,6 +295,7 @@ class Solver(abc.ABC, cebra.io.HasDevice):
                 if save_hook is not None:
                     save_hook(num_steps, self)
                 self.save(logdir, f"checkpoint_{num_steps:#07d}.pth")
+        self._synchronize()
 
     def step(self, batch: cebra.data.Batch) -> dict:
         """Perform a single gradient update.
@@ -223,12 +307,12 @@ class Solver(abc.ABC, cebra.io.HasDevice):
             Dictionary containing training metrics.
         """
         self.optimizer.zero_grad()
-        prediction = self._inference(batch)
-        loss, align, uniform = self.criterion(prediction.reference,
-                                              prediction.positive,
-                                              prediction.negative)
-
-        loss.backward()
+        if self.micro_batch_size is None:
+            loss, align, uniform = self._compute_loss(batch)
+            loss.backward()
+        else:
+            loss, align, uniform = self._cached_backward(batch)
+        self._reduce_gradients()
         self.optimizer.step()
         self.history.append(loss.item())
         stats = dict(
@@ -241,6 +325,69 @@ class Solver(abc.ABC, cebra.io.HasDevice):
             self.log[key].append(value)
         return stats
 
+    def _reduce_gradients(self):
+        """Sum the gradients of the parameters shared across ranks after the backward pass."""
+        if self.distributed:
+            # NOTE: The criterion is computed on the same global batch on all ranks, so
+            # only the gradients of the model differ between ranks.
+            cebra_distributed.all_reduce_gradients(self.model.parameters())
+
+    def _compute_loss(
+        self, batch: cebra.data.Batch
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Compute the model outputs and the criterion for a batch of input examples.
+
+        Returns:
+            The loss, alignment and uniformity terms returned by the criterion.
+        """
+        with self._autocast():
+            prediction = self._gather(self._inference(batch))
+            return self.criterion(prediction.reference, prediction.positive,
+                                  prediction.negative)
+
+    def _gather(self, prediction: cebra.data.Batch) -> cebra.data.Batch:
+        """Gather the embeddings of all ranks in distributed training."""
+        if not self.distributed:
+            return prediction
+        return cebra.data.Batch(
+            cebra_distributed.all_gather(prediction.reference),
+            cebra_distributed.all_gather(prediction.positive),
+            cebra_distributed.all_gather(prediction.negative),
+        )
+
+    def _cached_backward(
+        self, batch: cebra.data.Batch
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Compute the loss and its gradients for a batch in micro-batches.
+
+        While computing the loss, the model is replaced by a
+        :py:class:`cebra.solver.util.GradientCache`, which embeds the samples in micro-batches
+        without graph. The gradients of the loss with respect to the embedding are then
+        backpropagated through the model one micro-batch at a time.
+
+        Returns:
+            The loss, alignment and uniformity terms returned by the criterion.
+        """
+        cache = GradientCache(self.micro_batch_size)
+        model = self.model
+        self.model = cache.wrap(model)
+        try:
+            with self._autocast():
+                prediction = self._gather(self._inference(batch))
+                loss, align, uniform = self.criterion(prediction.reference,
+                                                      prediction.positive,
+                                                      prediction.negative)
+        finally:
+            self.model = model
+        loss.backward()
+        with self._autocast():
+            cache.backward()
+        return loss, align, uniform
+
+    def _autocast(self):
+        """Return the context for forward passes in the precision of the solver."""
+        return autocast(self.device, self.precision)
+
     def validation(self,
                    loader: cebra.data.Loader,
                    session_id: Optional[int] = None):
@@ -260,10 +407,11 @@ class Solver(abc.ABC, cebra.io.HasDevice):
         total_loss = Meter()
         self.model.eval()
         for _, batch in iterator:
-            prediction = self._inference(batch)
-            loss, _, _ = self.criterion(prediction.reference,
-                                        prediction.positive,
-                                        prediction.negative)
+            with self._autocast():
+                prediction = self._inference(batch)
+                loss, _, _ = self.criterion(prediction.reference,
+                                            prediction.positive,
+                                            prediction.negative)
             total_loss.add(loss.item())
         return total_loss.average
 
@@ -302,7 +450,8 @@ class Solver(abc.ABC, cebra.io.HasDevice):
         """
 
         self.model.eval()
-        return self.model(inputs)
+        with self._autocast():
+            return self.model(inputs).float()
 
     @abc.abstractmethod
     def _inference(self, batch: cebra.data.Batch) -> cebra.data.Batch:
@@ -352,6 +501,38 @@ class Solver(abc.ABC, cebra.io.HasDevice):
         )
 
 
+class TiledLossMixin:
+    """Compute the loss of full-batch solvers in tiles of ``micro_batch_size`` samples.
+
+    Full-batch solvers embed the full dataset in chunks (see
+    :py:func:`cebra.solver.util.chunked_forward`) instead of caching the gradients of
+    micro-batches. If ``micro_batch_size`` is set, the loss is computed in tiles of
+    ``micro_batch_size`` reference samples with
+    :py:meth:`cebra.models.criterions.BaseInfoNCE.tiled_forward`, such that the memory
+    of the similarities is bounded by the micro-batch size.
+    """
+
+    def _compute_loss(self, batch):
+        """Compute the loss on the full dataset, in tiles if ``micro_batch_size`` is set."""
+        if self.micro_batch_size is None:
+            return super()._compute_loss(batch)
+        if not isinstance(self.criterion, cebra.models.criterions.BaseInfoNCE):
+            raise ValueError(
+                f"Full-batch training with a micro_batch_size requires an InfoNCE "
+                f"criterion, but got {type(self.criterion).__name__}.")
+        with self._autocast():
+            prediction = self._gather(self._inference(batch))
+            return self.criterion.tiled_forward(prediction.reference,
+                                                prediction.positive,
+                                                prediction.negative,
+                                                tile_size=self.micro_batch_size)
+
+    def _cached_backward(self, batch):
+        loss, align, uniform = self._compute_loss(batch)
+        loss.backward()
+        return loss, align, uniform
+
+
 @dataclasses.dataclass
 class MultiobjectiveSolver(Solver):
     """Train models to satisfy multiple learning objectives.
@@ -383,6 +564,10 @@ class MultiobjectiveSolver(Solver):
 
     def __post_init__(self):
         super().__post_init__()
+        if self.micro_batch_size is not None or self.distributed:
+            raise NotImplementedError(
+                f"Gradient caching with micro_batch_size and distributed training are not "
+                f"supported by {type(self).__name__}.")
         self._check_dimensions()
         self.model = cebra.models.MultiobjectiveModel(
             self.model,
@@ -435,19 +620,20 @@ class MultiobjectiveSolver(Solver):
             Dictionary containing training metrics.
         """
         self.optimizer.zero_grad()
-        prediction_behavior, prediction_time = self._inference(batch)
-
-        behavior_loss, behavior_align, behavior_uniform = self.criterion(
-            prediction_behavior.reference,
-            prediction_behavior.positive,
-            prediction_behavior.negative,
-        )
-
-        time_loss, time_align, time_uniform = self.criterion(
-            prediction_time.reference,
-            prediction_time.positive,
-            prediction_time.negative,
-        )
+        with self._autocast():
+            prediction_behavior, prediction_time = self._inference(batch)
+
+            behavior_loss, behavior_align, behavior_uniform = self.criterion(
+                prediction_behavior.reference,
+                prediction_behavior.positive,
+                prediction_behavior.negative,
+            )
+
+            time_loss, time_align, time_uniform = self.criterion(
+                prediction_time.reference,
+                prediction_time.positive,
+                prediction_time.negative,
+            )
 
         loss = behavior_loss + time_loss
         loss.backward()
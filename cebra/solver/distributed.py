@@ -0,0 +1,226 @@
+#
+# CEBRA: Consistent EmBeddings of high-dimensional Recordings using Auxiliary variables
+# © Mackenzie W. Mathis & Steffen Schneider (v0.4.0+)
+# Source code:
+# https://github.com/AdaptiveMotorControlLab/CEBRA
+#
+# Please see LICENSE.md for the full license document:
+# https://github.com/AdaptiveMotorControlLab/CEBRA/blob/main/LICENSE.md
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Helper functions for data-parallel training with :py:mod:`torch.distributed`.
+
+In distributed training (see the ``distributed`` option of :py:class:`cebra.solver.base.Solver`),
+each process (rank) samples its own batch. The embeddings of all ranks are gathered with
+:py:func:`all_gather`, such that the criterion is computed on the global batch, i.e., the
+negative samples of all ranks are contrasted against each reference sample. The gradients
+of the model parameters are then summed across ranks with :py:func:`all_reduce_gradients`.
+
+In session-parallel multi-session training (see the ``session_parallel`` option of
+:py:class:`cebra.solver.multi_session.MultiSessionSolver`), the session models are instead
+distributed across ranks. All ranks sample the same batches, each rank embeds the batches of
+its own sessions, and the embeddings are exchanged with :py:func:`all_gather`. Only the
+gradients of parameters shared by all sessions, such as the trunk of a
+:py:class:`cebra.models.MultisessionModel`, are summed across ranks.
+
+The process group can be initialized by any launcher of :py:mod:`torch.distributed`, e.g.
+with ``torchrun`` on one or multiple nodes, followed by
+``torch.distributed.init_process_group("gloo")`` in the training script. For running multiple
+processes on the local machine, :py:func:`launch` can be used.
+"""
+
+import socket
+from typing import Callable, Iterable
+
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing
+
+__all__ = [
+    "is_initialized", "get_rank", "get_world_size", "is_main_process",
+    "all_gather", "all_reduce_gradients", "broadcast_tensors",
+    "broadcast_parameters", "seed_ranks", "broadcast_seed", "launch"
+]
+
+
+def is_initialized() -> bool:
+    """Check if the default process group of :py:mod:`torch.distributed` is initialized."""
+    return dist.is_available() and dist.is_initialized()
+
+
+def get_rank() -> int:
+    """The rank of the current process, ``0`` if not running distributed."""
+    return dist.get_rank() if is_initialized() else 0
+
+
+def get_world_size() -> int:
+    """The number of processes, ``1`` if not running distributed."""
+    return dist.get_world_size() if is_initialized() else 1
+
+
+def is_main_process() -> bool:
+    """Check if the current process is rank 0, e.g. for writing checkpoints and logs."""
+    return get_rank() == 0
+
+
+class _AllGather(torch.autograd.Function):
+    """Concatenate tensors of all ranks, and propagate gradients to the local tensor."""
+
+    @staticmethod
+    def forward(ctx, tensor: torch.Tensor) -> torch.Tensor:
+        ctx.rank = dist.get_rank()
+        ctx.num_samples = len(tensor)
+        tensor = tensor.contiguous()
+        gathered = [
+            torch.empty_like(tensor) for _ in range(dist.get_world_size())
+        ]
+        dist.all_gather(gathered, tensor)
+        return torch.cat(gathered)
+
+    @staticmethod
+    def backward(ctx, grad_output: torch.Tensor) -> torch.Tensor:
+        start = ctx.rank * ctx.num_samples
+        return grad_output[start:start + ctx.num_samples]
+
+
+def all_gather(tensor: torch.Tensor) -> torch.Tensor:
+    """Concatenate a tensor of the same shape from all ranks along the first dimension.
+
+    The gradient of the output is propagated to the tensor of the local rank. If every
+    rank computes the same loss from the gathered tensor, this is the exact gradient of
+    the loss with respect to the local tensor.
+
+    Args:
+        tensor: The local tensor, which needs to have the same shape on all ranks.
+
+    Returns:
+        The tensors of all ranks, ordered by rank.
+    """
+    if get_world_size() == 1:
+        return tensor
+    return _AllGather.apply(tensor)
+
+
+def all_reduce_gradients(parameters: Iterable[torch.nn.Parameter]):
+    """Sum the gradients of the parameters across all ranks.
+
+    The gradients are flattened into a single buffer to reduce the number of messages.
+    Missing gradients are treated as zero.
+
+    Args:
+        parameters: The parameters, which need to be the same on all ranks.
+    """
+    if get_world_size() == 1:
+        return
+    parameters = [
+        parameter for parameter in parameters if parameter.requires_grad
+    ]
+    if len(parameters) == 0:
+        return
+    grads = [
+        parameter.grad
+        if parameter.grad is not None else torch.zeros_like(parameter)
+        for parameter in parameters
+    ]
+    buffer = torch.cat([grad.reshape(-1) for grad in grads])
+    dist.all_reduce(buffer)
+    for parameter, grad in zip(parameters,
+                               buffer.split([grad.numel() for grad in grads])):
+        parameter.grad = grad.view_as(parameter)
+
+
+def broadcast_tensors(tensors: Iterable[torch.Tensor], src: int = 0):
+    """Set the tensors in-place to their values on rank ``src``.
+
+    Args:
+        tensors: Contiguous tensors of the same shapes on all ranks, e.g. parameters
+            or views of them.
+        src: The rank to copy the values from.
+    """
+    if get_world_size() == 1:
+        return
+    with torch.no_grad():
+        for tensor in tensors:
+            dist.broadcast(tensor, src)
+
+
+def broadcast_parameters(module: torch.nn.Module, src: int = 0):
+    """Set the parameters and buffers of the module to the values of rank ``src``."""
+    broadcast_tensors(list(module.parameters()) + list(module.buffers()), src)
+
+
+def seed_ranks():
+    """Seed the random number generators of torch and numpy differently on each rank.
+
+    A seed is drawn from the current state of the torch random number generator, which
+    is the same on all ranks if all processes were seeded with the same value, and offset
+    by the rank. The ranks then sample different batches, while training stays reproducible.
+    """
+    seed = int(torch.randint(2**31, ())) + get_rank()
+    torch.manual_seed(seed)
+    np.random.seed(seed)
+
+
+def broadcast_seed():
+    """Seed the random number generators of torch and numpy with the same value on all ranks.
+
+    The seed is drawn on rank 0 and broadcast to all other ranks, such that all ranks sample
+    the same batches afterwards.
+    """
+    seed = torch.randint(2**31, ())
+    if get_world_size() > 1:
+        dist.broadcast(seed, 0)
+    torch.manual_seed(int(seed))
+    np.random.seed(int(seed))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _run(rank: int, function: Callable, num_processes: int, init_method: str,
+         backend: str, args: tuple):
+    dist.init_process_group(backend,
+                            init_method=init_method,
+                            rank=rank,
+                            world_size=num_processes)
+    try:
+        function(*args)
+    finally:
+        dist.destroy_process_group()
+
+
+def launch(function: Callable,
+           num_processes: int,
+           *args,
+           backend: str = "gloo"):
+    """Run a function in multiple local processes with an initialized process group.
+
+    Args:
+        function: The function to run in each process, e.g. a function which fits a solver
+            with ``distributed=True``. The function needs to be picklable, i.e. defined at
+            the top level of a module.
+        num_processes: The number of processes to start.
+        args: Arguments passed to ``function``.
+        backend: The backend of :py:mod:`torch.distributed`.
+    """
+    init_method = f"tcp://127.0.0.1:{_free_port()}"
+    torch.multiprocessing.spawn(_run,
+                                args=(function, num_processes, init_method,
+                                      backend, args),
+                                nprocs=num_processes,
+                                join=True)
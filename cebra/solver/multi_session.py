@@ -22,6 +22,7 @@
 """Solver implementations for multi-session datasetes."""
 
 import abc
+import functools
 import os
 from collections.abc import Iterable
 from typing import List, Optional
@@ -33,15 +34,99 @@ import cebra
 import cebra.data
 import cebra.models
 import cebra.solver.base as abc_
+import cebra.solver.distributed as cebra_distributed
 from cebra.solver import register
+from cebra.solver.util import chunked_forward
 from cebra.solver.util import Meter
 
 
 @register("multi-session")
+@dataclasses.dataclass
 class MultiSessionSolver(abc_.Solver):
-    """Multi session training, contrasting pairs of neural data."""
+    """Multi session training, contrasting pairs of neural data.
+
+    Attributes:
+        session_parallel: If ``True``, the session models are distributed across the processes
+            of the initialized :py:mod:`torch.distributed` process group, where the process
+            with rank ``r`` trains the sessions ``r, r + world_size, r + 2 * world_size, ...``.
+            All processes sample the same batches, but each process only embeds the batches
+            of its own sessions. The low-dimensional embeddings are then exchanged between
+            processes to compute the criterion on all sessions. The time per step hence stays
+            roughly constant if the number of processes grows with the number of sessions.
+            The session models are synchronized across processes before saving checkpoints
+            and at the end of :py:meth:`fit`, while the optimizer state of each session is
+            only kept by the process training it. For a :py:class:`cebra.models.MultisessionModel`,
+            the gradients of the shared trunk are summed across processes in each step, such
+            that the trunk stays the same on all processes, and only the input layers of the
+            sessions are synchronized. Only the process with rank 0 writes
+            checkpoints, calls the ``save_hook`` and shows the progress bar. Cannot be
+            combined with ``distributed``.
+    """
 
     _variant_name = "multi-session"
+    session_parallel: bool = False
+
+    def __post_init__(self):
+        if self.session_parallel and self.distributed:
+            raise ValueError(
+                "session_parallel and distributed training cannot be combined.")
+        super().__post_init__()
+
+    @property
+    def _is_main_process(self) -> bool:
+        if self.session_parallel:
+            return cebra_distributed.is_main_process()
+        return super()._is_main_process
+
+    def _init_distributed(self):
+        """Synchronize the model and criterion, and sample the same batches on each rank."""
+        if not self.session_parallel:
+            return super()._init_distributed()
+        if not cebra_distributed.is_initialized():
+            raise RuntimeError(
+                "Session-parallel training requires an initialized torch.distributed "
+                "process group, see cebra.solver.distributed.")
+        if cebra_distributed.get_world_size() > len(self.model):
+            raise ValueError(
+                f"Session-parallel training requires at most one process per session, "
+                f"got {cebra_distributed.get_world_size()} processes for "
+                f"{len(self.model)} sessions.")
+        cebra_distributed.broadcast_parameters(self.model)
+        cebra_distributed.broadcast_parameters(self.criterion)
+        cebra_distributed.broadcast_seed()
+
+    def _synchronize(self):
+        """Copy the model of each session from the rank training it to all other ranks."""
+        if not self.session_parallel:
+            return
+        world_size = cebra_distributed.get_world_size()
+        if isinstance(self.model, cebra.models.MultisessionModel):
+            # NOTE: The trunk is the same on all ranks, see _reduce_gradients.
+            input_layer = self.model.input_layer
+            for session_id in range(len(self.model)):
+                cebra_distributed.broadcast_tensors([
+                    input_layer.weight[session_id], input_layer.bias[session_id]
+                ],
+                                                    src=session_id % world_size)
+            return
+        for session_id, model in enumerate(self.model):
+            cebra_distributed.broadcast_parameters(model,
+                                                   src=session_id % world_size)
+
+    def _reduce_gradients(self):
+        """Sum the gradients of the shared trunk of a multi-session model across ranks.
+
+        In session-parallel training, each rank only backpropagates through the embeddings
+        of its own sessions, such that the gradient of a trunk shared by all sessions is
+        split across ranks. The gradients of the input layers only need to be correct for
+        the sessions of each rank, and the criterion is computed on the embeddings of all
+        sessions on every rank.
+        """
+        if not self.session_parallel:
+            return super()._reduce_gradients()
+        if isinstance(self.model, cebra.models.MultisessionModel):
+            cebra_distributed.all_reduce_gradients(
+                self.model.trunk.parameters())
 
     def _mix(self, array: torch.Tensor, idx: torch.Tensor) -> torch.Tensor:
         shape = array.shape
@@ -93,6 +178,11 @@ class MultiSessionSolver(abc_.Solver):
             ``batch.index`` should be set to ``None``.
 
         """
+        if self.session_parallel:
+            return self._session_parallel_inference(batches)
+        if isinstance(self.model, cebra.models.MultisessionModel):
+            return self._grouped_inference(batches)
+
         refs = []
         poss = []
         negs = []
@@ -116,6 +206,88 @@ class MultiSessionSolver(abc_.Solver):
             negative=neg.view(-1, num_features),
         )
 
+    def _grouped_inference(self,
+                           batches: List[cebra.data.Batch]) -> cebra.data.Batch:
+        """Embed the batches of all sessions at once with a :py:class:`cebra.models.MultisessionModel`.
+
+        The reference, positive and negative samples of all sessions are concatenated, such
+        that the input layers of all sessions and the shared trunk are each evaluated once.
+
+        See :py:meth:`_inference` for the arguments and return value.
+        """
+        for batch in batches:
+            batch.to(self.device)
+        batch = batches[0]
+        num_samples = [
+            len(batch.reference),
+            len(batch.positive),
+            len(batch.negative)
+        ]
+        embeddings = self.model([
+            torch.cat([batch.reference, batch.positive, batch.negative])
+            for batch in batches
+        ])
+        ref, pos, neg = embeddings.split(num_samples, dim=1)
+
+        pos = self._mix(pos, batches[0].index_reversed)
+
+        num_features = neg.shape[2]
+
+        return cebra.data.Batch(
+            reference=ref.reshape(-1, num_features),
+            positive=pos.reshape(-1, num_features),
+            negative=neg.reshape(-1, num_features),
+        )
+
+    def _session_parallel_inference(
+            self, batches: List[cebra.data.Batch]) -> cebra.data.Batch:
+        """Embed the batches of the sessions of this rank, and gather the embeddings of all ranks.
+
+        The embeddings of each rank are padded to the same number of sessions, such that
+        they can be exchanged with :py:func:`cebra.solver.distributed.all_gather`. The
+        gradients of the criterion are propagated to the embeddings of the local sessions.
+
+        See :py:meth:`_inference` for the arguments and return value.
+        """
+        rank = cebra_distributed.get_rank()
+        world_size = cebra_distributed.get_world_size()
+        num_sessions = len(batches)
+        num_local = -(-num_sessions // world_size)
+
+        embeddings = []
+        for session_id in range(rank, num_sessions, world_size):
+            batch = batches[session_id]
+            model = self.model[session_id]
+            batch.to(self.device)
+            embeddings.append(
+                torch.stack([
+                    model(batch.reference),
+                    model(batch.positive),
+                    model(batch.negative)
+                ]))
+        embeddings = torch.stack(embeddings)
+        padding = embeddings.new_zeros(num_local - len(embeddings),
+                                       *embeddings.shape[1:])
+        embeddings = cebra_distributed.all_gather(
+            torch.cat([embeddings, padding]))
+
+        # NOTE: The embeddings are ordered by rank, and need to be reordered by session.
+        order = [
+            (session_id % world_size) * num_local + session_id // world_size
+            for session_id in range(num_sessions)
+        ]
+        ref, pos, neg = embeddings[order].unbind(dim=1)
+
+        pos = self._mix(pos, batches[0].index_reversed)
+
+        num_features = neg.shape[2]
+
+        return cebra.data.Batch(
+            reference=ref.reshape(-1, num_features),
+            positive=pos.reshape(-1, num_features),
+            negative=neg.reshape(-1, num_features),
+        )
+
     def validation(self, loader, session_id: Optional[int] = None):
         """Compute score of the model on data.
 
@@ -137,15 +309,113 @@ class MultiSessionSolver(abc_.Solver):
         total_loss = Meter()
         self.model[session_id].eval()
         for _, batch in iterator:
-            prediction = self._single_model_inference(batch,
-                                                      self.model[session_id])
-            loss, _, _ = self.criterion(prediction.reference,
-                                        prediction.positive,
-                                        prediction.negative)
+            with self._autocast():
+                prediction = self._single_model_inference(
+                    batch, self.model[session_id])
+                loss, _, _ = self.criterion(prediction.reference,
+                                            prediction.positive,
+                                            prediction.negative)
             total_loss.add(loss.item())
         return total_loss.average
 
 
+@register("multi-session-full")
+@dataclasses.dataclass
+class BatchMultiSessionSolver(abc_.TiledLossMixin, MultiSessionSolver):
+    """Optimize the models of multiple sessions with batch gradient descent.
+
+    In each step, the full input of each session is embedded with the model of that
+    session, and the reference, positive and negative samples are selected from these
+    embeddings, using the indices returned by a :py:class:`cebra.data.multi_session.FullMultiSessionDataLoader`.
+    Positive samples at the borders of a session, for which no embedding exists,
+    are replaced by the closest valid samples, as done by
+    :py:meth:`cebra.data.base.Dataset.expand_index` for mini-batches.
+
+    As for :py:class:`cebra.solver.single_session.BatchSingleSessionSolver`, the memory
+    for the embeddings and the loss is bounded by setting ``micro_batch_size``, in which
+    case the sessions are embedded in chunks of this many time steps with activation
+    checkpointing, and the loss is computed in tiles of this many reference samples.
+    Cannot be combined with ``distributed`` or ``session_parallel`` training.
+    """
+
+    _variant_name = "multi-session-full"
+
+    def __post_init__(self):
+        if self.session_parallel or self.distributed:
+            raise ValueError(
+                "Full-batch multi-session training cannot be combined with "
+                "distributed or session-parallel training.")
+        super().__post_init__()
+
+    def fit(self, loader, *args, **kwargs):
+        """Train the models on the full sessions of the loader.
+
+        See :py:meth:`cebra.solver.base.Solver.fit` for the arguments.
+        """
+        self.neural = [
+            session.upcast(session.neural).T[None]
+            for session in loader.dataset.iter_sessions()
+        ]
+        super().fit(loader, *args, **kwargs)
+
+    def _session_embedding(self, model: torch.nn.Module,
+                           neural: torch.Tensor) -> torch.Tensor:
+        """Embed the input of shape ``(1, dim, time)`` of a session in ``(time, features)`` format."""
+        if isinstance(model, cebra.models.ConvolutionalModelMixin):
+            return model(neural)[0].T
+        return model(neural[0].T)
+
+    def _inference(self, batch: cebra.data.BatchIndex) -> cebra.data.Batch:
+        """Embed the full sessions, and select the samples of the batch indices.
+
+        Args:
+            batch: The indices of the reference, positive and negative samples of
+                each session, as returned by :py:class:`cebra.data.multi_session.FullMultiSessionDataLoader`.
+
+        Returns:
+            The embeddings of the samples, with the positive samples aligned to the
+            reference samples.
+        """
+        refs = []
+        poss = []
+        negs = []
+        for session_id, (model,
+                         neural) in enumerate(zip(self.model, self.neural)):
+            neural = neural.to(self.device)
+            if isinstance(model, cebra.models.ConvolutionalModelMixin):
+                offset = model.get_offset()
+            else:
+                offset = cebra.data.Offset(0, 1)
+            outputs = chunked_forward(functools.partial(self._session_embedding,
+                                                        model),
+                                      neural,
+                                      self.micro_batch_size,
+                                      halo=len(offset) - 1)
+
+            def _select(index):
+                index = index[session_id].to(outputs.device)
+                index = torch.clamp(index, offset.left,
+                                    offset.left + len(outputs) - 1)
+                return outputs[index - offset.left]
+
+            refs.append(_select(batch.reference))
+            poss.append(_select(batch.positive))
+            negs.append(_select(batch.negative))
+        ref = torch.stack(refs, dim=0)
+        pos = torch.stack(poss, dim=0)
+        neg = torch.stack(negs, dim=0)
+
+        pos = self._mix(pos, batch.index_reversed)
+
+        num_features = neg.shape[2]
+
+        return cebra.data.Batch(
+            reference=ref.view(-1, num_features),
+            positive=pos.view(-1, num_features),
+            negative=neg.view(-1, num_features),
+        )
+
+
 @register("multi-session-aux")
 class MultiSessionAuxVariableSolver(abc_.Solver):
     """Multi session training, contrasting neural data against behavior."""
@@ -22,10 +22,12 @@
 """Single session solvers embed a single pair of time series."""
 
 import abc
+import concurrent.futures
 import copy
+import itertools
 import os
 from collections.abc import Iterable
-from typing import List
+from typing import List, Tuple
 
 import literate_dataclasses as dataclasses
 import torch
@@ -35,6 +37,7 @@ import cebra.data
 import cebra.models
 import cebra.solver.base as abc_
 from cebra.solver import register
+from cebra.solver.util import chunked_forward
 
 
 @register("single-session")
@@ -129,6 +132,273 @@ class SingleSessionAuxVariableSolver(abc_.Solver):
         return cebra.data.Batch(ref, pos, neg)
 
 
+@register("single-session-distillation")
+@dataclasses.dataclass
+class SingleSessionDistillationSolver(abc_.Solver):
+    """Train a model to reproduce the embedding of a frozen teacher model.
+
+    The reference samples are embedded by both the ``model`` (the student) and the
+    ``teacher``, and the criterion is computed between the student embedding of the
+    reference samples, the teacher embedding of the same samples as positive samples,
+    and the teacher embedding of the negative samples. With an InfoNCE criterion, the
+    student learns to identify the teacher embedding of the same time point, with
+    :py:class:`cebra.models.criterions.EmbeddingMSE`, the student embedding is regressed
+    onto the teacher embedding.
+
+    The teacher and student models can have different receptive fields. When fitting,
+    the offset of the dataset is set to cover the receptive fields of both models, and
+    the input samples are cropped to the receptive field of each model.
+
+    Attributes:
+        teacher: The trained model to distill. A frozen copy of the model is kept
+            in evaluation mode.
+    """
+
+    _variant_name = "single-session-distillation"
+    teacher: torch.nn.Module = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.teacher is None:
+            raise ValueError("Distillation requires a teacher model.")
+        self.teacher = copy.deepcopy(self.teacher)
+        self.teacher.eval()
+        self.teacher.requires_grad_(False)
+
+        teacher_offset = self.teacher.get_offset()
+        student_offset = self.model.get_offset()
+        self.offset = cebra.data.Offset(
+            max(teacher_offset.left, student_offset.left),
+            max(teacher_offset.right, student_offset.right))
+        self._teacher_crop = self._crop(teacher_offset)
+        self._student_crop = self._crop(student_offset)
+
+    def _crop(self, offset: cebra.data.Offset) -> slice:
+        return slice(self.offset.left - offset.left,
+                     self.offset.left + offset.right)
+
+    def fit(self, loader, *args, **kwargs):
+        loader.dataset.offset = self.offset
+        super().fit(loader, *args, **kwargs)
+
+    def _inference(self, batch: cebra.data.Batch) -> cebra.data.Batch:
+        batch.to(self.device)
+        with torch.no_grad():
+            pos = self.teacher(batch.reference[..., self._teacher_crop])
+            neg = self.teacher(batch.negative[..., self._teacher_crop])
+        ref = self.model(batch.reference[..., self._student_crop])
+        return cebra.data.Batch(ref, pos, neg)
+
+
+class _EnsembleLoader:
+    """Draw an independent batch for each replica of an ensemble in each step."""
+
+    def __init__(self, loader: cebra.data.Loader, num_replicas: int):
+        self.loader = loader
+        self.num_replicas = num_replicas
+
+    def __len__(self):
+        return len(self.loader)
+
+    def __iter__(self):
+        return zip(*(iter(self.loader) for _ in range(self.num_replicas)))
+
+
+@register("single-session-ensemble")
+@dataclasses.dataclass
+class SingleSessionEnsembleSolver(abc_.Solver):
+    """Train multiple replicas of a model concurrently, e.g. for seed ensembles.
+
+    The ``model`` and ``criterion`` are :py:class:`torch.nn.ModuleList` instances with one
+    model and criterion for each replica, typically with the same architecture and
+    different random initializations. In each step, every replica is trained on its own,
+    independently sampled batch. The losses of the replicas are summed, such that the
+    gradients and the optimizer updates of each replica are the same as in independent
+    training runs.
+
+    The ``log`` and ``history`` contain a list with the values of all replicas for each step.
+
+    Attributes:
+        vectorize: If ``True``, the forward passes of all replicas are vectorized with
+            :py:func:`torch.func.vmap` over their stacked parameters, so that the replicas are
+            computed in a few large (e.g., grouped convolutions) instead of many small
+            operations. This is typically faster on GPUs. If ``False``, the forward and
+            backward passes of the replicas are computed separately, which can be faster on
+            CPUs.
+        num_threads: If ``vectorize`` is ``False``, the number of threads computing the
+            forward and backward passes of the replicas in parallel. PyTorch releases the
+            global interpreter lock in its operations, such that the replicas can use multiple
+            CPU cores, also for models too small to benefit from intra-op parallelism.
+
+    Note:
+        Compilation, gradient caching and distributed training are not supported.
+    """
+
+    _variant_name = "single-session-ensemble"
+    vectorize: bool = True
+    num_threads: int = 1
+
+    def __post_init__(self):
+        if self.compile or self.micro_batch_size is not None or self.distributed:
+            raise NotImplementedError(
+                "Ensemble training does not support compile, micro_batch_size and "
+                "distributed training.")
+        super().__post_init__()
+        if not isinstance(self.model, torch.nn.ModuleList):
+            raise ValueError(
+                "Ensemble training requires a torch.nn.ModuleList with the models of all "
+                f"replicas, got {type(self.model).__name__}.")
+        if not isinstance(self.criterion, torch.nn.ModuleList) or len(
+                self.criterion) != len(self.model):
+            raise ValueError(
+                f"Ensemble training requires a torch.nn.ModuleList with a criterion for "
+                f"each of the {len(self.model)} replicas.")
+        if self.num_threads < 1:
+            raise ValueError(
+                f"num_threads needs to be a positive integer, got {self.num_threads}."
+            )
+
+    @property
+    def num_replicas(self) -> int:
+        """The number of trained replicas."""
+        return len(self.model)
+
+    def _get_loader(self, loader):
+        return super()._get_loader(_EnsembleLoader(loader, self.num_replicas))
+
+    def _forward(self, inputs: torch.Tensor) -> torch.Tensor:
+        """Compute the outputs of all replicas with a single vectorized forward pass.
+
+        Args:
+            inputs: The inputs of all replicas, stacked along the first dimension.
+
+        Returns:
+            The outputs of all replicas, stacked along the first dimension.
+        """
+        if not self.vectorize:
+            return torch.stack([
+                model(replica_inputs)
+                for model, replica_inputs in zip(self.model, inputs)
+            ])
+
+        states = [
+            dict(
+                itertools.chain(model.named_parameters(),
+                                model.named_buffers())) for model in self.model
+        ]
+        # NOTE: The parameters are stacked in each step, such that the gradients are
+        # propagated to the parameters of the replicas, which are updated by the optimizer.
+        state = {
+            name: torch.stack([state[name] for state in states])
+            for name in states[0]
+        }
+
+        def _replica_forward(state, inputs):
+            return torch.func.functional_call(self.model[0], state, (inputs,))
+
+        return torch.func.vmap(_replica_forward, randomness="different")(state,
+                                                                         inputs)
+
+    def _inference(self,
+                   batches: List[cebra.data.Batch]) -> List[cebra.data.Batch]:
+        """Given a batch of input examples for each replica, computes the embeddings.
+
+        Args:
+            batches: A list with a batch of input examples for each replica.
+
+        Returns:
+            The processed batch of data of each replica.
+        """
+        for batch in batches:
+            batch.to(self.device)
+        inputs = torch.stack([
+            torch.cat([batch.reference, batch.positive, batch.negative])
+            for batch in batches
+        ])
+        outputs = self._forward(inputs)
+        num_reference = len(batches[0].reference)
+        num_positive = len(batches[0].positive)
+        return [
+            cebra.data.Batch(*output.split([
+                num_reference, num_positive,
+                len(output) - num_reference - num_positive
+            ])) for output in outputs
+        ]
+
+    def _replica_backward(
+        self, replica: int, batch: cebra.data.Batch
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Compute the loss and the gradients of a single replica.
+
+        Args:
+            replica: The index of the replica.
+            batch: The batch of input samples of the replica.
+
+        Returns:
+            The loss, alignment and uniformity terms returned by the criterion.
+        """
+        batch.to(self.device)
+        num_reference, num_positive = len(batch.reference), len(batch.positive)
+        with self._autocast():
+            output = self.model[replica](torch.cat(
+                [batch.reference, batch.positive, batch.negative]))
+            reference, positive, negative = output.split([
+                num_reference, num_positive,
+                len(output) - num_reference - num_positive
+            ])
+            loss, align, uniform = self.criterion[replica](reference,
+                                                           positive, negative)
+        loss.backward()
+        return loss.detach(), align.detach(), uniform.detach()
+
+    def step(self, batches: List[cebra.data.Batch]) -> dict:
+        """Perform a single gradient update of all replicas.
+
+        Args:
+            batches: A list with a batch of input samples for each replica.
+
+        Returns:
+            Dictionary containing the training metrics, averaged across replicas.
+        """
+        self.optimizer.zero_grad()
+        if self.vectorize:
+            with self._autocast():
+                predictions = self._inference(batches)
+                losses = [
+                    criterion(prediction.reference, prediction.positive,
+                              prediction.negative) for criterion, prediction in
+                    zip(self.criterion, predictions)
+                ]
+            total, align, uniform = (
+                torch.stack(values) for values in zip(*losses))
+            total.sum().backward()
+        else:
+            # NOTE: The replicas do not share parameters, so their graphs are disjoint
+            # and the backward passes can run concurrently.
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.num_threads) as executor:
+                losses = list(
+                    executor.map(self._replica_backward,
+                                 range(self.num_replicas), batches))
+            total, align, uniform = (
+                torch.stack(values) for values in zip(*losses))
+        self.optimizer.step()
+
+        replica_stats = dict(
+            pos=align.tolist(),
+            neg=uniform.tolist(),
+            total=total.tolist(),
+            temperature=[criterion.temperature for criterion in self.criterion],
+        )
+        self.history.append(replica_stats["total"])
+        for key, value in replica_stats.items():
+            self.log[key].append(value)
+        return {
+            key: sum(value) / self.num_replicas
+            for key, value in replica_stats.items()
+        }
+
+
 @register("single-session-hybrid")
 @dataclasses.dataclass
 class SingleSessionHybridSolver(abc_.MultiobjectiveSolver):
@@ -152,18 +422,31 @@ class SingleSessionHybridSolver(abc_.MultiobjectiveSolver):
 
 @register("single-session-full")
 @dataclasses.dataclass
-class BatchSingleSessionSolver(SingleSessionSolver):
+class BatchSingleSessionSolver(abc_.TiledLossMixin, SingleSessionSolver):
     """Optimize a model with batch gradient descent.
 
-    Usage of this solver requires a sufficient amount of GPU memory. Using this solver
-    is equivalent to using a single session solver with batch size set to dataset size,
-    but requires less computation.
+    Using this solver is equivalent to using a single session solver with batch size set
+    to dataset size, but requires less computation: the embedding of the full dataset is
+    computed once per step, and the reference, positive and negative samples are selected
+    from it.
+
+    By default, the full dataset is embedded at once, and the similarities between all
+    pairs of samples are computed, which requires memory scaling quadratically with the
+    dataset size. If ``micro_batch_size`` is set, the embedding is instead computed in
+    chunks of ``micro_batch_size`` time steps with activation checkpointing (see
+    :py:func:`cebra.solver.util.chunked_forward`), and the loss is computed in tiles of
+    ``micro_batch_size`` reference samples (see :py:meth:`cebra.models.criterions.BaseInfoNCE.tiled_forward`).
+    The loss and gradients are the same as for the full dataset, while the memory is
+    bounded by the micro-batch size, e.g. for batch gradient descent on the CPU.
     """
 
     def fit(self, loader, *args, **kwargs):
-        """TODO"""
+        """Train the model on the full dataset of the loader.
+
+        See :py:meth:`cebra.solver.base.Solver.fit` for the arguments.
+        """
         self.offset = loader.dataset.offset
-        self.neural = loader.dataset.neural.T[None]
+        self.neural = loader.dataset.upcast(loader.dataset.neural).T[None]
         if isinstance(self.model, cebra.models.ConvolutionalModelMixin):
             if self.offset is None:
                 raise ValueError("Configure dataset, no offset found.")
@@ -203,7 +486,10 @@ class BatchSingleSessionSolver(SingleSessionSolver):
             return self.model(data[0].T)
 
     def _inference(self, batch: cebra.data.Batch) -> cebra.data.Batch:
-        outputs = self.get_embedding(self.neural)
+        outputs = chunked_forward(self.get_embedding,
+                                  self.neural,
+                                  self.micro_batch_size,
+                                  halo=len(self.offset) - 1)
         idc = batch.positive - self.offset.left >= len(outputs)
         batch.positive[idc] = batch.reference[idc]
 
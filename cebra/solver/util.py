@@ -21,12 +21,17 @@
 #
 """Utility functions for solvers and their training loops."""
 
-from collections.abc import Iterable
-from typing import Dict
+import contextlib
+import warnings
+from typing import Callable, Dict, Iterable, Optional
 
 import literate_dataclasses as dataclasses
+import torch
+import torch.utils.checkpoint
 import tqdm
 
+import cebra.models
+
 
 def _description(stats: Dict[str, float]):
     stats_str = [f"{key}: {value: .4f}" for key, value in stats.items()]
@@ -106,3 +111,337 @@ class ProgressBar:
         """
         if self.use_tqdm:
             self.iterator.set_description(_description(stats))
+
+
+def _has_compiled_call_impl() -> bool:
+    """Check if modules store their compiled call in ``_compiled_call_impl``.
+
+    :py:meth:`torch.nn.Module.compile` sets this private attribute, which is called by
+    :py:meth:`torch.nn.Module.__call__` instead of the forward pass. :py:func:`compile_module`
+    replaces it with a fallback to eager mode, so compilation is disabled if a PyTorch version
+    does not provide it.
+    """
+    # NOTE: torch.nn.Module.compile and _compiled_call_impl were added in PyTorch 2.2.
+    if torch.__version__ < "2.2":
+        return False
+    return (hasattr(torch.nn.Module, "compile") and
+            hasattr(torch.nn.Module, "_call_impl") and
+            hasattr(torch.nn.Module(), "_compiled_call_impl"))
+
+
+def _is_compile_supported() -> bool:
+    """Check if modules can be compiled in place with :py:func:`torch.compile`."""
+    if not _has_compiled_call_impl():
+        return False
+    try:
+        from torch import _dynamo
+    except ImportError:
+        return False
+    return _dynamo.is_dynamo_supported()
+
+
+def _compiler_errors() -> tuple:
+    """The exceptions raised by :py:func:`torch.compile` for failures of the compiler itself."""
+    try:
+        from torch._dynamo import exc
+    except ImportError:
+        return ()
+    return (exc.BackendCompilerFailed, exc.InternalTorchDynamoError)
+
+
+def _force_eager():
+    """Return a context in which functions compiled with :py:func:`torch.compile` run eagerly."""
+    # NOTE: torch.compiler.set_stance was added in PyTorch 2.6.
+    set_stance = getattr(torch.compiler, "set_stance", None)
+    if set_stance is None:
+        return contextlib.nullcontext()
+    return set_stance("force_eager")
+
+
+class CompiledFunction:
+    """Run a function compiled with :py:func:`torch.compile`, with a fallback to eager mode.
+
+    The function is compiled on its first call, so errors of unsupported compiler backends
+    (e.g., a missing C++ compiler) only surface when it is called. If the compiler fails,
+    a warning is shown and the function is run in eager mode, for this and all later calls.
+    All other errors, e.g. of the function itself, are raised.
+
+    Args:
+        function: The function to compile.
+        modules: Modules compiled with :py:func:`compile_module` which are called by the
+            function. If the compiler fails, the uncompiled modules are restored, and if the
+            compiler already failed for one of the modules, the function is run in eager mode.
+        kwargs: Keyword arguments passed to :py:func:`torch.compile`.
+    """
+
+    def __init__(self,
+                 function: Callable,
+                 modules: Iterable[torch.nn.Module] = (),
+                 **kwargs):
+        self.function = function
+        self.modules = list(modules)
+        self.kwargs = kwargs
+        self.compiled = torch.compile(function, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        if self.compiled is not None and not all(
+                _is_compiled(module) for module in self.modules):
+            self.compiled = None
+        if self.compiled is not None:
+            try:
+                return self.compiled(*args, **kwargs)
+            except _compiler_errors() as e:
+                warnings.warn(
+                    f"Compiling {getattr(self.function, '__qualname__', self.function)} "
+                    f"failed, falling back to eager mode: {e}")
+                self.compiled = None
+                for module in self.modules:
+                    _uncompile_module(module)
+        with _force_eager():
+            return self.function(*args, **kwargs)
+
+    def __getstate__(self):
+        return {
+            "function": self.function,
+            "modules": self.modules,
+            "kwargs": self.kwargs
+        }
+
+    def __setstate__(self, state):
+        self.__init__(state["function"],
+                      modules=state.get("modules", ()),
+                      **state["kwargs"])
+
+
+def _is_compiled(module: torch.nn.Module) -> bool:
+    """Check if the module or any of its submodules is compiled with :py:func:`compile_module`."""
+    return any(
+        getattr(child, "_compiled_call_impl", None) is not None
+        for child in module.modules())
+
+
+def _uncompile_module(module: torch.nn.Module):
+    """Restore the uncompiled forward pass of a module compiled with :py:func:`compile_module`."""
+    for child in module.modules():
+        if getattr(child, "_compiled_call_impl", None) is not None:
+            child._compiled_call_impl = None
+
+
+class _CompiledCall:
+    """The compiled call of a module, which restores the uncompiled module if the compiler fails.
+
+    See :py:func:`compile_module`.
+    """
+
+    def __init__(self, module: torch.nn.Module, **kwargs):
+        self.module = module
+        self.compiled = torch.compile(module._call_impl, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        try:
+            return self.compiled(*args, **kwargs)
+        except _compiler_errors() as e:
+            warnings.warn(
+                f"Compiling {type(self.module).__name__} failed, falling back to "
+                f"eager mode: {e}")
+            self.module._compiled_call_impl = None
+        return self.module._call_impl(*args, **kwargs)
+
+
+def compile_module(module: torch.nn.Module, **kwargs) -> bool:
+    """Compile the forward pass of a module in place with :py:meth:`torch.nn.Module.compile`.
+
+    In contrast to wrapping the module with :py:func:`torch.compile`, the parameter names
+    in the ``state_dict`` of the module are not changed, and the module can be pickled.
+    For :py:class:`torch.nn.ModuleList` instances, e.g. multisession models, each module
+    in the list is compiled. The module is compiled when it is first called, e.g. during
+    training or inference. If the compiler fails, a warning is shown and the uncompiled
+    module is restored, such that this and all later calls run in eager mode.
+
+    Args:
+        module: The module to compile.
+        kwargs: Keyword arguments passed to :py:func:`torch.compile`.
+
+    Returns:
+        ``True`` if the module was compiled, ``False`` if compilation is not supported by the
+        installed PyTorch version or platform. In this case, a warning is shown and the module
+        is not modified.
+    """
+    if not _is_compile_supported():
+        warnings.warn(
+            f"torch.compile is not supported with PyTorch {torch.__version__} on this "
+            f"platform, the module is run in eager mode.")
+        return False
+    if isinstance(module, torch.nn.ModuleList):
+        return all([compile_module(child, **kwargs) for child in module])
+    module.compile(**kwargs)
+    if getattr(module, "_compiled_call_impl", None) is None:
+        warnings.warn(
+            f"torch.nn.Module.compile did not set the compiled call of the module with "
+            f"PyTorch {torch.__version__}, the module is run in eager mode.")
+        return False
+    # NOTE: Replaces the compiled call set by Module.compile, which is dropped when
+    # pickling the module, with a fallback to eager mode.
+    module._compiled_call_impl = _CompiledCall(module, **kwargs)
+    return True
+
+
+class _CachedModule:
+    """A module whose calls are recorded by a :py:class:`GradientCache`."""
+
+    def __init__(self, module: torch.nn.Module, cache: "GradientCache"):
+        self.module = module
+        self.cache = cache
+
+    def __call__(self, inputs: torch.Tensor) -> torch.Tensor:
+        return self.cache.forward(self.module, inputs)
+
+    def __getattr__(self, name):
+        return getattr(self.module, name)
+
+
+class GradientCache:
+    """Compute exact large-batch gradients with memory bounded by the micro-batch size.
+
+    Contrastive losses like InfoNCE couple all samples of a batch through the negative
+    samples, so accumulating the gradients of smaller batches changes the loss. Instead,
+    the modules wrapped with :py:meth:`wrap` embed their inputs in micro-batches without
+    building a graph, and return the embeddings as leaf tensors. After the loss of the full
+    batch is backpropagated to these embeddings, :py:meth:`backward` runs the modules
+    again on each micro-batch and backpropagates the cached embedding gradients to the
+    parameters (Gao et al., 2021). The random number generator states are restored for the
+    second pass, so that e.g. dropout masks match between both passes.
+
+    Args:
+        micro_batch_size: The number of samples embedded at once.
+    """
+
+    def __init__(self, micro_batch_size: int):
+        self.micro_batch_size = micro_batch_size
+        self._calls = []
+
+    def wrap(self, module: torch.nn.Module):
+        """Record the calls of the module, or of each module of a :py:class:`torch.nn.ModuleList`.
+
+        The sessions of a :py:class:`cebra.models.MultisessionModel` are wrapped separately.
+        """
+        if isinstance(module,
+                      (torch.nn.ModuleList, cebra.models.MultisessionModel)):
+            return [self.wrap(child) for child in module]
+        return _CachedModule(module, self)
+
+    def forward(self, module: torch.nn.Module,
+                inputs: torch.Tensor) -> torch.Tensor:
+        """Embed the inputs in micro-batches without graph.
+
+        Returns:
+            The embedding as a leaf tensor which requires gradients.
+        """
+        rng_states = []
+        outputs = []
+        with torch.no_grad():
+            for micro_batch in inputs.split(self.micro_batch_size):
+                rng_states.append(_get_rng_state(micro_batch.device))
+                outputs.append(module(micro_batch))
+        output = torch.cat(outputs).requires_grad_(True)
+        self._calls.append((module, inputs, output, rng_states))
+        return output
+
+    def backward(self):
+        """Backpropagate the gradients of the cached embeddings through the modules."""
+        for module, inputs, output, rng_states in self._calls:
+            if output.grad is None:
+                continue
+            micro_batches = zip(inputs.split(self.micro_batch_size),
+                                output.grad.split(self.micro_batch_size),
+                                rng_states)
+            for micro_batch, grad, rng_state in micro_batches:
+                devices = [micro_batch.device] if micro_batch.is_cuda else []
+                with torch.random.fork_rng(devices=devices):
+                    _set_rng_state(micro_batch.device, rng_state)
+                    module(micro_batch).backward(grad)
+        self._calls = []
+
+
+def chunked_forward(function: Callable[[torch.Tensor], torch.Tensor],
+                    inputs: torch.Tensor,
+                    chunk_size: Optional[int],
+                    halo: int = 0) -> torch.Tensor:
+    """Embed a time series in chunks of time steps, with activation checkpointing.
+
+    The inputs are split along their last (time) dimension. Each chunk of ``chunk_size``
+    outputs is computed from ``chunk_size + halo`` input time steps, such that chunks of
+    a convolutional model with receptive field ``halo + 1`` overlap by ``halo`` steps,
+    and the concatenated outputs are the same as for the full input. If gradients are
+    required, the activations of each chunk are recomputed in the backward pass (see
+    :py:func:`torch.utils.checkpoint.checkpoint`), so that only the outputs of all chunks
+    and the activations of a single chunk are kept in memory.
+
+    Args:
+        function: The function computing the embedding of shape ``(time, features)`` from
+            an input of shape ``(..., time + halo)``.
+        inputs: The input time series, with time along the last dimension.
+        chunk_size: The number of outputs per chunk. If ``None``, the full input is
+            embedded at once, without checkpointing.
+        halo: The number of additional input time steps needed per chunk.
+
+    Returns:
+        The embeddings of all chunks, concatenated along the first dimension.
+    """
+    num_outputs = inputs.shape[-1] - halo
+    if chunk_size is None or num_outputs <= chunk_size:
+        return function(inputs)
+    outputs = []
+    for start in range(0, num_outputs, chunk_size):
+        num_chunk_outputs = min(chunk_size, num_outputs - start)
+        chunk = inputs.narrow(-1, start, num_chunk_outputs + halo)
+        if torch.is_grad_enabled():
+            output = torch.utils.checkpoint.checkpoint(function,
+                                                       chunk,
+                                                       use_reentrant=False)
+        else:
+            output = function(chunk)
+        # NOTE: Convolutional models squeeze the time dimension of a single output.
+        outputs.append(output.reshape(num_chunk_outputs, -1))
+    return torch.cat(outputs)
+
+
+def _get_rng_state(device: torch.device):
+    if device.type == "cuda":
+        return torch.get_rng_state(), torch.cuda.get_rng_state(device)
+    return torch.get_rng_state(), None
+
+
+def _set_rng_state(device: torch.device, state):
+    cpu_state, cuda_state = state
+    torch.set_rng_state(cpu_state)
+    if cuda_state is not None:
+        torch.cuda.set_rng_state(cuda_state, device)
+
+
+_PRECISIONS = ("fp32", "bf16")
+
+
+def autocast(device: str, precision: str = "fp32"):
+    """Return a context for running forward passes in the given precision.
+
+    With ``"bf16"``, operations like matrix multiplications and convolutions are run in
+    ``bfloat16`` with :py:func:`torch.autocast`, while parameters, gradients and
+    optimizer states stay in ``float32``. The criterions in :py:mod:`cebra.models.criterions`
+    compute similarities and the InfoNCE loss in ``float32`` within this context.
+
+    Args:
+        device: The device the forward passes are computed on, e.g. ``"cpu"`` or ``"cuda"``.
+        precision: Either ``"fp32"`` (default) or ``"bf16"``.
+
+    Returns:
+        A context manager, which does not modify the computation for ``"fp32"``.
+    """
+    if precision not in _PRECISIONS:
+        raise ValueError(
+            f"Invalid value for precision: expected one of {_PRECISIONS}, got {precision}."
+        )
+    if precision == "fp32":
+        return contextlib.nullcontext()
+    return torch.autocast(device_type=torch.device(device).type,
+                          dtype=torch.bfloat16)
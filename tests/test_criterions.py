@@ -19,6 +19,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import functools
+
 import numpy as np
 import pytest
 import torch
@@ -341,3 +343,100 @@ def test_infonce_gradients(seed):
             assert grad[0] is None
             assert grad[1] is not None
             assert torch.allclose(grad_ref[1], grad[1])
+
+
+def test_embedding_mse():
+    ref, pos, neg = setup()
+    mse = cebra_criterions.EmbeddingMSE()
+    loss, align, uniform = mse(ref, pos, neg)
+    assert torch.allclose(loss, ((ref - pos)**2).sum(1).mean())
+    assert torch.allclose(loss, align)
+    assert uniform == 0
+    loss, _, _ = mse(ref, ref, neg)
+    assert loss == 0
+
+
+@pytest.mark.parametrize("criterion", [
+    cebra_criterions.FixedCosineInfoNCE,
+    cebra_criterions.FixedEuclideanInfoNCE,
+    cebra_criterions.LearnableCosineInfoNCE,
+    cebra_criterions.LearnableEuclideanInfoNCE,
+    cebra_criterions.EmbeddingMSE,
+])
+def test_criterion_bfloat16(criterion):
+    rng = torch.Generator().manual_seed(42)
+    ref, pos, neg = (torch.randn(32, 8, generator=rng) for _ in range(3))
+    loss_fn = criterion()
+    expected = loss_fn(ref, pos, neg)
+
+    # The similarities and the loss are computed in float32 within autocast ...
+    with torch.autocast("cpu", dtype=torch.bfloat16):
+        outputs = loss_fn(ref, pos, neg)
+    for output, expected_output in zip(outputs, expected):
+        assert output.dtype == torch.float32
+        assert torch.allclose(output, expected_output)
+
+    # ... and for inputs in bfloat16.
+    outputs = loss_fn(ref.bfloat16(), pos.bfloat16(), neg.bfloat16())
+    for output, expected_output in zip(outputs, expected):
+        assert output.dtype == torch.float32
+        assert torch.allclose(output, expected_output, rtol=1e-2, atol=1e-2)
+
+
+@pytest.mark.parametrize("criterion", [
+    cebra_criterions.FixedCosineInfoNCE,
+    cebra_criterions.FixedEuclideanInfoNCE,
+    cebra_criterions.LearnableCosineInfoNCE,
+    cebra_criterions.LearnableEuclideanInfoNCE,
+    cebra_criterions.EmbeddingMSE,
+])
+def test_criterion_float64(criterion):
+    rng = torch.Generator().manual_seed(42)
+    ref, pos, neg = (torch.randn(32, 8, generator=rng, dtype=torch.float64)
+                     for _ in range(3))
+    loss_fn = criterion()
+    loss, align, uniform = loss_fn(ref, pos, neg)
+    for output in (loss, align, uniform):
+        assert output.dtype == torch.float64
+
+    # The loss is computed in float64, i.e. matches a reference up to float64 precision.
+    if criterion is cebra_criterions.EmbeddingMSE:
+        expected = (ref - pos).square().sum(dim=1).mean()
+    else:
+        pos_dist, neg_dist = loss_fn._distance(ref, pos, neg)
+        assert pos_dist.dtype == torch.float64
+        expected = (-pos_dist).mean() + torch.logsumexp(neg_dist, dim=1).mean()
+    assert torch.allclose(loss, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("tile_size", [1, 7, 32, 100])
+@pytest.mark.parametrize("criterion", [
+    cebra_criterions.FixedCosineInfoNCE,
+    cebra_criterions.FixedEuclideanInfoNCE,
+    cebra_criterions.LearnableCosineInfoNCE,
+    cebra_criterions.LearnableEuclideanInfoNCE,
+])
+def test_tiled_infonce(criterion, tile_size):
+    rng = torch.Generator().manual_seed(42)
+    ref, pos, neg = (torch.randn(64, 8, generator=rng) for _ in range(3))
+    loss_fn = criterion()
+
+    results = []
+    for forward in [
+            loss_fn,
+            functools.partial(loss_fn.tiled_forward, tile_size=tile_size)
+    ]:
+        inputs = [x.clone().requires_grad_(True) for x in (ref, pos, neg)]
+        outputs = forward(*inputs)
+        parameters = inputs + list(loss_fn.parameters())
+        grads = torch.autograd.grad(outputs[0], parameters)
+        results.append((outputs, grads))
+
+    (expected_outputs, expected_grads), (outputs, grads) = results
+    for output, expected_output in zip(outputs, expected_outputs):
+        assert torch.allclose(output, expected_output, atol=1e-5)
+    for grad, expected_grad in zip(grads, expected_grads):
+        assert torch.allclose(grad, expected_grad, atol=1e-6)
+
+    with pytest.raises(ValueError, match="Tile size"):
+        loss_fn.tiled_forward(ref, pos, neg, tile_size=0)
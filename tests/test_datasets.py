@@ -27,6 +27,7 @@ from unittest.mock import patch
 import numpy as np
 import pytest
 import requests
+import scipy.sparse
 import torch
 
 import cebra.data
@@ -66,6 +67,88 @@ def test_demo():
     assert len(batch) == len(indices)
 
 
+@pytest.mark.parametrize("storage_dtype",
+                         ["int8", "int16", "float16", "bfloat16"])
+def test_tensor_dataset_storage_dtype(storage_dtype):
+    counts = torch.randint(0, 100, (1000, 30), dtype=torch.int16)
+    continuous = torch.randn(1000, 2)
+    offset = cebra.data.Offset(5, 5)
+    reference = cebra.data.TensorDataset(counts.float(),
+                                         continuous=continuous,
+                                         offset=offset)
+    dataset = cebra.data.TensorDataset(counts,
+                                       continuous=continuous,
+                                       offset=offset,
+                                       storage_dtype=storage_dtype)
+    assert dataset.neural.dtype == cebra.data.datasets._STORAGE_DTYPES[
+        storage_dtype]
+    assert dataset.neural_scale is None
+
+    index = torch.randint(0, len(dataset), (64,))
+    batch = dataset[index]
+    assert batch.dtype == torch.float32
+    assert torch.equal(batch, reference[index])
+
+    # float data outside of the integer range is quantized per channel
+    neural = torch.randn(1000, 30) * torch.linspace(0.1, 10, 30)
+    reference = cebra.data.TensorDataset(neural,
+                                         continuous=continuous,
+                                         offset=offset)
+    dataset = cebra.data.TensorDataset(neural,
+                                       continuous=continuous,
+                                       offset=offset,
+                                       storage_dtype=storage_dtype)
+    batch = dataset[index]
+    assert batch.dtype == torch.float32
+    if storage_dtype.startswith("int"):
+        assert dataset.neural_scale.shape == (30,)
+        tolerance = dataset.neural_scale[None, :, None] / 2 + 1e-5
+    else:
+        tolerance = reference[index].abs() * 1e-2 + 1e-3
+    assert ((batch - reference[index]).abs() <= tolerance).all()
+
+    with pytest.raises(ValueError, match="storage dtype"):
+        cebra.data.TensorDataset(neural,
+                                 continuous=continuous,
+                                 storage_dtype="int4")
+
+
+@pytest.mark.parametrize("conversion", [
+    lambda x: scipy.sparse.csr_matrix(x),
+    lambda x: scipy.sparse.coo_matrix(x),
+    lambda x: torch.from_numpy(x).to_sparse_csr(),
+    lambda x: x,
+])
+def test_sparse_tensor_dataset(conversion):
+    counts = np.random.poisson(0.05, (1000, 30)).astype("int16")
+    continuous = torch.randn(1000, 2)
+    offset = cebra.data.Offset(5, 5)
+    reference = cebra.data.TensorDataset(torch.from_numpy(counts).float(),
+                                         continuous=continuous,
+                                         offset=offset)
+    dataset = cebra.data.datasets.SparseTensorDataset(conversion(counts),
+                                                      continuous=continuous,
+                                                      offset=offset)
+    assert dataset.neural.layout == torch.sparse_csr
+    assert dataset.neural.values().dtype == torch.int16
+    assert len(dataset) == len(reference)
+    assert dataset.input_dimension == reference.input_dimension
+
+    index = torch.randint(0, len(dataset), (64,))
+    batch = dataset[index]
+    assert batch.dtype == torch.float32
+    assert torch.equal(batch, reference[index])
+    assert torch.equal(dataset.upcast(dataset.neural),
+                       reference.upcast(reference.neural))
+
+    loader = cebra.data.ContinuousDataLoader(dataset,
+                                             num_steps=2,
+                                             batch_size=32,
+                                             conditional="time_delta")
+    for batch in loader:
+        assert batch.reference.shape == (32, 30, len(offset))
+
+
 @pytest.mark.requires_dataset
 def test_hippocampus():
     from cebra.datasets import hippocampus
@@ -139,6 +222,114 @@ def test_allen():
         break
 
 
+def _reference_pseudo_mouse(datadir, area):
+    """Serial construction of the pseudomouse, as in the original dataset class."""
+    import pandas as pd
+    import scipy.io
+
+    path = pathlib.Path(
+        datadir
+    ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / area
+    exp_containers = [int(file.stem) for file in path.glob("*.mat")]
+    summary = pd.read_csv(pathlib.Path(datadir) / "allen" / "data_summary.csv")
+    area_filtered = summary[(summary["exp"].isin(exp_containers)) &
+                            (summary["target"] == area)]
+
+    def _convert_to_nums(string):
+        return list(
+            map(
+                int,
+                string.replace("\n", "").replace("[", "").replace("]",
+                                                                  "").split()))
+
+    pseudo_mouse = []
+    for exp_container in set(area_filtered["exp"]):
+        neurons = summary[summary["exp"] == exp_container]["neurons"]
+        sessions = summary[summary["exp"] == exp_container]["session_type"]
+        seq_sessions = np.array(list(sessions)).argsort()
+        common_neurons = set.intersection(
+            *[set(_convert_to_nums(neurons.iloc[k])) for k in range(3)])
+        indices = [
+            sorted(
+                _convert_to_nums(neurons.iloc[k]).index(x)
+                for x in common_neurons)
+            for k in range(3)
+        ]
+        traces = scipy.io.loadmat(path / f"{exp_container}.mat")
+        for n, i in enumerate(seq_sessions):
+            pseudo_mouse.append(
+                traces["filtered_traces_days_events"][n, 0][indices[i], :])
+    return np.concatenate(pseudo_mouse)
+
+
+def _write_allen_calcium(datadir, area, num_containers=4, num_frames=20):
+    import pandas as pd
+    import scipy.io
+
+    rng = np.random.default_rng(0)
+    path = pathlib.Path(
+        datadir
+    ) / "allen" / "visual_drift" / "data" / "calcium_excitatory" / area
+    path.mkdir(parents=True)
+    rows = []
+    for exp_container in range(100, 100 + num_containers):
+        sessions = []
+        for session_type in rng.permutation(
+            ["three_session_A", "three_session_B", "three_session_C"]):
+            neurons = rng.choice(40, size=rng.integers(10, 30), replace=False)
+            rows.append(
+                dict(exp=exp_container,
+                     target=area,
+                     cre_line="Cux2-CreERT2",
+                     session_type=session_type,
+                     neurons=str(neurons)))
+            sessions.append(rng.random((len(neurons), num_frames)))
+        cells = np.empty((3, 1), dtype=object)
+        for n, session in enumerate(sessions):
+            cells[n, 0] = session
+        scipy.io.savemat(path / f"{exp_container}.mat",
+                         {"filtered_traces_days_events": cells})
+    pd.DataFrame(rows).to_csv(
+        pathlib.Path(datadir) / "allen" / "data_summary.csv")
+
+
+def test_allen_pseudo_mouse():
+    from cebra.datasets.allen import pseudo_mouse
+
+    with tempfile.TemporaryDirectory() as datadir:
+        _write_allen_calcium(datadir, "VISp")
+        reference = _reference_pseudo_mouse(datadir, "VISp")
+
+        data = pseudo_mouse.load_pseudo_mouse("VISp", datadir=datadir, n_jobs=2)
+        assert np.array_equal(data, reference)
+        cache_files = list(
+            (pathlib.Path(datadir) / "allen" / "cache").glob("*.npy"))
+        assert len(cache_files) == 1
+        assert not list(
+            (pathlib.Path(datadir) / "allen" / "cache").glob("*.tmp"))
+
+        with patch("scipy.io.loadmat") as loadmat:
+            cached = pseudo_mouse.load_pseudo_mouse("VISp", datadir=datadir)
+            loadmat.assert_not_called()
+        assert np.array_equal(cached, reference)
+
+        assert np.array_equal(
+            pseudo_mouse.load_pseudo_mouse("VISp",
+                                           datadir=datadir,
+                                           n_jobs=1,
+                                           cache=False), reference)
+
+        # Without a writable cache directory, the data is loaded without caching.
+        for cache_file in cache_files:
+            cache_file.unlink()
+        with patch("tempfile.mkstemp", side_effect=PermissionError):
+            assert np.array_equal(
+                pseudo_mouse.load_pseudo_mouse("VISp", datadir=datadir),
+                reference)
+        assert not list(
+            (pathlib.Path(datadir) / "allen" / "cache").glob("*.npy"))
+
+
 try:
     options = cebra.datasets.get_options("*")
     multisubject_options = cebra.datasets.get_options(
@@ -386,3 +577,67 @@ def test_download_file_wrong_content_disposition(filename, url,
                     expected_checksum=expected_checksum,
                     location=temp_dir,
                     file_name=filename)
+
+
+def _make_spikes(num_units, num_spikes, seed=0):
+    rng = np.random.default_rng(seed)
+    spike_time_index = np.sort(rng.integers(0, num_spikes, num_units))
+    spike_times = np.concatenate([
+        np.sort(unit)
+        for unit in np.split(rng.uniform(0, 100, num_spikes), spike_time_index)
+    ])
+    return spike_times, spike_time_index
+
+
+def test_make_neuropixel():
+    from cebra.datasets.allen import make_neuropixel
+
+    spike_times, spike_time_index = _make_spikes(50, 10000)
+    units = make_neuropixel._spikes_by_units(spike_times, spike_time_index)
+    expected_units = []
+    for n, t in enumerate(spike_time_index):
+        if n == 0:
+            expected_units.append(spike_times[:t])
+        elif n != len(spike_time_index) - 1:
+            expected_units.append(spike_times[spike_time_index[n - 1]:t])
+        else:
+            expected_units.append(spike_times[t:])
+    assert len(units) == len(expected_units)
+    for unit, expected in zip(units, expected_units):
+        assert np.array_equal(unit, expected)
+
+    rng = np.random.default_rng(0)
+    electrode_id = rng.permutation(np.repeat(np.arange(30), 2))[:40]
+    area = np.array([f"area{i % 4}" for i in range(len(electrode_id))],
+                    dtype=object)
+    peak_channel_id = rng.integers(0, 35, len(units))
+    expected_area = np.empty(len(peak_channel_id), dtype="object")
+    for n, i in enumerate(electrode_id):
+        expected_area[peak_channel_id == i] = area[n]
+    assert np.array_equal(
+        make_neuropixel._get_area(area, peak_channel_id, electrode_id),
+        expected_area)
+
+    bin_edges = np.arange(10, 90, 1 / 120)
+    units[3] = np.append(units[3], bin_edges[-1])
+    expected_counts = np.zeros((len(bin_edges) - 1, len(units)))
+    for i, unit_spikes in enumerate(units):
+        expected_counts[:, i] = np.histogram(unit_spikes, bin_edges)[0]
+    counts = make_neuropixel._spike_counts(bin_edges, units)
+    assert np.issubdtype(counts.dtype, np.integer)
+    assert np.array_equal(counts, expected_counts)
+
+
+@pytest.mark.benchmark
+def test_make_neuropixel_spike_counts(benchmark):
+    from cebra.datasets.allen import make_neuropixel
+
+    spike_times, spike_time_index = _make_spikes(500, 1_000_000)
+    bin_edges = np.arange(0, 100, 1 / 120)
+
+    def _preprocess():
+        units = make_neuropixel._spikes_by_units(spike_times, spike_time_index)
+        return make_neuropixel._spike_counts(bin_edges, units)
+
+    counts = benchmark(_preprocess)
+    assert counts.shape == (len(bin_edges) - 1, 500)
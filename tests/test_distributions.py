@@ -386,3 +386,33 @@ def test_new_delta_normal_with_multidimensional_index(delta, numerical_check):
         pytest.skip(
             "multivariate delta distribution can not accurately sample with the "
             "given parameters. TODO: Add a warning message for these cases.")
+
+
+@pytest.mark.parametrize("time_delta", [1, 5, 10])
+def test_streaming_time_delta(time_delta):
+    index = torch.randn(200, 3)
+    reference = cebra_distr.TimedeltaDistribution(index, time_delta)
+    distribution = cebra_distr.StreamingTimedeltaDistribution(
+        index[:3], time_delta)
+    for start, end in [(3, 4), (4, 30), (30, 120), (120, 200)]:
+        distribution.append(index[start:end])
+
+    assert torch.equal(distribution.data, index)
+    assert torch.allclose(distribution.time_difference,
+                          reference.time_difference)
+    query = torch.randn(50, 3)
+    assert torch.equal(distribution.index.search(query),
+                       reference.index.search(query))
+
+    sample = distribution.sample_prior(10)
+    assert sample.shape == (10,)
+    assert distribution.sample_conditional(sample).shape == (10,)
+
+    window = cebra_distr.StreamingTimedeltaDistribution(index[:50],
+                                                        time_delta,
+                                                        max_length=60)
+    window.append(index[50:])
+    assert torch.equal(window.data, index[-60:])
+    assert torch.allclose(window.time_difference,
+                          reference.time_difference[-60:])
+    assert (window.sample_prior(100) < 60).all()
@@ -20,6 +20,7 @@
 # limitations under the License.
 #
 import tempfile
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -214,3 +215,69 @@ def test_load_data_dlc_integration(filename, keypoints):
     embedding = model.transform(loaded_array)
     assert isinstance(loaded_array, np.ndarray)
     assert embedding.shape == (loaded_array.shape[0], 3)
+
+
+def _make_dlc_dataframe(num_frames, keypoints, likelihood=True, seed=0):
+    rng = np.random.default_rng(seed)
+    coords = ["x", "y", "likelihood"] if likelihood else ["x", "y"]
+    columns = pd.MultiIndex.from_product(
+        [["DLC_scorer"], keypoints, coords],
+        names=["scorer", "bodyparts", "coords"])
+    data = rng.uniform(0, 100, (num_frames, len(columns)))
+    if likelihood:
+        data[:, 2::3] = rng.random((num_frames, len(keypoints)))
+    data[rng.random(data.shape) < 0.05] = np.nan
+    return pd.DataFrame(data, columns=columns)
+
+
+def _load_data_framewise(loader, pcutoff=0.6):
+    """Reference implementation, interpolating the nan values frame by frame."""
+    coords = loader.dlc_df.columns.get_level_values("coords").unique().to_list()
+
+    def _frame(i):
+        return (loader.dlc_df.iloc[i].loc[loader.scorer].loc[
+            loader.keypoints_list].to_numpy().reshape(-1, len(coords)))
+
+    pred_xy = []
+    for i in range(len(loader.dlc_df)):
+        data = _frame(i)
+        if 0 < i < len(loader.dlc_df) - 1:
+            median = np.median(np.stack(
+                [_frame(i - 1)[:, :2],
+                 _frame(i + 1)[:, :2]]),
+                               axis=0)
+            if "likelihood" in coords:
+                data[data[:, 2] < pcutoff] = np.nan
+                data = data[:, :2]
+            nan_indices = np.argwhere(np.isnan(data))
+            data[nan_indices] = median[nan_indices]
+        pred_xy.append(data[:, :2].reshape(1, -1, 2))
+    array = np.concatenate(pred_xy, axis=0).reshape((len(loader.dlc_df), -1))
+    return array[~np.isnan(array).any(axis=1)]
+
+
+def _init_loader(df, keypoints):
+    with patch.object(cebra_dlc._DLCLoader,
+                      "read_dlc",
+                      return_value=(df, keypoints, "DLC_scorer")):
+        return cebra_dlc._DLCLoader("dlc.h5")
+
+
+@pytest.mark.parametrize("likelihood", [True, False])
+@pytest.mark.parametrize("keypoints", [["a", "b", "c"], ["c", "a"]])
+@pytest.mark.parametrize("num_frames", [1, 2, 3, 100])
+def test_load_data_interpolation(likelihood, keypoints, num_frames):
+    df = _make_dlc_dataframe(num_frames, ["a", "b", "c"], likelihood)
+    loader = _init_loader(df, keypoints)
+    expected = _load_data_framewise(loader)
+    loaded_array = loader.load_data()
+    assert loaded_array.shape == expected.shape
+    assert np.array_equal(loaded_array, expected)
+
+
+@pytest.mark.benchmark
+def test_load_data_speed(benchmark):
+    df = _make_dlc_dataframe(360_000, ["a", "b", "c", "d"])
+    loader = _init_loader(df, ["a", "b", "c", "d"])
+    loaded_array = benchmark(loader.load_data)
+    assert loaded_array.shape[1] == 8
@@ -26,7 +26,7 @@ import cebra
 import cebra.grid_search
 
 
-def test_grid_search():
+def test_grid_search(tmp_path):
     X = np.random.uniform(0, 1, (1000, 50))
     X2 = np.random.uniform(0, 1, (800, 40))
     y_c = np.random.uniform(0, 1, (1000, 10))
@@ -53,9 +53,9 @@ def test_grid_search():
     grid_search = cebra.grid_search.GridSearch()
     grid_search.fit_models(params=params_grid,
                            datasets=datasets,
-                           models_dir="saved_models")
+                           models_dir=tmp_path / "saved_models")
 
-    models, parameters = grid_search.load("saved_models")
+    models, parameters = grid_search.load(tmp_path / "saved_models")
     assert len(models) == len(parameters)
 
     best_model, best_model_name = grid_search.get_best_model(
@@ -19,7 +19,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from unittest.mock import patch
+
 import _util
+import h5py
+import joblib
+import numpy as np
+import pytest
 import torch
 from torch import nn
 
@@ -105,3 +111,71 @@ def test_has_device_nested():
     assert container.baz.baz.device.type == "cuda"
     assert container.foo.device.type == "cuda"
     _assert_device(container.bar, "cuda")
+
+
+def test_tensor_buffer():
+    chunks = [torch.randn(num_samples, 3) for num_samples in (5, 0, 1, 17, 4)]
+    buffer = cebra.io.TensorBuffer(chunks[0])
+    for chunk in chunks[1:]:
+        assert buffer.append(chunk) == 0
+    assert torch.equal(buffer.data, torch.cat(chunks))
+    assert len(buffer) == 27
+
+    window = cebra.io.TensorBuffer(chunks[0], max_length=8)
+    num_dropped = sum(window.append(chunk) for chunk in chunks[1:])
+    assert num_dropped == 27 - 8
+    assert torch.equal(window.data, torch.cat(chunks)[-8:])
+    assert len(window._storage) <= 2 * (8 + 17)
+
+    with pytest.raises(ValueError):
+        buffer.append(torch.randn(2, 4))
+    with pytest.raises(ValueError):
+        cebra.io.TensorBuffer(chunks[0], max_length=0)
+
+
+@pytest.mark.parametrize("extension", ["jl", "h5", "pt", "npz"])
+def test_file_key_value_dataset(tmp_path, extension):
+    data = {"neural": np.random.randn(100, 5), "behavior": np.arange(100)}
+    path = tmp_path / f"data.{extension}"
+    if extension == "jl":
+        joblib.dump(data, path)
+    elif extension == "h5":
+        with h5py.File(path, "w") as h5_file:
+            for key, value in data.items():
+                h5_file.create_dataset(key, data=value)
+    elif extension == "pt":
+        torch.save({
+            key: torch.from_numpy(value) for key, value in data.items()
+        }, path)
+    elif extension == "npz":
+        np.savez(path, **data)
+
+    dataset = cebra.io.FileKeyValueDataset(path)
+    assert set(dataset.keys) == set(data.keys())
+    # data is only loaded on first access
+    assert "neural" not in vars(dataset)
+    assert np.array_equal(dataset.neural, data["neural"])
+    assert "neural" in vars(dataset)
+    assert "behavior" not in vars(dataset)
+    assert np.array_equal(dataset.behavior, data["behavior"])
+    assert "neural" in repr(dataset)
+    with pytest.raises(AttributeError):
+        dataset.invalid_key
+
+
+def test_save_npy(tmp_path):
+    path = tmp_path / "cache" / "data.npy"
+    data = np.random.randn(100, 5)
+    assert cebra.io.save_npy(path, data)
+    assert np.array_equal(np.load(path), data)
+
+    # interrupted writes keep the previous file
+    with patch("numpy.save", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            cebra.io.save_npy(path, data + 1)
+    assert np.array_equal(np.load(path), data)
+    assert list(path.parent.iterdir()) == [path]
+
+    with patch("tempfile.mkstemp", side_effect=PermissionError):
+        assert not cebra.io.save_npy(tmp_path / "other.npy", data)
+    assert not (tmp_path / "other.npy").exists()
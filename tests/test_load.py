@@ -20,6 +20,7 @@
 # limitations under the License.
 #
 import itertools
+import os
 import pathlib
 import pickle
 import platform
@@ -33,6 +34,8 @@ import joblib as jl
 import numpy as np
 import openpyxl
 import pandas as pd
+import pyarrow
+import pyarrow.feather
 import pytest
 import scipy.io
 import torch
@@ -423,6 +426,58 @@ def generate_csv_empty_file(filename, dtype):
     _ = cebra_load.load(filename)
 
 
+#### PARQUET / ARROW ####
+def _write_arrow(filename, df):
+    if filename.endswith(".parquet"):
+        df.to_parquet(filename)
+    else:
+        pyarrow.feather.write_feather(pyarrow.Table.from_pandas(df),
+                                      filename,
+                                      compression="uncompressed")
+
+
+@register("parquet", "feather", "arrow", requires=("pyarrow",))
+def generate_arrow(filename, dtype):
+    A = np.arange(1000, dtype=dtype).reshape(10, 100)
+    _write_arrow(filename, pd.DataFrame(A,
+                                        columns=[str(i) for i in range(100)]))
+    loaded_A = cebra_load.load(filename)
+    return A, loaded_A
+
+
+@register("parquet", "feather", "arrow")
+def generate_arrow_columns(filename, dtype):
+    A = np.arange(1000, dtype=dtype).reshape(100, 10)
+    df = pd.DataFrame(A, columns=list("abcdefghij"))
+    _write_arrow(filename, df)
+    loaded_A = cebra_load.load(pathlib.Path(filename), columns=["h", "b"])
+    return A[:, [7, 1]], loaded_A
+
+
+@register("parquet", "feather", "arrow")
+def generate_arrow_single_column(filename, dtype):
+    A = np.arange(1000, dtype=dtype).reshape(100, 10)
+    _write_arrow(filename, pd.DataFrame(A, columns=list("abcdefghij")))
+    loaded_A = cebra_load.load(filename, columns=["c"])
+    # numeric columns are converted without copies
+    assert not loaded_A.flags.owndata
+    return A[:, [2]], loaded_A
+
+
+@register_error("parquet", "feather", "arrow")
+def generate_arrow_wrong_column(filename):
+    A = np.arange(1000).reshape(100, 10)
+    _write_arrow(filename, pd.DataFrame(A, columns=list("abcdefghij")))
+    _ = cebra_load.load(filename, columns=["a", "z"])
+
+
+@register_error("parquet", "feather", "arrow")
+def generate_arrow_key(filename):
+    A = np.arange(1000).reshape(100, 10)
+    _write_arrow(filename, pd.DataFrame(A, columns=list("abcdefghij")))
+    _ = cebra_load.load(filename, key="a")
+
+
 #### EXCEL ####
 @register("xls", "xlsx", "xlsm", requires=("pandas", "pd"))
 # TODO(celia): add the following extension:  "xlsb", "odf", "ods", "odt",
@@ -840,3 +895,202 @@ def test_module_not_installed(module_names, get_path, save_data, dtype):
     #    path = get_path(filename)
     #    with pytest.raises(ModuleNotFoundError, match="cebra[datasets]"):
     #        cebra.data.load.load(path)
+
+
+def test_load_lazy_npy():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = pathlib.Path(tmpdir, "data.npy")
+        A = np.arange(1000, dtype=np.float32).reshape(100, 10)
+        np.save(filename, A)
+        loaded_A = cebra_load.load(filename, lazy=True)
+        assert isinstance(loaded_A, np.memmap)
+        assert not loaded_A.flags.writeable
+        assert np.array_equal(loaded_A, A)
+
+
+@pytest.mark.parametrize("columns", [None, [3], [5, 1, 5, -1]])
+def test_load_lazy_h5(columns):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = pathlib.Path(tmpdir, "data.h5")
+        A = np.arange(1000, dtype=np.float32).reshape(100, 10)
+        B = np.arange(30).reshape(10, 3)
+        with h5py.File(filename, "w") as h5_file:
+            h5_file.create_dataset("neural", data=A)
+            h5_file.create_dataset("behavior", data=B)
+
+        expected = A if columns is None else A[:, columns]
+        loaded_A = cebra_load.load(filename,
+                                   key="neural",
+                                   columns=columns,
+                                   lazy=True)
+        assert isinstance(loaded_A, cebra_load.LazyH5Array)
+        assert loaded_A.shape == expected.shape
+        assert loaded_A.dtype == expected.dtype
+        assert len(loaded_A) == len(expected)
+
+        for index in [
+                5, -1, -100,
+                np.int64(99), (7, 0),
+                slice(10, 50, 3),
+                slice(None, None, -2),
+                slice(80, 5, -7),
+                slice(200, None, -1), (slice(2, 8), -1),
+                np.array([4, 2, 4, 99]),
+                np.array([[1, 2], [3, 4]]),
+                torch.tensor([8, 0]),
+                np.arange(100) % 3 == 0
+        ]:
+            assert np.array_equal(loaded_A[index], expected[index])
+        assert np.array_equal(np.asarray(loaded_A), expected)
+        assert np.array_equal(
+            cebra_load.load(filename, key="neural", columns=columns), expected)
+
+        # lazy arrays can be sent to other processes
+        loaded_A = pickle.loads(pickle.dumps(loaded_A))
+        assert np.array_equal(loaded_A[:10], expected[:10])
+        loaded_A.close()
+
+        # the file is only open between the first access and closing the array
+        with loaded_A:
+            assert loaded_A._file is None
+            assert np.array_equal(loaded_A[:10], expected[:10])
+            file = loaded_A._file
+            assert file
+        assert loaded_A._file is None and not file
+        loaded_A[:10]
+        file = loaded_A._file
+        pickle.dumps(loaded_A)
+        assert loaded_A._file is None and not file
+        loaded_A[:10]
+        file = loaded_A._file
+        del loaded_A
+        assert not file
+
+        # without key, the first array found in the file is loaded
+        loaded_B = cebra_load.load(filename, lazy=True)
+        assert np.array_equal(np.asarray(loaded_B), B)
+
+        with pytest.raises(AttributeError, match="column"):
+            cebra_load.load(filename, key="neural", columns=["a"], lazy=True)
+        with pytest.raises(IndexError):
+            loaded_B[np.array([10])]
+        for index in [10, -11]:
+            with pytest.raises(IndexError):
+                loaded_B[index]
+
+
+def test_load_cache(tmp_path, monkeypatch):
+    filename = tmp_path / "data.csv"
+    cache_dir = tmp_path / "cache"
+    A = np.arange(1000).reshape(100, 10)
+    pd.DataFrame(A).to_csv(filename, header=False, index=False)
+
+    loaded_A = cebra_load.load(filename, cache=cache_dir)
+    assert not isinstance(loaded_A, np.memmap)
+    assert not loaded_A.flags.writeable
+    assert len(list(cache_dir.glob("*.npy"))) == 1
+
+    with patch.object(cebra_load._CsvLoader, "load") as csv_load:
+        cached_A = cebra_load.load(filename, cache=cache_dir)
+        csv_load.assert_not_called()
+    assert type(cached_A) is type(loaded_A) is np.ndarray
+    assert not cached_A.flags.writeable
+    assert np.array_equal(cached_A, A)
+
+    # read-only caches are still used
+    with patch("os.utime", side_effect=PermissionError):
+        assert np.array_equal(cebra_load.load(filename, cache=cache_dir), A)
+    with patch("tempfile.mkstemp", side_effect=PermissionError):
+        assert np.array_equal(
+            cebra_load.load(tmp_path / "data.csv", cache=tmp_path / "other"), A)
+
+    # modified files are parsed again
+    pd.DataFrame(A + 1).to_csv(filename, header=False, index=False)
+    os.utime(filename, ns=(0, 0))
+    assert np.array_equal(cebra_load.load(filename, cache=cache_dir), A + 1)
+    assert len(list(cache_dir.glob("*.npy"))) == 2
+
+    # the least recently used entries are removed, but no other files
+    np.save(cache_dir / "user-data.npy", A)
+    os.utime(cache_dir / "user-data.npy", ns=(0, 0))
+    monkeypatch.setattr(cebra_load, "_CACHE_MAX_SIZE", A.nbytes + 1000)
+    other_filename = tmp_path / "other.csv"
+    pd.DataFrame(A).to_csv(other_filename, header=False, index=False)
+    _ = cebra_load.load(other_filename, cache=cache_dir)
+    cached_files = sorted(path.name for path in cache_dir.glob("*.npy"))
+    assert len(cached_files) == 2
+    assert cached_files[0].startswith("other-")
+    assert cached_files[1] == "user-data.npy"
+
+    # formats which are fast to load are not cached
+    np.save(tmp_path / "data.npy", A)
+    _ = cebra_load.load(tmp_path / "data.npy", cache=cache_dir)
+    assert len(list(cache_dir.glob("*.npy"))) == 2
+
+
+def test_load_cache_concurrent_writers(tmp_path):
+    filename = tmp_path / "data.csv"
+    A = np.arange(10000).reshape(1000, 10)
+    pd.DataFrame(A).to_csv(filename, header=False, index=False)
+    loaded = jl.Parallel(n_jobs=4, backend="threading")(
+        jl.delayed(cebra_load.load)(filename, cache=tmp_path / "cache")
+        for _ in range(8))
+    for loaded_A in loaded:
+        assert np.array_equal(loaded_A, A)
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+    assert len(list((tmp_path / "cache").glob("*.tmp"))) == 0
+
+
+def test_load_files(tmp_path):
+    arrays = [np.random.normal(size=(100 + i, 5)) for i in range(4)]
+    files = []
+    for i, A in enumerate(arrays[:2]):
+        files.append(tmp_path / f"session_{i}.npz")
+        np.savez(files[-1], neural=A, other=np.zeros(3))
+    for i, A in enumerate(arrays[2:], start=2):
+        files.append(tmp_path / f"session_{i}.csv")
+        pd.DataFrame(A).to_csv(files[-1], header=False, index=False)
+
+    loaded = cebra_load.load_files(files,
+                                   key=["neural", "neural", None, None],
+                                   n_jobs=2)
+    assert len(loaded) == len(arrays)
+    for A, loaded_A in zip(arrays, loaded):
+        assert np.allclose(A, loaded_A)
+
+    loaded = cebra_load.load_files(str(tmp_path / "session_*.npz"),
+                                   key="neural")
+    assert len(loaded) == 2
+    for A, loaded_A in zip(arrays, loaded):
+        assert np.array_equal(A, loaded_A)
+
+    with pytest.raises(FileNotFoundError):
+        cebra_load.load_files(str(tmp_path / "*.h5"))
+    with pytest.raises(ValueError, match="each"):
+        cebra_load.load_files(files, key=["neural"])
+
+
+def test_load_files_columns(tmp_path, monkeypatch):
+    A = np.arange(1000).reshape(100, 10)
+    df = pd.DataFrame(A, columns=list("abcdefghij"))
+    files = [tmp_path / "a.parquet", tmp_path / "b.parquet"]
+    for filename in files:
+        df.to_parquet(filename)
+
+    loaded = cebra_load.load_files(files, columns=["a", "c"])
+    for loaded_A in loaded:
+        assert np.array_equal(loaded_A, A[:, [0, 2]])
+    loaded = cebra_load.load_files(files, columns=[["b"], None])
+    assert np.array_equal(loaded[0], A[:, [1]])
+    assert np.array_equal(loaded[1], A)
+
+    # An empty list is passed to each file, and not treated as per-file columns.
+    selected_columns = []
+
+    def _load(file, key=None, columns=None, **kwargs):
+        selected_columns.append(columns)
+        return A
+
+    monkeypatch.setattr(cebra_load, "load", _load)
+    cebra_load.load_files(files, columns=[])
+    assert selected_columns == [[], []]
@@ -293,3 +293,32 @@ def test_multisession_loader(data_name, loader_initfunc, device):
         _check_attributes(batch, is_list=True)
         for session_batch in batch:
             assert len(session_batch.positive) == 32
+
+
+@pytest.mark.parametrize("conditional", ("time", "time_delta"))
+@pytest.mark.parametrize("max_length", (None, 150))
+def test_streaming(conditional, max_length):
+    dataset = cebra.data.StreamingDataset(torch.randn(100, 5),
+                                          continuous=torch.randn(100, 2),
+                                          max_length=max_length)
+    dataset.offset = cebra.data.Offset(5, 5)
+    loader = cebra.data.StreamingDataLoader(
+        dataset=dataset,
+        num_steps=10,
+        batch_size=8,
+        conditional=conditional,
+    )
+    distribution = loader.distribution
+    for _ in range(5):
+        loader.append(torch.randn(20, 5), torch.randn(20, 2))
+    assert loader.distribution is distribution
+    assert len(dataset) == (200 if max_length is None else max_length)
+    assert len(dataset.continuous_index) == len(dataset)
+    for batch in loader:
+        assert batch.reference.shape == (8, 5, 10)
+        assert batch.positive.shape == (8, 5, 10)
+
+    with pytest.raises(ValueError):
+        loader.append(torch.randn(20, 4), torch.randn(20, 2))
+    with pytest.raises(ValueError):
+        loader.append(torch.randn(20, 5), torch.randn(10, 2))
@@ -19,6 +19,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import copy
 import itertools
 
 import pytest
@@ -26,6 +27,7 @@ import torch
 from torch import nn
 
 import cebra.models
+import cebra.models.inference
 import cebra.models.model
 import cebra.registry
 
@@ -161,3 +163,362 @@ def test_version_check():
         assert len(cebra.models.get_options("*dropout*")) == 0
     else:
         assert len(cebra.models.get_options("*dropout*")) > 0
+
+
+def _is_streamable(model):
+    return (isinstance(model, cebra.models.model._OffsetModel) and
+            not isinstance(model, cebra.models.ResampleModelMixin))
+
+
+@pytest.mark.parametrize("model_name", cebra.models.get_options())
+def test_streaming_encoder(model_name):
+    model = cebra.models.init(model_name,
+                              num_neurons=5,
+                              num_output=3,
+                              num_units=4)
+    if not _is_streamable(model):
+        with pytest.raises((TypeError, ValueError)):
+            cebra.models.StreamingEncoder(model)
+        return
+
+    model.eval()
+    offset = model.get_offset()
+    inputs = torch.randn((100, 5))
+    with torch.no_grad():
+        if isinstance(model, cebra.models.ConvolutionalModelMixin):
+            expected = model(inputs.T[None])[0].T
+        else:
+            expected = model(inputs)
+
+    encoder = cebra.models.StreamingEncoder(model)
+    for _ in range(2):
+        outputs = [encoder.step(sample) for sample in inputs]
+        assert all(output is None for output in outputs[:len(offset) - 1])
+        outputs = torch.stack(outputs[len(offset) - 1:])
+        assert outputs.shape == expected.shape
+        assert torch.allclose(outputs, expected, atol=1e-5)
+        encoder.reset()
+
+    with pytest.raises(ValueError, match="shape"):
+        encoder.step(torch.randn(6))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("model_name", ["offset10-model", "offset36-model"])
+def test_streaming_encoder_latency(benchmark, model_name):
+    model = cebra.models.init(model_name,
+                              num_neurons=100,
+                              num_output=8,
+                              num_units=32).eval()
+    encoder = cebra.models.StreamingEncoder(model)
+    for sample in torch.randn((len(model.get_offset()), 100)):
+        encoder.step(sample)
+
+    output = benchmark(encoder.step, torch.randn(100))
+    assert output.shape == (8,)
+
+
+class _BatchNormModel(cebra.models.model._OffsetModel,
+                      cebra.models.ConvolutionalModelMixin):
+
+    def __init__(self, num_neurons, num_units, num_output):
+        super().__init__(
+            nn.Conv1d(num_neurons, num_units, 2),
+            nn.BatchNorm1d(num_units),
+            nn.GELU(),
+            nn.Dropout1d(p=0.5),
+            nn.Conv1d(num_units, num_output, 3),
+            num_input=num_neurons,
+            num_output=num_output,
+        )
+
+    def get_offset(self):
+        return cebra.data.Offset(2, 2)
+
+
+@pytest.mark.parametrize(
+    "model_name",
+    ["offset1-model", "offset5-model", "offset10-model", "offset36-model"])
+def test_multisession_model(model_name):
+    num_neurons = [20, 30, 7]
+    model = cebra.models.MultisessionModel.init(model_name,
+                                                num_neurons=num_neurons,
+                                                num_units=16,
+                                                num_output=4)
+    assert len(model) == 3
+    offset = model.trunk.get_offset()
+    assert (model.get_offset().left, model.get_offset().right) == (offset.left,
+                                                                   offset.right)
+    with pytest.raises(IndexError):
+        model[3]
+
+    separate = nn.ModuleList([
+        cebra.models.init(model_name,
+                          num_neurons=num_neurons_,
+                          num_units=16,
+                          num_output=4) for num_neurons_ in num_neurons
+    ])
+    assert sum(parameter.numel() for parameter in model.parameters()) < sum(
+        parameter.numel() for parameter in separate.parameters())
+
+    inputs = []
+    for session, num_neurons_ in zip(model, num_neurons):
+        assert session.num_input == num_neurons_
+        assert (session.get_offset().left,
+                session.get_offset().right) == (offset.left, offset.right)
+        assert isinstance(session,
+                          cebra.models.ConvolutionalModelMixin) == isinstance(
+                              model.trunk, cebra.models.ConvolutionalModelMixin)
+        if isinstance(session, cebra.models.ConvolutionalModelMixin):
+            inputs.append(torch.randn(8, num_neurons_, len(offset)))
+        else:
+            inputs.append(torch.randn(8, num_neurons_))
+
+    model.eval()
+    output = model(inputs)
+    assert output.shape == (3, 8, 4)
+    for session_id, inp in enumerate(inputs):
+        assert torch.allclose(output[session_id],
+                              model[session_id](inp),
+                              atol=1e-5)
+
+    # The padded weights of the input layer are not trained.
+    output.sum().backward()
+    weight = model.input_layer.weight
+    for session_id, num_neurons_ in enumerate(num_neurons):
+        assert (weight[session_id, num_neurons_:] == 0).all()
+        assert (weight.grad[session_id, num_neurons_:] == 0).all()
+
+
+def test_strip_training_layers():
+    model = _BatchNormModel(5, 4, 3)
+    with torch.no_grad():
+        for _ in range(5):
+            model(torch.randn(8, 5, 10))
+    model.eval()
+
+    stripped = cebra.models.inference.strip_training_layers(model)
+    assert not any(
+        isinstance(module, (nn.BatchNorm1d, nn.Dropout1d))
+        for module in stripped.modules())
+    assert any(isinstance(module, nn.Dropout1d) for module in model.modules())
+
+    inputs = torch.randn(2, 5, 100)
+    with torch.no_grad():
+        assert torch.allclose(stripped(inputs), model(inputs), atol=1e-5)
+
+
+@pytest.mark.parametrize("quantization", [None, "dynamic", "static"])
+@pytest.mark.parametrize("model_name", cebra.models.get_options())
+def test_inference_export(model_name, quantization, tmp_path):
+    model = cebra.models.init(model_name,
+                              num_neurons=5,
+                              num_output=3,
+                              num_units=4)
+    if not isinstance(model, cebra.models.model._OffsetModel):
+        with pytest.raises(TypeError):
+            cebra.models.inference.export(model)
+        return
+
+    offset = model.get_offset()
+    if isinstance(model, cebra.models.ConvolutionalModelMixin):
+        inputs = torch.randn(2, 5, len(offset) + 50)
+    elif isinstance(model, cebra.models.ResampleModelMixin):
+        inputs = torch.randn(100, 5, len(offset))
+    else:
+        inputs = torch.randn(100, 5)
+
+    exported = cebra.models.inference.export(model,
+                                             quantization=quantization,
+                                             calibration_data=inputs)
+    torch.jit.save(exported, tmp_path / "model.pt")
+    loaded = torch.jit.load(tmp_path / "model.pt")
+    assert loaded.offset.tolist() == [offset.left, offset.right]
+    assert int(loaded.num_input) == 5
+    assert int(loaded.num_output) == 3
+
+    drift = cebra.models.inference.embedding_drift(model, loaded, inputs)
+    if quantization is None:
+        assert drift["max_abs_error"] < 1e-5
+    else:
+        assert drift["cosine_mean"] > 0.95
+
+
+def test_inference_quantize_invalid():
+    model = cebra.models.init("offset10-model",
+                              num_neurons=5,
+                              num_output=3,
+                              num_units=4)
+    with pytest.raises(ValueError, match="mode"):
+        cebra.models.inference.quantize(model, "float16")
+    with pytest.raises(ValueError, match="calibration_data"):
+        cebra.models.inference.quantize(model, "static")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("quantization", ["fp32", None, "dynamic", "static"])
+def test_inference_export_throughput(benchmark, quantization):
+    model = cebra.models.init("offset10-model",
+                              num_neurons=100,
+                              num_output=8,
+                              num_units=32).eval()
+    inputs = torch.randn(1, 100, 10000)
+    if quantization != "fp32":
+        model = cebra.models.inference.export(model,
+                                              quantization=quantization,
+                                              calibration_data=inputs)
+
+    with torch.no_grad():
+        output = benchmark(model, inputs)
+    assert output.shape == (1, 8, 9991)
+
+
+@pytest.mark.parametrize("model_name", ["offset10-model", "offset36-model"])
+def test_lowrank_model(model_name):
+    dense = cebra.models.init(model_name,
+                              num_neurons=1000,
+                              num_output=8,
+                              num_units=32)
+    lowrank = cebra.models.init(f"{model_name}-lowrank16",
+                                num_neurons=1000,
+                                num_output=8,
+                                num_units=32)
+    assert lowrank.rank == 16
+    assert lowrank.num_input == 1000
+    assert len(lowrank.get_offset()) == len(dense.get_offset())
+    num_parameters = [
+        sum(parameter.numel()
+            for parameter in model.parameters())
+        for model in [lowrank, dense]
+    ]
+    # Only the input layer differs between both models.
+    num_input_parameters = [
+        sum(parameter.numel() for parameter in lowrank.net[:2].parameters()),
+        sum(parameter.numel() for parameter in dense.net[0].parameters()),
+    ]
+    assert num_parameters[1] - num_parameters[0] == num_input_parameters[
+        1] - num_input_parameters[0]
+    assert num_input_parameters[0] < num_input_parameters[1] // 3
+    assert lowrank.net[0].weight.shape == (16, 1000, 1)
+
+    inputs = torch.randn(4, 1000, len(dense.get_offset()))
+    assert lowrank(inputs).shape == dense(inputs).shape == (4, 8)
+
+    with pytest.raises(ValueError, match="Rank"):
+        cebra.models.model.Offset10LowRankModel(num_neurons=1000,
+                                                num_output=8,
+                                                num_units=32,
+                                                rank=0)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("model_name",
+                         ["offset10-model", "offset10-model-lowrank16"])
+def test_lowrank_model_train_step(benchmark, model_name):
+    model = cebra.models.init(model_name,
+                              num_neurons=10000,
+                              num_output=8,
+                              num_units=32)
+    criterion = cebra.models.FixedCosineInfoNCE()
+    optimizer = torch.optim.Adam(model.parameters(), lr=3e-4)
+    inputs = torch.randn(3, 512, 10000, 10)
+
+    def _step():
+        optimizer.zero_grad()
+        loss, _, _ = criterion(*[model(inp) for inp in inputs])
+        loss.backward()
+        optimizer.step()
+
+    benchmark(_step)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("model_name",
+                         ["offset10-model", "offset10-model-lowrank16"])
+def test_lowrank_model_transform_throughput(benchmark, model_name):
+    model = cebra.models.init(model_name,
+                              num_neurons=10000,
+                              num_output=8,
+                              num_units=32).eval()
+    inputs = torch.randn(1, 10000, 5000)
+
+    with torch.no_grad():
+        output = benchmark(model, inputs)
+    assert output.shape == (1, 8, 4991)
+
+
+@pytest.mark.parametrize("segment_size", [1, 4])
+@pytest.mark.parametrize("model_name", [
+    "offset1-model", "offset10-model", "offset36-model",
+    "offset36-model-more-dropout", "offset10-model-lowrank16"
+])
+def test_gradient_checkpointing(model_name, segment_size):
+    model = cebra.models.init(model_name,
+                              num_neurons=10,
+                              num_output=8,
+                              num_units=16)
+    if isinstance(model, cebra.models.ConvolutionalModelMixin):
+        inputs = torch.randn(32, 10, len(model.get_offset()))
+    else:
+        inputs = torch.randn(32, 10)
+    checkpointed = copy.deepcopy(model)
+    checkpointed.set_gradient_checkpointing(segment_size=segment_size)
+    assert checkpointed.gradient_checkpointing
+    assert not model.gradient_checkpointing
+
+    results = []
+    for model_ in [model, checkpointed]:
+        # NOTE: Dropout masks are the same in the recomputed forward pass.
+        torch.manual_seed(0)
+        output = model_(inputs)
+        output.sum().backward()
+        results.append(
+            (output, [parameter.grad for parameter in model_.parameters()]))
+    (expected_output, expected_grads), (output, grads) = results
+    assert torch.allclose(output, expected_output, atol=1e-6)
+    for grad, expected_grad in zip(grads, expected_grads):
+        assert torch.allclose(grad, expected_grad, atol=1e-6)
+
+    memory = cebra.models.model.activation_memory(model, inputs)
+    checkpointed_memory = cebra.models.model.activation_memory(
+        checkpointed, inputs)
+    has_skip = any(
+        isinstance(layer, cebra.models.layers._Skip) for layer in model.net)
+    if has_skip:
+        assert checkpointed_memory < memory
+    else:
+        assert checkpointed_memory == memory
+
+    # Checkpointing is only used for training.
+    model.eval()
+    checkpointed.eval()
+    assert cebra.models.model.activation_memory(
+        checkpointed,
+        inputs) == cebra.models.model.activation_memory(model, inputs)
+
+    with pytest.raises(ValueError, match="Segment size"):
+        checkpointed.set_gradient_checkpointing(segment_size=0)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("segment_size", [None, 1, 4])
+def test_gradient_checkpointing_train_step(benchmark, segment_size):
+    model = cebra.models.init("offset36-model",
+                              num_neurons=100,
+                              num_output=8,
+                              num_units=64)
+    if segment_size is not None:
+        model.set_gradient_checkpointing(segment_size=segment_size)
+    criterion = cebra.models.FixedCosineInfoNCE()
+    optimizer = torch.optim.Adam(model.parameters(), lr=3e-4)
+    inputs = torch.randn(3, 512, 100, 36)
+    benchmark.extra_info["activation_memory"] = sum(
+        cebra.models.model.activation_memory(model, inp) for inp in inputs)
+
+    def _step():
+        optimizer.zero_grad()
+        loss, _, _ = criterion(*[model(inp) for inp in inputs])
+        loss.backward()
+        optimizer.step()
+
+    benchmark(_step)
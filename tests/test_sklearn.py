@@ -37,6 +37,7 @@ import cebra.integrations.sklearn.cebra as cebra_sklearn_cebra
 import cebra.integrations.sklearn.dataset as cebra_sklearn_dataset
 import cebra.integrations.sklearn.utils as cebra_sklearn_utils
 import cebra.models
+import cebra.models.inference
 import cebra.models.model
 from cebra.models import parametrize
 
@@ -604,6 +605,48 @@ def test_partial_fit(model_architecture, device):
         assert len(cebra_partial_model.state_dict_["log"][k]) == max_iterations
 
 
+@pytest.mark.parametrize("with_labels", [True, False])
+def test_partial_fit_append(with_labels):
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        time_offsets=10,
+        max_iterations=5,
+        output_dimension=4,
+        batch_size=42,
+    )
+
+    X = np.random.uniform(0, 1, (300, 20)).astype(np.float32)
+    y = np.random.uniform(0, 1, (300, 2)).astype(np.float32)
+    labels = lambda start, end: (y[start:end],) if with_labels else ()
+
+    cebra_model.partial_fit(X[:100], *labels(0, 100), append=True)
+    solver, model, loader, _ = cebra_model.state_
+    optimizer = solver.optimizer
+    for start in range(100, 300, 50):
+        cebra_model.partial_fit(X[start:start + 50],
+                                *labels(start, start + 50),
+                                append=True)
+        assert cebra_model.state_[2] is loader
+        assert cebra_model.solver_.optimizer is optimizer
+    assert len(loader.dataset) == 300
+    assert np.allclose(loader.dataset.neural.numpy(), X)
+    assert len(cebra_model.state_dict_["loss"]) == 25
+    assert cebra_model.transform(X).shape == (300, 4)
+
+    # Chunks shorter than the receptive field of the model can be appended.
+    assert len(cebra_model.offset_) == 10
+    cebra_model.partial_fit(X[:1], *labels(0, 1), append=True)
+    cebra_model.partial_fit(X[:5], *labels(0, 5), append=True)
+    assert len(loader.dataset) == 306
+
+    with pytest.raises(ValueError):
+        cebra_model.partial_fit(X[:50, :10], *labels(0, 50), append=True)
+
+    cebra_model.fit(X).partial_fit(X)
+    with pytest.raises(ValueError):
+        cebra_model.partial_fit(X, append=True)
+
+
 @_util.parametrize_slow(
     arg_names="model_architecture,device",
     fast_arguments=list(
@@ -792,6 +835,593 @@ def test_sklearn_full(model_architecture, device, pad_before_transform):
                                    len(cebra_model.model_.get_offset()) + 1, 4)
 
 
+@pytest.mark.parametrize("model_architecture",
+                         ["offset1-model", "offset10-model", "offset36-model"])
+@pytest.mark.parametrize("pad_before_transform", [True, False])
+def test_sklearn_transform_batched(tmp_path, model_architecture,
+                                   pad_before_transform):
+    X = np.random.uniform(0, 1, (523, 12)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture=model_architecture,
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        pad_before_transform=pad_before_transform,
+        output_dimension=4,
+    ).fit(X)
+    embedding = cebra_model.transform(X)
+
+    for batch_size in [7, 100, 10000]:
+        batched_embedding = cebra_model.transform(X, batch_size=batch_size)
+        assert batched_embedding.dtype == embedding.dtype
+        assert np.array_equal(batched_embedding, embedding)
+    assert np.allclose(cebra_model.transform(X, batch_size=1),
+                       embedding,
+                       atol=1e-5)
+    assert cebra_model.transform(X.astype("float64"),
+                                 batch_size=50).dtype == "float64"
+
+    out = np.lib.format.open_memmap(tmp_path / "embedding.npy",
+                                    mode="w+",
+                                    dtype="float32",
+                                    shape=embedding.shape)
+    assert cebra_model.transform(X, batch_size=50, out=out) is out
+    assert np.array_equal(out, embedding)
+
+    with pytest.raises(ValueError, match="output shape"):
+        cebra_model.transform(X, out=np.empty((10, 4)))
+    with pytest.raises(ValueError, match="batch_size"):
+        cebra_model.transform(X, batch_size=0)
+
+
+def test_sklearn_transform_parallel(tmp_path):
+    X = np.random.uniform(0, 1, (1001, 12)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+    ).fit(X)
+    embedding = cebra_model.transform(X)
+
+    for n_jobs, batch_size in [(2, None), (3, 100), (-1, None)]:
+        parallel_embedding = cebra_model.transform(X,
+                                                   batch_size=batch_size,
+                                                   n_jobs=n_jobs)
+        assert isinstance(parallel_embedding, np.ndarray)
+        assert parallel_embedding.dtype == embedding.dtype
+        assert np.allclose(parallel_embedding, embedding, atol=1e-5)
+
+    out = np.lib.format.open_memmap(tmp_path / "embedding.npy",
+                                    mode="w+",
+                                    dtype="float32",
+                                    shape=embedding.shape)
+    assert cebra_model.transform(X, out=out, n_jobs=2) is out
+    assert np.allclose(np.load(tmp_path / "embedding.npy"),
+                       embedding,
+                       atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "model_architecture",
+    ["offset40-model-4x-subsample", "offset20-model-4x-subsample"])
+@pytest.mark.parametrize("pad_before_transform", [True, False])
+def test_sklearn_transform_resample(tmp_path, model_architecture,
+                                    pad_before_transform):
+    X = np.random.uniform(0, 1, (1001, 12)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture=model_architecture,
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        pad_before_transform=pad_before_transform,
+        output_dimension=4,
+    ).fit(X)
+    embedding = cebra_model.transform(X)
+    receptive_field = len(cebra_model.model_.get_offset())
+    if pad_before_transform:
+        assert embedding.shape == (-(-len(X) // 4), 4)
+    else:
+        assert embedding.shape == ((len(X) - receptive_field) // 4 + 1, 4)
+
+    for batch_size, n_jobs in [(7, None), (64, None), (1, None), (None, 2),
+                               (50, 2)]:
+        assert np.allclose(cebra_model.transform(X,
+                                                 batch_size=batch_size,
+                                                 n_jobs=n_jobs),
+                           embedding,
+                           atol=1e-5)
+
+    out = np.lib.format.open_memmap(tmp_path / "embedding.npy",
+                                    mode="w+",
+                                    dtype="float32",
+                                    shape=embedding.shape)
+    assert cebra_model.transform(X, batch_size=50, out=out, n_jobs=2) is out
+    assert np.allclose(out, embedding, atol=1e-5)
+    with pytest.raises(ValueError, match="output shape"):
+        cebra_model.transform(X, out=np.empty((len(X), 4)))
+
+
+@pytest.mark.parametrize("n_jobs", [None, 2])
+def test_sklearn_transform_multisession(n_jobs):
+    X = [
+        np.random.uniform(0, 1, (500 + 100 * i, 10 + i)).astype("float32")
+        for i in range(3)
+    ]
+    y = [np.random.uniform(0, 1, (len(X_session), 2)) for X_session in X]
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+    ).fit(X, y)
+
+    embeddings = cebra_model.transform(X, n_jobs=n_jobs)
+    assert len(embeddings) == len(X)
+    for session_id, (X_session, embedding) in enumerate(zip(X, embeddings)):
+        assert np.allclose(embedding,
+                           cebra_model.transform(X_session,
+                                                 session_id=session_id),
+                           atol=1e-5)
+
+    with pytest.raises(RuntimeError, match="session_id"):
+        cebra_model.transform(X, session_id=0)
+    with pytest.raises(ValueError, match="number of sessions"):
+        cebra_model.transform(X[:2])
+
+
+def test_sklearn_transform_list_single_session():
+    X = np.random.uniform(0, 1, (500, 10)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+    ).fit(X)
+
+    # A list of lists is a single input for single session models.
+    embedding = cebra_model.transform(X.tolist())
+    assert isinstance(embedding, np.ndarray)
+    assert embedding.shape == (len(X), 4)
+    assert np.allclose(embedding, cebra_model.transform(X), atol=1e-3)
+
+
+@pytest.mark.parametrize("quantization", [None, "dynamic", "static"])
+@pytest.mark.parametrize("model_architecture",
+                         ["offset1-model", "offset10-model"])
+def test_sklearn_export(model_architecture, quantization, tmp_path):
+    X = np.random.uniform(0, 1, (500, 10)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture=model_architecture,
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+    ).fit(X)
+
+    with pytest.raises(sklearn.exceptions.NotFittedError):
+        cebra_sklearn_cebra.CEBRA().export()
+    if quantization == "static":
+        with pytest.raises(ValueError, match="calibration_data"):
+            cebra_model.export(quantization=quantization)
+
+    filename = tmp_path / "model.pt"
+    cebra_model.export(filename, quantization=quantization, X=X)
+    exported = torch.jit.load(filename)
+    offset = cebra_model.model_.get_offset()
+    assert exported.offset.tolist() == [offset.left, offset.right]
+
+    inputs = torch.from_numpy(X)
+    if model_architecture == "offset10-model":
+        inputs = inputs.T[None]
+    drift = cebra.models.inference.embedding_drift(cebra_model.model_, exported,
+                                                   inputs)
+    assert drift["cosine_mean"] > 0.95
+
+
+@pytest.mark.parametrize("shared_trunk", [False, True])
+def test_sklearn_export_multisession(shared_trunk):
+    X = [
+        np.random.uniform(0, 1, (500, 10 + i)).astype("float32")
+        for i in range(2)
+    ]
+    y = [np.random.uniform(0, 1, (len(X_session), 2)) for X_session in X]
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+        shared_trunk=shared_trunk,
+    ).fit(X, y)
+
+    with pytest.raises(RuntimeError, match="session_id"):
+        cebra_model.export()
+    for session_id, X_session in enumerate(X):
+        exported = cebra_model.export(quantization="static",
+                                      X=X_session,
+                                      session_id=session_id)
+        assert int(exported.num_input) == X_session.shape[1]
+
+        exported = cebra_model.export(session_id=session_id)
+        inputs = torch.from_numpy(X_session).T[None]
+        with torch.no_grad():
+            expected = cebra_model.model_[session_id].eval()(inputs)
+        assert torch.allclose(exported(inputs), expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("loss", ["infonce", "mse"])
+def test_sklearn_distill(loss, tmp_path):
+    X = np.random.uniform(0, 1, (1000, 10)).astype("float32")
+    teacher = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset36-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+    ).fit(X)
+    student = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        num_hidden_units=8,
+        max_iterations=50,
+        batch_size=128,
+        learning_rate=1e-2,
+        device="cpu",
+        output_dimension=4,
+    )
+
+    student.distill(teacher, X, loss=loss)
+    assert student.solver_name_ == "single-session"
+    assert len(student.solver_.log["total"]) == 50
+    assert len(student.offset_) == 10
+    embedding = student.transform(X)
+    assert embedding.shape == (len(X), 4)
+
+    student.save(tmp_path / "student.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "student.pt",
+                                            weights_only=False)
+    assert np.allclose(loaded.transform(X), embedding, atol=1e-5)
+
+    if loss == "mse":
+        teacher_embedding = teacher.transform(X)
+        untrained = cebra_sklearn_cebra.CEBRA(
+            model_architecture="offset10-model",
+            num_hidden_units=8,
+            max_iterations=1,
+            batch_size=128,
+            device="cpu",
+            output_dimension=4,
+        ).fit(X)
+        assert (np.square(embedding - teacher_embedding).sum()
+                < np.square(untrained.transform(X) - teacher_embedding).sum())
+
+    with pytest.raises(ValueError, match="loss"):
+        student.distill(teacher, X, loss="l1")
+    with pytest.raises(ValueError, match="output dimension"):
+        cebra_sklearn_cebra.CEBRA(output_dimension=3,
+                                  batch_size=32).distill(teacher, X)
+    with pytest.raises(ValueError, match="batch_size"):
+        cebra_sklearn_cebra.CEBRA(output_dimension=4).distill(teacher, X)
+    with pytest.raises(sklearn.exceptions.NotFittedError):
+        student.distill(cebra_sklearn_cebra.CEBRA(), X)
+
+
+@pytest.mark.parametrize("compile", [True, "step"])
+def test_sklearn_compile(compile, tmp_path):
+    X = np.random.uniform(0, 1, (1000, 10)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+        compile=compile,
+        compile_kwargs=(("backend", "eager"),),
+    ).fit(X)
+    assert cebra_model.solver_.compile == compile
+    assert cebra_model.solver_.compile_kwargs == {"backend": "eager"}
+
+    embedding = cebra_model.transform(X)
+    with torch.no_grad():
+        expected = cebra_model.model_._call_impl(
+            torch.from_numpy(X).T[None]).squeeze(0).T.numpy()
+    assert np.allclose(embedding[5:-4], expected, atol=1e-5)
+    assert np.allclose(cebra_model.transform(X, batch_size=300),
+                       embedding,
+                       atol=1e-5)
+
+    cebra_model.save(tmp_path / "model.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "model.pt",
+                                            weights_only=False)
+    assert loaded.solver_.compile == compile
+    assert np.allclose(loaded.transform(X), embedding, atol=1e-5)
+
+
+def test_sklearn_precision(tmp_path):
+    X = np.random.uniform(0, 1, (1000, 10)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+        precision="bf16",
+    ).fit(X)
+    assert cebra_model.solver_.precision == "bf16"
+    for parameter in cebra_model.model_.parameters():
+        assert parameter.dtype == torch.float32
+
+    embedding = cebra_model.transform(X)
+    assert embedding.dtype == np.float32
+    assert np.allclose(cebra_model.transform(X, batch_size=300),
+                       embedding,
+                       atol=1e-2)
+    cebra_model.precision = "fp32"
+    assert np.allclose(cebra_model.transform(X), embedding, atol=5e-2)
+    cebra_model.precision = "bf16"
+
+    cebra_model.save(tmp_path / "model.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "model.pt",
+                                            weights_only=False)
+    assert loaded.solver_.precision == "bf16"
+    assert np.allclose(loaded.transform(X), embedding)
+
+    with pytest.raises(ValueError, match="precision"):
+        cebra_sklearn_cebra.CEBRA(max_iterations=5,
+                                  batch_size=32,
+                                  precision="fp16").fit(X)
+
+
+def test_sklearn_micro_batch_size(tmp_path):
+    X = np.random.uniform(0, 1, (1000, 10)).astype("float32")
+    y = np.random.uniform(0, 1, (1000, 2))
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=256,
+        micro_batch_size=64,
+        device="cpu",
+        output_dimension=4,
+    ).fit(X, y)
+    assert cebra_model.solver_.micro_batch_size == 64
+    assert len(cebra_model.state_dict_["loss"]) == 5
+
+    cebra_model.save(tmp_path / "model.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "model.pt",
+                                            weights_only=False)
+    assert loaded.solver_.micro_batch_size == 64
+    assert np.allclose(loaded.transform(X), cebra_model.transform(X))
+
+    with pytest.raises(NotImplementedError, match="micro_batch_size"):
+        cebra_sklearn_cebra.CEBRA(max_iterations=5,
+                                  batch_size=32,
+                                  micro_batch_size=8,
+                                  hybrid=True).fit(X, y)
+
+
+def test_sklearn_distributed():
+    X = np.random.uniform(0, 1, (1000, 10)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(max_iterations=5,
+                                            batch_size=32,
+                                            distributed=True)
+    with pytest.raises(RuntimeError, match="process group"):
+        cebra_model.fit(X)
+    with pytest.raises(ValueError, match="distributed"):
+        cebra_model.fit_ensemble(X, num_models=2)
+
+
+@pytest.mark.parametrize("model_architecture",
+                         ["offset10-model", "offset36-model"])
+def test_sklearn_gradient_checkpointing(model_architecture, tmp_path):
+    X = np.random.uniform(0, 1, (1000, 10)).astype("float32")
+    y = np.random.uniform(0, 1, (1000, 2))
+
+    for gradient_checkpointing in [False, True]:
+        cebra_model = cebra_sklearn_cebra.CEBRA(
+            model_architecture=model_architecture,
+            max_iterations=5,
+            batch_size=32,
+            device="cpu",
+            gradient_checkpointing=gradient_checkpointing,
+        ).fit(X, y)
+        assert cebra_model.model_.gradient_checkpointing == gradient_checkpointing
+        assert cebra_model.transform(X).shape == (len(X), 8)
+
+    cebra_model.save(tmp_path / "model.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "model.pt",
+                                            weights_only=False)
+    assert loaded.model_.gradient_checkpointing
+
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture=model_architecture,
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        gradient_checkpointing=True).fit([X, X[:, :5]], [y, y])
+    for model in cebra_model.model_:
+        assert model.gradient_checkpointing
+
+
+def test_sklearn_lowrank_decoding():
+    # A circular latent variable encoded by many noisy neurons.
+    rng = np.random.default_rng(0)
+    theta = np.cumsum(rng.normal(size=2000) * 0.1)
+    latent = np.stack([np.cos(theta), np.sin(theta)], axis=1)
+    weights = rng.normal(size=(2, 1000))
+    X = (np.maximum(latent @ weights, 0) +
+         rng.normal(size=(2000, 1000)) * 0.5).astype("float32")
+
+    scores = {}
+    for model_architecture in ["offset10-model", "offset10-model-lowrank16"]:
+        torch.manual_seed(0)
+        cebra_model = cebra_sklearn_cebra.CEBRA(
+            model_architecture=model_architecture,
+            max_iterations=200,
+            batch_size=256,
+            learning_rate=3e-3,
+            output_dimension=4,
+            conditional="time_delta",
+            time_offsets=10,
+            device="cpu",
+        ).fit(X[:1500], latent[:1500])
+        decoder = cebra.KNNDecoder().fit(cebra_model.transform(X[:1500]),
+                                         latent[:1500])
+        scores[model_architecture] = decoder.score(
+            cebra_model.transform(X[1500:]), latent[1500:])
+
+    assert scores["offset10-model"] > 0.9
+    assert scores["offset10-model-lowrank16"] > scores["offset10-model"] - 0.05
+
+
+def test_sklearn_shared_trunk(tmp_path):
+    X = [
+        np.random.uniform(0, 1, (1000, num_neurons)).astype("float32")
+        for num_neurons in [10, 20, 15]
+    ]
+    y = [np.random.uniform(0, 1, (1000, 2)) for _ in X]
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+        shared_trunk=True,
+    ).fit(X, y)
+    assert isinstance(cebra_model.model_, cebra.models.MultisessionModel)
+    assert cebra_model.num_sessions == 3
+    embeddings = [
+        cebra_model.transform(X_, session_id=session_id)
+        for session_id, X_ in enumerate(X)
+    ]
+    for embedding in embeddings:
+        assert embedding.shape == (1000, 4)
+    with pytest.raises(ValueError, match="Invalid input shape"):
+        cebra_model.transform(X[0], session_id=1)
+
+    cebra_model.save(tmp_path / "model.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "model.pt",
+                                            weights_only=False)
+    assert isinstance(loaded.model_, cebra.models.MultisessionModel)
+    for session_id, X_ in enumerate(X):
+        assert np.allclose(loaded.transform(X_, session_id=session_id),
+                           embeddings[session_id])
+
+    with pytest.raises(NotImplementedError, match="adapt"):
+        cebra_model.fit(X[0], y[0], adapt=True)
+
+    # Single session training is not affected.
+    cebra_model.fit(X[0], y[0])
+    assert not isinstance(cebra_model.model_, cebra.models.MultisessionModel)
+
+
+@pytest.mark.parametrize("vectorize, n_jobs", [(None, None), (True, None),
+                                               (False, 2)])
+def test_sklearn_fit_ensemble(vectorize, n_jobs, tmp_path):
+    X = np.random.uniform(0, 1, (1000, 10)).astype("float32")
+    y = np.random.uniform(0, 1, (1000, 2))
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=32,
+        device="cpu",
+        output_dimension=4,
+    )
+    cebra_models = cebra_model.fit_ensemble(X,
+                                            y,
+                                            num_models=3,
+                                            vectorize=vectorize,
+                                            n_jobs=n_jobs)
+    assert not hasattr(cebra_model, "model_")
+    assert len(cebra_models) == 3
+
+    embeddings = []
+    for fitted_model in cebra_models:
+        assert fitted_model.get_params() == cebra_model.get_params()
+        assert fitted_model.solver_name_ == "single-session"
+        assert len(fitted_model.state_dict_["loss"]) == 5
+        assert len(fitted_model.solver_.log["temperature"]) == 5
+        embedding = fitted_model.transform(X)
+        assert embedding.shape == (len(X), 4)
+        embeddings.append(embedding)
+    assert not np.allclose(embeddings[0], embeddings[1])
+
+    cebra_models[1].save(tmp_path / "model.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "model.pt",
+                                            weights_only=False)
+    assert np.allclose(loaded.transform(X), embeddings[1])
+
+    with pytest.raises(ValueError, match="num_models"):
+        cebra_model.fit_ensemble(X, num_models=0)
+    with pytest.raises(NotImplementedError, match="single session"):
+        cebra_model.fit_ensemble([X, X], [y, y], num_models=2)
+    cebra_model.distributed = True
+    with pytest.raises(ValueError, match="distributed"):
+        cebra_model.fit_ensemble(X, y, num_models=2)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("n_jobs", [1, 2, 4, 8, 16, 32])
+def test_sklearn_transform_parallel_scaling(benchmark, n_jobs):
+    X = np.random.uniform(0, 1, (1_000_000, 100)).astype("float32")
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=1,
+        batch_size=32,
+        device="cpu",
+        output_dimension=8,
+    ).fit(X[:1000])
+
+    embedding = benchmark.pedantic(cebra_model.transform,
+                                   args=(X,),
+                                   kwargs=dict(batch_size=10_000,
+                                               n_jobs=n_jobs),
+                                   rounds=1)
+    assert embedding.shape == (len(X), 8)
+
+
+@pytest.mark.parametrize("storage_dtype,counts,atol", [
+    ("int16", True, 0),
+    ("int8", True, 0),
+    ("int8", False, 1e-1),
+    ("float16", False, 1e-2),
+    ("bfloat16", False, 1e-1),
+])
+def test_sklearn_storage_dtype(storage_dtype, counts, atol):
+    if counts:
+        X = np.random.poisson(2, (1000, 20)).astype("float32")
+    else:
+        X = np.random.uniform(0, 1, (1000, 20)).astype("float32")
+    y = np.random.uniform(0, 1, (1000, 2)).astype("float32")
+
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=128,
+        device="cpu",
+        storage_dtype=storage_dtype,
+    ).fit(X, y)
+    embedding = cebra_model.transform(X)
+    assert embedding.dtype == "float32"
+
+    dataset = cebra_model._prepare_data(X, (y,))[0]
+    assert dataset.neural.dtype == getattr(torch, storage_dtype)
+    cebra_model.storage_dtype = None
+    reference_dataset = cebra_model._prepare_data(X, (y,))[0]
+    for d in (dataset, reference_dataset):
+        d.configure_for(cebra_model.model_)
+
+    index = torch.arange(len(X))
+    with torch.no_grad():
+        cebra_model.model_.eval()
+        embedding = cebra_model.model_(dataset[index]).squeeze(-1)
+        reference_embedding = cebra_model.model_(
+            reference_dataset[index]).squeeze(-1)
+    assert torch.allclose(embedding, reference_embedding, atol=atol)
+
+
 @pytest.mark.parametrize("model_architecture,device",
                          [("resample-model", "cpu"),
                           ("resample5-model", "cpu")])
@@ -1239,3 +1869,48 @@ def test_check_device():
         torch.backends.mps.is_built = lambda: False
         with pytest.raises(ValueError):
             cebra_sklearn_utils.check_device(device)
+
+
+@pytest.mark.parametrize("micro_batch_size", [None, 64])
+def test_sklearn_full_multi_session(micro_batch_size, tmp_path):
+    X = np.random.uniform(0, 1, (400, 10)).astype("float32")
+    X_s2 = np.random.uniform(0, 1, (500, 5)).astype("float32")
+    y = np.random.uniform(0, 1, (400, 2))
+    y_s2 = np.random.uniform(0, 1, (500, 2))
+
+    cebra_model = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        max_iterations=5,
+        batch_size=None,
+        micro_batch_size=micro_batch_size,
+        device="cpu",
+    ).fit([X, X_s2], [y, y_s2])
+    assert cebra_model.solver_name_ == "multi-session-full"
+    assert len(cebra_model.state_dict_["loss"]) == 5
+    assert cebra_model.transform(X, session_id=0).shape == (len(X), 8)
+    assert cebra_model.transform(X_s2, session_id=1).shape == (len(X_s2), 8)
+
+    cebra_model.save(tmp_path / "model.pt")
+    loaded = cebra_sklearn_cebra.CEBRA.load(tmp_path / "model.pt",
+                                            weights_only=False)
+    assert np.allclose(loaded.transform(X, session_id=0),
+                       cebra_model.transform(X, session_id=0))
+
+
+@pytest.mark.parametrize("device", _DEVICES)
+@pytest.mark.parametrize("storage_dtype", [None, "int8", "float16"])
+def test_sklearn_dataset_storage_device(storage_dtype, device):
+    X = np.random.uniform(0, 1, (100, 5)).astype("float32")
+    yc = np.random.uniform(0, 1, (100, 2)).astype("float32")
+    yd = np.random.randint(0, 5, (100,))
+    dataset = cebra_sklearn_dataset.SklearnDataset(X, (yc, yd),
+                                                   device=device,
+                                                   storage_dtype=storage_dtype)
+    tensors = [dataset.neural, dataset.continuous_index, dataset.discrete_index]
+    if storage_dtype == "int8":
+        tensors.extend([dataset.neural_scale, dataset.neural_shift])
+    for tensor in tensors:
+        assert tensor.device.type == device
+
+    dataset.offset = cebra.data.Offset(0, 1)
+    assert dataset[torch.arange(10)].device.type == device
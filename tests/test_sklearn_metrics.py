@@ -383,3 +383,42 @@ def test_sklearn_runs_consistency():
     with pytest.raises(ValueError, match="Invalid.*embeddings"):
         _, _, _ = cebra_sklearn_metrics.consistency_score(
             invalid_embeddings_runs, between="runs")
+
+
+def test_sklearn_distillation_report():
+    X = np.random.uniform(0, 1, (1000, 10))
+    teacher = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset36-model",
+        max_iterations=5,
+        batch_size=32,
+        output_dimension=4,
+    ).fit(X)
+    student = cebra_sklearn_cebra.CEBRA(
+        model_architecture="offset10-model",
+        num_hidden_units=8,
+        max_iterations=5,
+        batch_size=32,
+        output_dimension=4,
+    ).distill(teacher, X)
+
+    report = cebra_sklearn_metrics.distillation_report(teacher,
+                                                       student,
+                                                       X,
+                                                       num_repeats=2)
+    assert set(report) == {
+        "consistency", "teacher_latency", "student_latency", "speedup"
+    }
+    assert report["consistency"] <= 1
+    assert report["teacher_latency"] > 0
+    assert report["student_latency"] > 0
+    assert math.isclose(report["speedup"],
+                        report["teacher_latency"] / report["student_latency"])
+
+    report = cebra_sklearn_metrics.distillation_report(teacher, teacher, X)
+    assert math.isclose(report["consistency"], 1, abs_tol=1e-6)
+
+    with pytest.raises(ValueError, match="num_repeats"):
+        cebra_sklearn_metrics.distillation_report(teacher,
+                                                  student,
+                                                  X,
+                                                  num_repeats=0)
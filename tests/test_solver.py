@@ -19,6 +19,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import copy
 import itertools
 
 import pytest
@@ -29,6 +30,8 @@ import cebra.data
 import cebra.datasets
 import cebra.models
 import cebra.solver
+import cebra.solver.distributed
+import cebra.solver.util
 
 device = "cpu"
 
@@ -168,3 +171,925 @@ def test_multi_session(data_name, loader_initfunc, solver_initfunc):
     assert isinstance(log, dict)
 
     solver.fit(loader)
+
+
+@pytest.mark.parametrize("micro_batch_size", [None, 5])
+def test_multi_session_shared_trunk(micro_batch_size):
+    loader = _get_loader("demo-continuous-multisession",
+                         cebra.data.ContinuousMultiSessionDataLoader)
+    model = cebra.models.MultisessionModel.init(
+        "offset10-model",
+        num_neurons=[
+            session.input_dimension
+            for session in loader.dataset.iter_sessions()
+        ],
+        num_units=8,
+        num_output=4)
+    batch = next(iter(loader))
+
+    # The grouped forward pass is the same as computing each session separately.
+    results = []
+    for model_ in [model, nn.ModuleList(list(model))]:
+        model_ = copy.deepcopy(model_)
+        criterion = cebra.models.LearnableCosineInfoNCE()
+        parameters = list(
+            itertools.chain(model_.parameters(), criterion.parameters()))
+        solver = cebra.solver.MultiSessionSolver(
+            model=model_,
+            criterion=criterion,
+            optimizer=torch.optim.SGD(parameters, lr=0),
+            micro_batch_size=micro_batch_size)
+        stats = solver.step(batch)
+        results.append((stats, [parameter.grad for parameter in parameters]))
+
+    (expected_stats, expected_grads), (stats, grads) = results
+    assert stats == pytest.approx(expected_stats, abs=1e-5)
+    for grad, expected_grad in zip(grads, expected_grads):
+        assert torch.allclose(grad, expected_grad, atol=1e-5)
+
+    solver.fit(loader)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("shared_trunk", [False, True])
+def test_multi_session_shared_trunk_speed(benchmark, shared_trunk):
+    num_sessions = 16
+    dataset = cebra.data.DatasetCollection(*[
+        cebra.data.TensorDataset(torch.randn(2_000, 50),
+                                 continuous=torch.randn(2_000, 2))
+        for _ in range(num_sessions)
+    ])
+    if shared_trunk:
+        model = cebra.models.MultisessionModel.init("offset10-model",
+                                                    num_neurons=[50] *
+                                                    num_sessions,
+                                                    num_units=32,
+                                                    num_output=8)
+    else:
+        model = nn.ModuleList([
+            cebra.models.init("offset10-model",
+                              num_neurons=50,
+                              num_units=32,
+                              num_output=8) for _ in range(num_sessions)
+        ])
+    for session, session_model in zip(dataset.iter_sessions(), model):
+        session.configure_for(session_model)
+    criterion = cebra.models.LearnableCosineInfoNCE()
+    solver = cebra.solver.MultiSessionSolver(
+        model=model,
+        criterion=criterion,
+        optimizer=torch.optim.Adam(itertools.chain(model.parameters(),
+                                                   criterion.parameters()),
+                                   lr=1e-3),
+        tqdm_on=False)
+    loader = cebra.data.ContinuousMultiSessionDataLoader(dataset,
+                                                         num_steps=1,
+                                                         batch_size=256)
+    batch = next(iter(loader))
+
+    benchmark(solver.step, batch)
+
+
+def _make_dropout_model(dataset):
+    return nn.Sequential(
+        nn.Conv1d(dataset.input_dimension, 8, kernel_size=10),
+        nn.Flatten(start_dim=1, end_dim=-1),
+        nn.Dropout(0.5),
+        nn.Linear(8, 5),
+    )
+
+
+@pytest.mark.parametrize("make_model", [_make_model, _make_dropout_model])
+@pytest.mark.parametrize("micro_batch_size", [1, 5, 8, 32])
+@pytest.mark.parametrize("data_name, loader_initfunc, solver_initfunc",
+                         single_session_tests + multi_session_tests)
+def test_gradient_cache(data_name, loader_initfunc, solver_initfunc,
+                        micro_batch_size, make_model):
+    loader = _get_loader(data_name, loader_initfunc)
+    if solver_initfunc is cebra.solver.MultiSessionSolver:
+        model = nn.ModuleList(
+            [make_model(dataset) for dataset in loader.dataset.iter_sessions()])
+    else:
+        model = make_model(loader.dataset)
+    batch = next(iter(loader))
+
+    results = []
+    for micro_batch_size_ in [None, micro_batch_size]:
+        model_ = copy.deepcopy(model)
+        criterion = cebra.models.LearnableCosineInfoNCE()
+        parameters = list(
+            itertools.chain(model_.parameters(), criterion.parameters()))
+        solver = solver_initfunc(model=model_,
+                                 criterion=criterion,
+                                 optimizer=torch.optim.SGD(parameters, lr=0),
+                                 micro_batch_size=micro_batch_size_)
+        torch.manual_seed(42)
+        stats = solver.step(batch)
+        assert solver.model is model_
+        results.append((stats, [parameter.grad for parameter in parameters]))
+
+    (expected_stats, expected_grads), (stats, grads) = results
+    assert stats == pytest.approx(expected_stats, abs=1e-5)
+    for grad, expected_grad in zip(grads, expected_grads):
+        assert torch.allclose(grad, expected_grad, atol=1e-5)
+
+
+def test_gradient_cache_invalid():
+    loader = _get_loader("demo-continuous", cebra.data.ContinuousDataLoader)
+    model = _make_model(loader.dataset)
+    with pytest.raises(ValueError, match="micro_batch_size"):
+        cebra.solver.SingleSessionSolver(model=model,
+                                         criterion=cebra.models.InfoNCE(),
+                                         optimizer=torch.optim.Adam(
+                                             model.parameters(), lr=1e-3),
+                                         micro_batch_size=0)
+
+
+def _make_full_batch_dataset(multi_session, model_name):
+    if multi_session:
+        sessions = [
+            cebra.data.TensorDataset(torch.randn(num_samples, num_neurons),
+                                     continuous=torch.randn(num_samples, 2))
+            for num_samples, num_neurons in [(150, 10), (200, 12)]
+        ]
+        dataset = cebra.data.DatasetCollection(*sessions)
+        model = nn.ModuleList([
+            cebra.models.init(model_name,
+                              num_neurons=session.input_dimension,
+                              num_units=16,
+                              num_output=4) for session in sessions
+        ])
+        for session, session_model in zip(sessions, model):
+            session.configure_for(session_model)
+        loader = cebra.data.FullMultiSessionDataLoader(dataset,
+                                                       num_steps=2,
+                                                       time_offset=1)
+    else:
+        dataset = cebra.data.TensorDataset(torch.randn(200, 10),
+                                           continuous=torch.randn(200, 2))
+        model = cebra.models.init(model_name,
+                                  num_neurons=10,
+                                  num_units=16,
+                                  num_output=4)
+        dataset.configure_for(model)
+        loader = cebra.data.FullDataLoader(dataset,
+                                           num_steps=2,
+                                           conditional="time_delta",
+                                           time_offset=1)
+    return loader, model
+
+
+@pytest.mark.parametrize("micro_batch_size", [1, 16, 1000])
+@pytest.mark.parametrize("model_name", ["offset10-model", "offset1-model"])
+@pytest.mark.parametrize("multi_session", [False, True])
+def test_full_batch_chunked(multi_session, model_name, micro_batch_size):
+    loader, model = _make_full_batch_dataset(multi_session, model_name)
+    solver_initfunc = (cebra.solver.BatchMultiSessionSolver if multi_session
+                       else cebra.solver.BatchSingleSessionSolver)
+    batch = loader.get_indices()
+
+    # The chunked embedding and the tiled loss give the same loss and gradients as
+    # the full batch.
+    results = []
+    for micro_batch_size_ in [None, micro_batch_size]:
+        model_ = copy.deepcopy(model)
+        criterion = cebra.models.LearnableCosineInfoNCE()
+        parameters = list(
+            itertools.chain(model_.parameters(), criterion.parameters()))
+        solver = solver_initfunc(model=model_,
+                                 criterion=criterion,
+                                 optimizer=torch.optim.SGD(parameters, lr=0),
+                                 micro_batch_size=micro_batch_size_,
+                                 tqdm_on=False)
+        solver.fit(loader)
+        stats = solver.step(copy.deepcopy(batch))
+        results.append((stats, [parameter.grad for parameter in parameters]))
+
+    (expected_stats, expected_grads), (stats, grads) = results
+    assert stats == pytest.approx(expected_stats, abs=1e-5)
+    for grad, expected_grad in zip(grads, expected_grads):
+        assert torch.allclose(grad, expected_grad, atol=1e-5)
+
+
+def test_full_batch_multi_session():
+    loader, model = _make_full_batch_dataset(True, "offset10-model")
+    dataset = loader.dataset
+    batch = loader.get_indices()
+    num_samples = min(
+        len(session) - len(session.offset) + 1
+        for session in dataset.iter_sessions())
+    assert batch.reference.shape == (2, num_samples)
+    for session_id, session in enumerate(dataset.iter_sessions()):
+        reference = batch.reference[session_id]
+        assert reference.min() >= session.offset.left
+        assert reference.max() <= len(session) - session.offset.right
+        assert len(reference.unique()) == num_samples
+        assert torch.equal(reference.sort().values,
+                           batch.negative[session_id].sort().values)
+
+    # Selecting the samples from the embeddings of the full sessions gives the same
+    # loss as embedding the loaded samples.
+    solver = cebra.solver.BatchMultiSessionSolver(
+        model=model,
+        criterion=cebra.models.InfoNCE(),
+        optimizer=torch.optim.Adam(model.parameters(), lr=1e-3),
+        tqdm_on=False)
+    solver.fit(loader)
+    expected_solver = cebra.solver.MultiSessionSolver(
+        model=model,
+        criterion=cebra.models.InfoNCE(),
+        optimizer=torch.optim.Adam(model.parameters(), lr=1e-3))
+    loss = solver._compute_loss(copy.deepcopy(batch))
+    expected_loss = expected_solver._compute_loss(
+        dataset.load_batch(copy.deepcopy(batch)))
+    for value, expected_value in zip(loss, expected_loss):
+        assert torch.allclose(value, expected_value, atol=1e-5)
+
+    with pytest.raises(ValueError, match="distributed"):
+        cebra.solver.BatchMultiSessionSolver(model=model,
+                                             criterion=cebra.models.InfoNCE(),
+                                             optimizer=torch.optim.Adam(
+                                                 model.parameters(), lr=1e-3),
+                                             session_parallel=True)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("micro_batch_size", [None, 512])
+def test_full_batch_chunked_step(benchmark, micro_batch_size):
+    dataset = cebra.data.TensorDataset(torch.randn(8_000, 100),
+                                       continuous=torch.randn(8_000, 2))
+    model = cebra.models.init("offset10-model",
+                              num_neurons=100,
+                              num_units=32,
+                              num_output=8)
+    dataset.configure_for(model)
+    loader = cebra.data.FullDataLoader(dataset,
+                                       num_steps=1,
+                                       conditional="time_delta",
+                                       time_offset=1)
+    criterion = cebra.models.LearnableCosineInfoNCE()
+    solver = cebra.solver.BatchSingleSessionSolver(
+        model=model,
+        criterion=criterion,
+        optimizer=torch.optim.Adam(itertools.chain(model.parameters(),
+                                                   criterion.parameters()),
+                                   lr=1e-3),
+        micro_batch_size=micro_batch_size,
+        tqdm_on=False)
+    solver.fit(loader)
+    batch = loader.get_indices()
+
+    # The memory of all tensors saved for the backward pass, which is quadratic in the
+    # number of samples without tiling.
+    saved = {}
+
+    def _pack(tensor):
+        saved[tensor.untyped_storage().data_ptr()] = tensor.untyped_storage(
+        ).nbytes()
+        return tensor
+
+    with torch.autograd.graph.saved_tensors_hooks(_pack, lambda x: x):
+        solver._compute_loss(copy.deepcopy(batch))
+    benchmark.extra_info["saved_tensors_mb"] = sum(saved.values()) / 2**20
+
+    benchmark(lambda: solver.step(copy.deepcopy(batch)))
+
+
+@pytest.mark.parametrize("vectorize, num_threads", [(True, 1), (False, 1),
+                                                    (False, 3)])
+@pytest.mark.parametrize("data_name, loader_initfunc, solver_initfunc",
+                         single_session_tests)
+def test_single_session_ensemble(data_name, loader_initfunc, solver_initfunc,
+                                 vectorize, num_threads):
+    loader = _get_loader(data_name, loader_initfunc)
+    models = nn.ModuleList([_make_model(loader.dataset) for _ in range(3)])
+    criterions = nn.ModuleList(
+        [cebra.models.LearnableCosineInfoNCE() for _ in range(3)])
+    replicas = [
+        solver_initfunc(model=copy.deepcopy(model),
+                        criterion=copy.deepcopy(criterion),
+                        optimizer=None)
+        for model, criterion in zip(models, criterions)
+    ]
+    for replica in replicas:
+        replica.optimizer = torch.optim.Adam(replica.parameters(), lr=1e-2)
+
+    solver = cebra.solver.init("single-session-ensemble",
+                               model=models,
+                               criterion=criterions,
+                               optimizer=torch.optim.Adam(itertools.chain(
+                                   models.parameters(),
+                                   criterions.parameters()),
+                                                          lr=1e-2),
+                               vectorize=vectorize,
+                               num_threads=num_threads)
+    assert solver.num_replicas == 3
+
+    # Each replica is trained as in an independent training run.
+    for _ in range(2):
+        batches = [next(iter(loader)) for _ in range(3)]
+        stats = solver.step(batches)
+        replica_stats = [
+            replica.step(batch) for replica, batch in zip(replicas, batches)
+        ]
+        assert stats["total"] == pytest.approx(
+            sum(stats_["total"] for stats_ in replica_stats) / 3)
+    for replica, model in zip(replicas, models):
+        for parameter, expected in zip(model.parameters(),
+                                       replica.model.parameters()):
+            assert torch.allclose(parameter, expected, atol=1e-5)
+    assert len(solver.log["total"]) == 2
+    assert len(solver.log["total"][0]) == 3
+
+    solver.fit(loader)
+    assert len(solver.history) == 2 + len(loader)
+
+    with pytest.raises(ValueError, match="ModuleList"):
+        cebra.solver.init("single-session-ensemble",
+                          model=models[0],
+                          criterion=criterions,
+                          optimizer=solver.optimizer)
+    with pytest.raises(ValueError, match="criterion"):
+        cebra.solver.init("single-session-ensemble",
+                          model=models,
+                          criterion=criterions[:2],
+                          optimizer=solver.optimizer)
+    with pytest.raises(ValueError, match="num_threads"):
+        cebra.solver.init("single-session-ensemble",
+                          model=models,
+                          criterion=criterions,
+                          optimizer=solver.optimizer,
+                          num_threads=0)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("mode", ["sequential", "loop", "threads", "vectorize"])
+@pytest.mark.parametrize("model_name", ["offset1-model", "offset10-model"])
+def test_single_session_ensemble_speed(benchmark, model_name, mode):
+    num_replicas = 8
+    loader = _get_loader("demo-continuous", cebra.data.ContinuousDataLoader)
+    loader.batch_size = 512
+    models = nn.ModuleList([
+        cebra.models.init(model_name,
+                          num_neurons=loader.dataset.input_dimension,
+                          num_units=32,
+                          num_output=8) for _ in range(num_replicas)
+    ])
+    loader.dataset.configure_for(models[0])
+    criterions = nn.ModuleList(
+        [cebra.models.LearnableCosineInfoNCE() for _ in range(num_replicas)])
+    batches = [next(iter(loader)) for _ in range(num_replicas)]
+
+    if mode == "sequential":
+        solvers = [
+            cebra.solver.SingleSessionSolver(model=model,
+                                             criterion=criterion,
+                                             optimizer=torch.optim.Adam(
+                                                 itertools.chain(
+                                                     model.parameters(),
+                                                     criterion.parameters()),
+                                                 lr=1e-3))
+            for model, criterion in zip(models, criterions)
+        ]
+
+        def _step():
+            for solver, batch in zip(solvers, batches):
+                solver.step(batch)
+
+        benchmark(_step)
+    else:
+        solver = cebra.solver.init("single-session-ensemble",
+                                   model=models,
+                                   criterion=criterions,
+                                   optimizer=torch.optim.Adam(itertools.chain(
+                                       models.parameters(),
+                                       criterions.parameters()),
+                                                              lr=1e-3),
+                                   vectorize=mode == "vectorize",
+                                   num_threads=num_replicas
+                                   if mode == "threads" else 1)
+        benchmark(solver.step, batches)
+
+
+def _make_parallel_dataset(kind):
+    """Create the dataset for ``"distributed"``, ``"session-parallel"`` or ``"shared-trunk"`` training."""
+
+    def _make_session(num_samples, num_neurons):
+        dataset = cebra.data.TensorDataset(torch.randn(num_samples,
+                                                       num_neurons),
+                                           continuous=torch.randn(
+                                               num_samples, 2))
+        # NOTE: Matches the receptive field of the models returned by _make_parallel_solver.
+        dataset.offset = cebra.data.Offset(5, 5)
+        return dataset
+
+    if kind == "distributed":
+        return _make_session(1000, 3)
+    return cebra.data.DatasetCollection(
+        *[_make_session(500, num_neurons) for num_neurons in [3, 4, 5]])
+
+
+def _make_parallel_loader(dataset, num_steps, batch_size):
+    if isinstance(dataset, cebra.data.DatasetCollection):
+        return cebra.data.ContinuousMultiSessionDataLoader(
+            dataset, num_steps=num_steps, batch_size=batch_size)
+    return cebra.data.ContinuousDataLoader(dataset,
+                                           num_steps=num_steps,
+                                           batch_size=batch_size,
+                                           conditional="time")
+
+
+def _make_parallel_solver(kind, dataset, parallel):
+    torch.manual_seed(0)
+    if kind == "distributed":
+        model = _make_model(dataset)
+    elif kind == "session-parallel":
+        model = nn.ModuleList(
+            [_make_model(session) for session in dataset.iter_sessions()])
+    else:
+        model = cebra.models.MultisessionModel.init(
+            "offset10-model",
+            num_neurons=[
+                session.input_dimension for session in dataset.iter_sessions()
+            ],
+            num_units=8,
+            num_output=4)
+    criterion = cebra.models.LearnableCosineInfoNCE()
+    optimizer = torch.optim.SGD(itertools.chain(model.parameters(),
+                                                criterion.parameters()),
+                                lr=0.1)
+    if kind == "distributed":
+        return cebra.solver.SingleSessionSolver(model=model,
+                                                criterion=criterion,
+                                                optimizer=optimizer,
+                                                distributed=parallel,
+                                                tqdm_on=False)
+    return cebra.solver.MultiSessionSolver(model=model,
+                                           criterion=criterion,
+                                           optimizer=optimizer,
+                                           session_parallel=parallel,
+                                           tqdm_on=False)
+
+
+def _parallel_worker(tmp_path, kind, batch, micro_batch_size):
+    rank = cebra.solver.distributed.get_rank()
+    world_size = cebra.solver.distributed.get_world_size()
+    dataset = _make_parallel_dataset(kind)
+    solver = _make_parallel_solver(kind, dataset, parallel=True)
+    solver.micro_batch_size = micro_batch_size
+    # NOTE: The model of each rank is initialized differently, and synchronized in fit.
+    for parameter in solver.model.parameters():
+        parameter.data.add_(rank)
+
+    loader = _make_parallel_loader(dataset, num_steps=3, batch_size=16)
+    solver.fit(loader,
+               save_frequency=1,
+               logdir=tmp_path,
+               save_hook=lambda num_steps, _:
+               (tmp_path / f"hook_{rank}_{num_steps}").touch())
+    torch.save(solver.state_dict(), tmp_path / f"fit_{rank}.pth")
+
+    if kind == "distributed":
+        # A step on the shard of the rank is the same as a step on the full batch.
+        num_samples = len(batch.reference) // world_size
+        shard = slice(rank * num_samples, (rank + 1) * num_samples)
+        batch = cebra.data.Batch(batch.reference[shard],
+                                 batch.positive[shard], batch.negative[shard])
+    solver.step(batch)
+    solver._synchronize()
+    torch.save(solver.state_dict(), tmp_path / f"rank_{rank}.pth")
+
+
+def _check_parallel_worker(tmp_path, kind, dataset, batch):
+    """Check the states saved by :py:func:`_parallel_worker` on two ranks."""
+    # After fit, the models are synchronized across ranks.
+    states = [
+        torch.load(tmp_path / f"fit_{rank}.pth", weights_only=False)
+        for rank in range(2)
+    ]
+    for key in ["model", "criterion"]:
+        for name, value in states[0][key].items():
+            assert torch.equal(value, states[1][key][name])
+    assert len(states[0]["log"]["total"]) == 3
+    assert states[0]["log"]["total"] == states[1]["log"]["total"]
+    assert {path.name for path in tmp_path.glob("hook_*")
+           } == {"hook_0_0", "hook_0_1", "hook_0_2"}
+    assert len(list(tmp_path.glob("checkpoint_*.pth"))) == 3
+
+    # The last step is the same as a single process step on the full batch.
+    solver = _make_parallel_solver(kind, dataset, parallel=False)
+    checkpoint = torch.load(tmp_path / "checkpoint_0000002.pth",
+                            weights_only=False)
+    solver.model.load_state_dict(checkpoint["model"])
+    solver.criterion.load_state_dict(checkpoint["criterion"])
+    stats = solver.step(batch)
+    for rank in range(2):
+        state = torch.load(tmp_path / f"rank_{rank}.pth", weights_only=False)
+        assert stats["total"] == pytest.approx(state["log"]["total"][-1],
+                                               abs=1e-5)
+        for key, module in [("model", solver.model),
+                            ("criterion", solver.criterion)]:
+            for name, value in module.state_dict().items():
+                assert torch.allclose(value, state[key][name], atol=1e-5), name
+
+
+@pytest.mark.parametrize("micro_batch_size", [None, 4])
+def test_single_session_distributed(tmp_path, micro_batch_size):
+    dataset = _make_parallel_dataset("distributed")
+    loader = _make_parallel_loader(dataset, num_steps=1, batch_size=32)
+    batch = next(iter(loader))
+
+    cebra.solver.distributed.launch(_parallel_worker, 2, tmp_path,
+                                    "distributed", batch, micro_batch_size)
+    _check_parallel_worker(tmp_path, "distributed", dataset, batch)
+
+    with pytest.raises(RuntimeError, match="process group"):
+        _make_parallel_solver("distributed", dataset, parallel=True).fit(loader)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("num_processes", [1, 2, 4, 8])
+def test_single_session_distributed_scaling(benchmark, tmp_path, num_processes):
+    batch_size = 4096
+
+    def _fit():
+        cebra.solver.distributed.launch(_distributed_benchmark_worker,
+                                        num_processes,
+                                        batch_size // num_processes)
+
+    benchmark.pedantic(_fit, rounds=1)
+
+
+def _distributed_benchmark_worker(batch_size):
+    dataset = cebra.data.TensorDataset(torch.randn(10_000, 50),
+                                       continuous=torch.randn(10_000, 2))
+    model = cebra.models.init("offset10-model",
+                              num_neurons=50,
+                              num_units=64,
+                              num_output=16)
+    dataset.configure_for(model)
+    criterion = cebra.models.LearnableCosineInfoNCE()
+    solver = cebra.solver.SingleSessionSolver(
+        model=model,
+        criterion=criterion,
+        optimizer=torch.optim.Adam(itertools.chain(model.parameters(),
+                                                   criterion.parameters()),
+                                   lr=1e-3),
+        distributed=True,
+        tqdm_on=False)
+    loader = cebra.data.ContinuousDataLoader(dataset,
+                                             num_steps=20,
+                                             batch_size=batch_size,
+                                             conditional="time")
+    solver.fit(loader)
+
+
+@pytest.mark.parametrize("kind", ["session-parallel", "shared-trunk"])
+def test_multi_session_session_parallel(tmp_path, kind):
+    dataset = _make_parallel_dataset(kind)
+    loader = _make_parallel_loader(dataset, num_steps=1, batch_size=32)
+    batch = next(iter(loader))
+
+    # NOTE: With three sessions on two ranks, the first rank trains two sessions. For
+    # shared trunks, the gradients of the trunk are summed across ranks.
+    cebra.solver.distributed.launch(_parallel_worker, 2, tmp_path, kind, batch,
+                                    None)
+    _check_parallel_worker(tmp_path, kind, dataset, batch)
+
+    with pytest.raises(RuntimeError, match="process group"):
+        _make_parallel_solver(kind, dataset, parallel=True).fit(loader)
+    solver = _make_parallel_solver(kind, dataset, parallel=False)
+    with pytest.raises(ValueError, match="session_parallel"):
+        cebra.solver.MultiSessionSolver(model=solver.model,
+                                        criterion=solver.criterion,
+                                        optimizer=solver.optimizer,
+                                        session_parallel=True,
+                                        distributed=True)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("num_processes", [1, 2, 4])
+def test_multi_session_session_parallel_scaling(benchmark, num_processes):
+    # NOTE: The number of sessions grows with the number of processes.
+
+    def _fit():
+        cebra.solver.distributed.launch(_session_parallel_benchmark_worker,
+                                        num_processes, 2 * num_processes)
+
+    benchmark.pedantic(_fit, rounds=1)
+
+
+def _session_parallel_benchmark_worker(num_sessions):
+    dataset = cebra.data.DatasetCollection(*[
+        cebra.data.TensorDataset(torch.randn(5_000, 50),
+                                 continuous=torch.randn(5_000, 2))
+        for _ in range(num_sessions)
+    ])
+    model = nn.ModuleList([
+        cebra.models.init("offset10-model",
+                          num_neurons=50,
+                          num_units=64,
+                          num_output=16) for _ in range(num_sessions)
+    ])
+    for session, session_model in zip(dataset.iter_sessions(), model):
+        session.configure_for(session_model)
+    criterion = cebra.models.LearnableCosineInfoNCE()
+    solver = cebra.solver.MultiSessionSolver(
+        model=model,
+        criterion=criterion,
+        optimizer=torch.optim.Adam(itertools.chain(model.parameters(),
+                                                   criterion.parameters()),
+                                   lr=1e-3),
+        session_parallel=True,
+        tqdm_on=False)
+    loader = cebra.data.ContinuousMultiSessionDataLoader(dataset,
+                                                         num_steps=20,
+                                                         batch_size=512)
+    solver.fit(loader)
+
+
+@pytest.mark.parametrize("teacher_name, student_name", [
+    ("offset36-model", "offset10-model"),
+    ("offset5-model", "offset10-model"),
+    ("offset10-model", "offset1-model"),
+])
+@pytest.mark.parametrize("criterion", [
+    cebra.models.FixedCosineInfoNCE(),
+    cebra.models.EmbeddingMSE(),
+])
+def test_single_session_distillation(teacher_name, student_name, criterion):
+    loader = _get_loader("demo-continuous", cebra.data.ContinuousDataLoader)
+    teacher = cebra.models.init(teacher_name,
+                                num_neurons=loader.dataset.input_dimension,
+                                num_units=8,
+                                num_output=5)
+    model = cebra.models.init(student_name,
+                              num_neurons=loader.dataset.input_dimension,
+                              num_units=4,
+                              num_output=5)
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
+
+    solver = cebra.solver.SingleSessionDistillationSolver(model=model,
+                                                          criterion=criterion,
+                                                          optimizer=optimizer,
+                                                          teacher=teacher)
+    teacher_offset, student_offset = teacher.get_offset(), model.get_offset()
+    assert solver.offset.left == max(teacher_offset.left, student_offset.left)
+    assert solver.offset.right == max(teacher_offset.right,
+                                      student_offset.right)
+
+    solver.fit(loader)
+    assert loader.dataset.offset is solver.offset
+    assert all(not p.requires_grad for p in solver.teacher.parameters())
+    assert all(p.requires_grad for p in teacher.parameters())
+
+    batch = next(iter(loader))
+    assert batch.reference.shape == (32, loader.dataset.input_dimension,
+                                     len(solver.offset))
+    prediction = solver._inference(batch)
+    assert prediction.reference.shape == (32, 5)
+    assert prediction.positive.shape == (32, 5)
+    assert prediction.negative.shape == (32, 5)
+
+    # The teacher embedding matches the embedding of the teacher model when applied
+    # to its receptive field only.
+    start = solver.offset.left - teacher_offset.left
+    stop = solver.offset.left + teacher_offset.right
+    with torch.no_grad():
+        assert torch.allclose(prediction.positive,
+                              teacher.eval()(batch.reference[..., start:stop]))
+
+    with pytest.raises(ValueError, match="teacher"):
+        cebra.solver.SingleSessionDistillationSolver(model=model,
+                                                     criterion=criterion,
+                                                     optimizer=optimizer)
+
+
+class _CountingBackend:
+    """Compiler backend which counts the number of compiled graphs."""
+
+    def __init__(self):
+        self.num_graphs = 0
+
+    def __call__(self, graph_module, example_inputs):
+        self.num_graphs += 1
+        return graph_module.forward
+
+
+def _make_compiled_solver(dataset, compile, backend):
+    model = cebra.models.init("offset10-model",
+                              num_neurons=dataset.input_dimension,
+                              num_units=8,
+                              num_output=4)
+    dataset.configure_for(model)
+    criterion = cebra.models.LearnableCosineInfoNCE()
+    optimizer = torch.optim.Adam(itertools.chain(model.parameters(),
+                                                 criterion.parameters()),
+                                 lr=1e-3)
+    return cebra.solver.SingleSessionSolver(
+        model=model,
+        criterion=criterion,
+        optimizer=optimizer,
+        compile=compile,
+        compile_kwargs=dict(backend=backend),
+    )
+
+
+@pytest.mark.parametrize("compile", [True, "step"])
+def test_single_session_compile(compile):
+    loader = _get_loader("demo-continuous", cebra.data.ContinuousDataLoader)
+    backend = _CountingBackend()
+    solver = _make_compiled_solver(loader.dataset, compile, backend)
+    model = solver.model
+
+    batch = next(iter(loader))
+    with torch.no_grad():
+        expected = solver.model._call_impl(batch.reference)
+        assert torch.allclose(model(batch.reference), expected)
+    solver.fit(loader)
+    num_graphs = backend.num_graphs
+    assert num_graphs > 0
+
+    # Changing input lengths only trigger a single recompilation.
+    model.eval()
+    with torch.no_grad():
+        for num_samples in [100, 57, 80, 33]:
+            model(torch.randn(1, loader.dataset.input_dimension, num_samples))
+    assert backend.num_graphs <= num_graphs + 2
+
+    # The parameter names are not changed, and the solver can be pickled.
+    assert set(model.state_dict()) == set(
+        cebra.models.init("offset10-model",
+                          num_neurons=loader.dataset.input_dimension,
+                          num_units=8,
+                          num_output=4).state_dict())
+    copied = copy.deepcopy(solver)
+    copied.step(batch)
+
+
+def test_single_session_compile_fallback(monkeypatch):
+    loader = _get_loader("demo-continuous", cebra.data.ContinuousDataLoader)
+
+    def _failing_backend(graph_module, example_inputs):
+        raise RuntimeError("Unsupported backend.")
+
+    batch = next(iter(loader))
+    inputs = torch.randn(1, loader.dataset.input_dimension, 100)
+    # NOTE: Once the recompile limit is reached after compiling in other tests, forward
+    # passes silently run in eager mode without calling the backend.
+    torch._dynamo.reset()
+    for compile in [True, "step"]:
+        # The compiler first fails in training or in inference, after which the
+        # uncompiled model is used for all forward passes.
+        for first_call in ["step", "transform"]:
+            solver = _make_compiled_solver(loader.dataset, compile,
+                                           _failing_backend)
+            with pytest.warns(UserWarning, match="eager mode"):
+                if first_call == "step":
+                    solver.step(batch)
+                else:
+                    solver.transform(inputs)
+            assert solver.model._compiled_call_impl is None
+            solver.fit(loader)
+            solver.transform(inputs)
+            solver.micro_batch_size = 5
+            solver.step(batch)
+
+    # Errors which are not caused by the compiler are raised.
+    def _invalid_function(inputs):
+        return inputs @ torch.randn(3, 3)
+
+    function = cebra.solver.util.CompiledFunction(_invalid_function,
+                                                  backend="eager")
+    with pytest.raises(Exception, match="shape|size"):
+        function(torch.randn(4, 5))
+    assert function.compiled is not None
+
+    monkeypatch.setattr(cebra.solver.util, "_is_compile_supported",
+                        lambda: False)
+    with pytest.warns(UserWarning, match="not supported"):
+        solver = _make_compiled_solver(loader.dataset, True, "inductor")
+    assert "_compiled_call_impl" not in vars(
+        solver.model) or (solver.model._compiled_call_impl is None)
+    solver.fit(loader)
+
+    with pytest.raises(ValueError, match="compile"):
+        _make_compiled_solver(loader.dataset, "model", "inductor")
+
+
+def test_compiled_call_impl():
+    # NOTE: compile_module relies on the private attribute which Module.compile sets and
+    # Module.__call__ calls. If this test fails, PyTorch changed this attribute, and
+    # compile_module needs to be adapted.
+    if torch.__version__ < "2.2":
+        pytest.skip("torch.nn.Module.compile requires PyTorch 2.2.")
+    assert cebra.solver.util._has_compiled_call_impl()
+    module = torch.nn.Linear(3, 2)
+    assert module._compiled_call_impl is None
+    module.compile(backend="eager")
+    assert module._compiled_call_impl is not None
+
+    calls = []
+
+    def _compiled_call(*args, **kwargs):
+        calls.append(args)
+        return module._call_impl(*args, **kwargs)
+
+    module._compiled_call_impl = _compiled_call
+    module(torch.randn(4, 3))
+    assert len(calls) == 1
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("compile", [False, True, "step"])
+@pytest.mark.parametrize(
+    "model_name",
+    ["offset1-model", "offset5-model", "offset10-model", "offset36-model"])
+def test_single_session_compile_speed(benchmark, model_name, compile):
+    loader = _get_loader("demo-continuous", cebra.data.ContinuousDataLoader)
+    model = cebra.models.init(model_name,
+                              num_neurons=loader.dataset.input_dimension,
+                              num_units=32,
+                              num_output=8)
+    loader.dataset.configure_for(model)
+    loader.batch_size = 512
+    criterion = cebra.models.FixedCosineInfoNCE()
+    solver = cebra.solver.SingleSessionSolver(model=model,
+                                              criterion=criterion,
+                                              optimizer=torch.optim.Adam(
+                                                  model.parameters(), lr=1e-3),
+                                              compile=compile)
+
+    batch = next(iter(loader))
+    # Compile before measuring the steps/sec.
+    solver.step(batch)
+    benchmark(solver.step, batch)
+
+
+def _make_precision_solver(dataset,
+                           precision,
+                           model_name="offset10-model",
+                           solver_initfunc=cebra.solver.SingleSessionSolver):
+    model = cebra.models.init(model_name,
+                              num_neurons=dataset.input_dimension,
+                              num_units=16,
+                              num_output=8)
+    dataset.configure_for(model)
+    criterion = cebra.models.LearnableCosineInfoNCE()
+    optimizer = torch.optim.Adam(itertools.chain(model.parameters(),
+                                                 criterion.parameters()),
+                                 lr=3e-3)
+    return solver_initfunc(model=model,
+                           criterion=criterion,
+                           optimizer=optimizer,
+                           precision=precision,
+                           tqdm_on=False)
+
+
+@pytest.mark.parametrize("data_name, loader_initfunc, solver_initfunc",
+                         single_session_tests)
+def test_single_session_bf16_convergence(data_name, loader_initfunc,
+                                         solver_initfunc):
+    losses = {}
+    for precision in ["fp32", "bf16"]:
+        torch.manual_seed(42)
+        loader = _get_loader(data_name, loader_initfunc)
+        loader.num_steps = 50
+        solver = _make_precision_solver(loader.dataset,
+                                        precision,
+                                        solver_initfunc=solver_initfunc)
+        solver.fit(loader)
+        losses[precision] = sum(solver.log["total"][-10:]) / 10
+
+        # Parameters, the learnable temperature and the optimizer state stay in float32.
+        for parameter in itertools.chain(solver.model.parameters(),
+                                         solver.criterion.parameters()):
+            assert parameter.dtype == torch.float32
+        for state in solver.optimizer.state.values():
+            for value in state.values():
+                assert value.dtype == torch.float32
+
+        batch = next(iter(loader))
+        with solver._autocast():
+            output = solver.model(batch.reference)
+        expected_dtype = torch.bfloat16 if precision == "bf16" else torch.float32
+        assert output.dtype == expected_dtype
+        assert solver.transform(batch.reference).dtype == torch.float32
+
+    assert losses["bf16"] == pytest.approx(losses["fp32"], rel=1e-2)
+
+    with pytest.raises(ValueError, match="precision"):
+        _make_precision_solver(loader.dataset, "fp16")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("precision", ["fp32", "bf16"])
+@pytest.mark.parametrize(
+    "model_name",
+    ["offset1-model", "offset5-model", "offset10-model", "offset36-model"])
+def test_single_session_precision_speed(benchmark, model_name, precision):
+    loader = _get_loader("demo-continuous", cebra.data.ContinuousDataLoader)
+    loader.batch_size = 512
+    solver = _make_precision_solver(loader.dataset, precision, model_name)
+    batch = next(iter(loader))
+    benchmark(solver.step, batch)